@@ -0,0 +1,193 @@
+import logging
+import time
+from typing import Dict, Optional
+from llm_cache import llm_cache, make_llm_key
+from llm_client import llm_client
+from prompt_budget import compress_pair, estimate_tokens, RESUME_TOKEN_BUDGET, JD_TOKEN_BUDGET
+from resume_profile import resume_profiles
+from tailor import extract_tailored_json, generate_tailored_resume
+from email_generator import platform_instruction, call_cold_email_model
+from interview_prep import parse_prep_json, call_interview_prep_model
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompts below change so cached packs are not reused
+PROMPT_VERSION = 1
+# One model and one num_ctx for all three steps, so follow-ups can continue
+# from the first step's evaluated context instead of reloading
+MODEL = "mistral"
+NUM_CTX = 4096
+TAILOR_OPTIONS = {"temperature": 0.7, "num_ctx": NUM_CTX}
+EMAIL_OPTIONS = {"temperature": 0.7, "num_ctx": NUM_CTX}
+PREP_OPTIONS = {"temperature": 0.5, "num_ctx": NUM_CTX}
+
+
+def build_shared_prefix(resume_text: str, job_description: str) -> str:
+    """The resume + JD part every step needs; evaluated by the model once per pack."""
+    resume_context, jd_context, _ = compress_pair(resume_text, job_description,
+                                                   resume_sections=resume_profiles.sections(resume_text))
+    return f"""
+    You are an expert career coach, resume optimizer and technical interviewer.
+    I am applying for the job below. I will ask you for several documents for this
+    application, one at a time. All of them are based on my resume and this job description.
+
+    CANDIDATE RESUME:
+    {resume_context}
+
+    JOB DESCRIPTION:
+    {jd_context}
+    """
+
+
+TAILOR_TASK = """
+    TASK 1: Compare my resume to the job description and tailor it.
+    Output ONLY a valid JSON object in the following format:
+    {
+        "Match_Score": 85,
+        "Tailored_Summary": "Reshaped summary identifying key overlaps...",
+        "Tailored_Experience": [
+            {
+                "Job_Title": "Senior Developer",
+                "Company": "Tech Corp",
+                "Duration": "2020 - Present",
+                "Responsibilities": ["Refactored code...", "Led team..."]
+            }
+        ]
+    }
+    """
+
+PREP_TASK = """
+    TASK 3: Based on my resume and the job description above, generate an interview preparation guide.
+    1. "technical_questions": 3 likely technical questions based on the JD's stack, with brief "Key Talking Points".
+    2. "behavioral_questions": 2 behavioral questions (e.g. STAR method) that fit this role, with a "Suggested Story" from the resume.
+    Output ONLY valid JSON, no markdown:
+    {
+      "technical_questions": [{ "question": "...", "answer_tips": "..." }],
+      "behavioral_questions": [{ "question": "...", "suggested_story": "..." }]
+    }
+    """
+
+
+def build_email_task(hiring_manager_name: Optional[str], platform: str) -> str:
+    recipient = hiring_manager_name if hiring_manager_name else "Hiring Manager"
+    return f"""
+    TASK 2: Using my resume and the job description above, write a {platform} to {recipient} to apply for this job.
+    - {platform_instruction(platform)}
+    - Pick the TOP achievements that match the Job Description.
+    - No placeholders for missing info unless absolutely necessary.
+    - Output ONLY the message content. No preamble.
+    """
+
+
+def _cache_key(resume_text: str, job_description: str, hiring_manager_name: Optional[str], platform: str) -> str:
+    return make_llm_key("application_pack", PROMPT_VERSION, MODEL,
+                        {"tailor": TAILOR_OPTIONS, "email": EMAIL_OPTIONS, "prep": PREP_OPTIONS},
+                        resume_text=resume_text, job_description=job_description,
+                        hiring_manager_name=hiring_manager_name, platform=platform,
+                        budgets=[RESUME_TOKEN_BUDGET, JD_TOKEN_BUDGET])
+
+
+def _step_timing(reply: Dict, elapsed: float) -> Dict:
+    # Ollama reports durations in nanoseconds
+    return {
+        "elapsed": round(elapsed, 3),
+        "prompt_tokens": reply.get("prompt_eval_count"),
+        "prompt_eval_s": round(reply.get("prompt_eval_duration", 0) / 1e9, 3),
+        "output_tokens": reply.get("eval_count"),
+        "eval_s": round(reply.get("eval_duration", 0) / 1e9, 3),
+    }
+
+
+def _generate_pack(resume_text: str, job_description: str, hiring_manager_name: Optional[str], platform: str) -> Dict:
+    """
+    Tailor first (prefix + task), then email and prep as follow-ups that pass
+    the tailor step's returned `context`, so Ollama continues from the already
+    evaluated resume + JD tokens and only evaluates the new task. If the server
+    returns no context, the follow-ups resend the identical prefix text, which
+    Ollama's prompt cache can still match.
+    """
+    prefix = build_shared_prefix(resume_text, job_description)
+    steps = {}
+    started = time.monotonic()
+
+    t = time.monotonic()
+    tailor_reply = llm_client.generate_native(prefix + TAILOR_TASK, MODEL, TAILOR_OPTIONS, format="json")
+    steps["tailor"] = _step_timing(tailor_reply, time.monotonic() - t)
+    context = tailor_reply.get("context")
+
+    def follow_up(name: str, task: str, options: Dict, format: Optional[str] = None) -> str:
+        t = time.monotonic()
+        if context:
+            reply = llm_client.generate_native(task, MODEL, options, format=format, context=context)
+        else:
+            reply = llm_client.generate_native(prefix + task, MODEL, options, format=format)
+        steps[name] = _step_timing(reply, time.monotonic() - t)
+        return reply.get("response", "")
+
+    email = follow_up("email", build_email_task(hiring_manager_name, platform), EMAIL_OPTIONS)
+    if not email:
+        raise ValueError("No email in the model response.")
+    prep = parse_prep_json(follow_up("interview_prep", PREP_TASK, PREP_OPTIONS, format="json"))
+    wall_time = time.monotonic() - started
+
+    # Without reuse, the email and prep calls would each evaluate the prefix again
+    tailor_prompt_tokens = estimate_tokens(prefix + TAILOR_TASK)
+    prefix_eval_s = steps["tailor"]["prompt_eval_s"] * estimate_tokens(prefix) / tailor_prompt_tokens
+    return {
+        "tailored_resume": extract_tailored_json(tailor_reply.get("response", "")),
+        "email_content": email,
+        "interview_prep": prep,
+        "timing": {
+            "wall_time": round(wall_time, 3),
+            "prefix_reuse": "context" if context else "prompt",
+            "prefix_tokens": estimate_tokens(prefix),
+            "estimated_baseline_time": round(wall_time + 2 * prefix_eval_s, 3) if context else None,
+            "steps": steps,
+        },
+    }
+
+
+def run_baseline(resume_text: str, job_description: str, hiring_manager_name: Optional[str], platform: str) -> Dict:
+    """
+    Wall time of the three separate calls this pack replaces. The cache is
+    bypassed both ways, so the user's cached generations are left as they are.
+    If any call fails there is no time to compare; the error is reported instead.
+    """
+    started = time.monotonic()
+    try:
+        generate_tailored_resume(resume_text, job_description, persist=False)
+        call_cold_email_model(resume_text, job_description, hiring_manager_name, platform)
+        call_interview_prep_model(resume_text, job_description)
+    except Exception as e:
+        logger.warning(f"Application pack baseline failed: {e}")
+        return {"baseline_time": None, "baseline_error": str(e)}
+    return {"baseline_time": round(time.monotonic() - started, 3)}
+
+
+def generate_application_pack(
+    resume_text: str,
+    job_description: str,
+    hiring_manager_name: Optional[str] = None,
+    platform: str = "Email",
+    regenerate: bool = False,
+    baseline: bool = False,
+) -> Dict:
+    """
+    Tailored resume, cold email / cover letter and interview prep for one job,
+    with the shared resume + JD prefix evaluated once. Cached on disk like the
+    single generators; baseline=True also times the three separate calls.
+    Raises when the model cannot be reached.
+    """
+    started = time.monotonic()
+    pack, cache_state = llm_cache.get_or_generate(
+        _cache_key(resume_text, job_description, hiring_manager_name, platform),
+        lambda: _generate_pack(resume_text, job_description, hiring_manager_name, platform),
+        regenerate, template="application_pack", model=MODEL,
+    )
+    result = {**pack, "cache": cache_state, "wall_time": round(time.monotonic() - started, 3)}
+    logger.info(f"Application pack ({cache_state}) in {result['wall_time']}s")
+    if baseline:
+        timing = result["timing"] = {**pack["timing"], **run_baseline(resume_text, job_description, hiring_manager_name, platform)}
+        if cache_state != "hit" and timing["wall_time"] and timing["baseline_time"] is not None:
+            timing["speedup"] = round(timing["baseline_time"] / timing["wall_time"], 2)
+    return result
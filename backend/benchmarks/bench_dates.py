@@ -0,0 +1,86 @@
+"""
+Date parsing + cutoff filtering: legacy per-search parse_job_date vs date_normalizer.
+
+    cd backend && python -m benchmarks.bench_dates
+"""
+import random
+import re
+from datetime import datetime, timedelta
+from benchmarks.common import bench, report
+from date_normalizer import normalize_job_dates, filter_recent, _parse_text
+
+SAMPLE_DATES = [
+    "2026-01-31", "31-01-2026", "2026-01-30 00:00:00", "3 days ago", "30+ days ago",
+    "14 hours ago", "just now", "yesterday", "vor 3 Tagen", "heute", "", None, "Recently",
+]
+
+
+def make_jobs(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [{"title": f"Job {i}", "date_posted": rng.choice(SAMPLE_DATES)} for i in range(n)]
+
+
+def legacy_filter(jobs, hours_old):
+    """The filter as it used to live inside search_jobs_in_germany."""
+    final_results = []
+
+    def parse_job_date(date_str):
+        if not date_str or str(date_str).lower() == 'none' or str(date_str) == '':
+            return None
+        date_str = str(date_str).strip()
+        try:
+            return datetime.strptime(date_str, "%Y-%m-%d")
+        except:
+            pass
+        try:
+            return datetime.strptime(date_str, "%d-%m-%Y")
+        except:
+            pass
+        lower = date_str.lower()
+        now = datetime.now()
+        if "just now" in lower or "today" in lower:
+            return now
+        if "yesterday" in lower:
+            return now - timedelta(days=1)
+        if "hour" in lower:
+            try:
+                hours = int(re.search(r'(\d+)', lower).group(1))
+                return now - timedelta(hours=hours)
+            except:
+                pass
+        if "minute" in lower:
+            return now
+        if "day" in lower:
+            try:
+                days = int(re.search(r'(\d+)', lower).group(1))
+                return now - timedelta(days=days)
+            except:
+                pass
+        return None
+
+    cutoff = datetime.now() - timedelta(hours=hours_old)
+    for job in jobs:
+        job_date = parse_job_date(str(job.get('date_posted')))
+        if job_date is None or job_date >= cutoff:
+            final_results.append(job)
+    return final_results
+
+
+def run():
+    results = []
+    for n in (1000, 10000):
+        jobs = make_jobs(n)
+        results.append(bench("dates.legacy_parse_and_filter", lambda: legacy_filter(jobs, 72), rows=n))
+
+        def cold():
+            _parse_text.cache_clear()
+            filter_recent([dict(job) for job in jobs], 72)
+        results.append(bench("dates.normalize_and_filter_cold_cache", cold, rows=n))
+
+        normalized = normalize_job_dates([dict(job) for job in jobs])
+        results.append(bench("dates.filter_normalized", lambda: filter_recent(normalized, 72), rows=n))
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
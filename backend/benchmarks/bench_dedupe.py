@@ -0,0 +1,33 @@
+"""
+Cross-board deduplication: dedupe_jobs over the tracked-jobs corpus with reposts mixed in.
+
+    cd backend && python -m benchmarks.bench_dedupe
+"""
+from benchmarks.common import bench, report, scale_jobs
+from dedupe import dedupe_jobs, job_key
+
+
+def exact_key_dedupe(jobs):
+    """Reference point: first posting per normalized title + company, no fuzzy matching."""
+    seen, unique = set(), []
+    for job in jobs:
+        key = job_key(job)
+        if key not in seen:
+            seen.add(key)
+            unique.append(job)
+    return unique
+
+
+def run():
+    results = []
+    for n in (100, 1000, 10000):
+        jobs = scale_jobs(n, duplicate_rate=0.2)
+        groups = len(dedupe_jobs(jobs))
+        repeat = 5 if n <= 1000 else 3
+        results.append(bench("dedupe.exact_key", lambda: exact_key_dedupe(jobs), repeat=repeat, rows=n))
+        results.append(bench("dedupe.dedupe_jobs", lambda: dedupe_jobs(jobs), repeat=repeat, rows=n, groups=groups))
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,80 @@
+"""
+CSV export: the legacy build-in-StringIO endpoint body vs the streamed export
+read from SQLite in batches. Also reports peak traced memory per export.
+
+    cd backend && python -m benchmarks.bench_export
+"""
+import csv
+import io
+import os
+import tempfile
+import tracemalloc
+from benchmarks.common import bench, report, scale_jobs
+from job_export import export_stream
+from storage import Storage, TRACKED_JOB_FIELDS
+
+LEGACY_COLUMNS = ["Title", "Company", "Location", "Description", "URL", "Date Posted"]
+
+
+def legacy_rows(jobs):
+    # Truncate description for CSV readability
+    for job in jobs:
+        yield {"Title": job["title"], "Company": job["company"], "Location": job["location"],
+               "Description": job["description"][:500], "URL": job["url"], "Date Posted": job.get("date_posted")}
+
+
+def legacy_csv(jobs) -> str:
+    """What /export-jobs-csv/ used to build before sending its first byte."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(LEGACY_COLUMNS)
+    for row in legacy_rows(jobs):
+        writer.writerow([row[column] for column in LEGACY_COLUMNS])
+    output.seek(0)
+    return output.getvalue()
+
+
+def drain(chunks) -> int:
+    return sum(len(chunk) for chunk in chunks)
+
+
+def peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+    finally:
+        tracemalloc.stop()
+
+
+def run():
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (1000, 50000):
+            jobs = scale_jobs(n)
+            storage = Storage(os.path.join(tmp, f"export_{n}.db"), legacy_jobs_path=None, legacy_searches_path=None)
+            storage.replace_tracked_jobs(jobs)
+            repeat = 3 if n >= 50000 else 5
+
+            def legacy():
+                # The client used to POST every job back, so they were all in memory
+                return len(legacy_csv(storage.list_tracked_jobs()).encode())
+
+            def streamed_legacy_columns():
+                # Same rows and columns as legacy, through the streaming writer
+                return drain(export_stream(legacy_rows(storage.iter_tracked_jobs()), LEGACY_COLUMNS, "csv"))
+
+            def streamed(gzip=False):
+                # GET /export-jobs/ defaults: every column, full descriptions
+                return drain(export_stream(storage.iter_tracked_jobs(), TRACKED_JOB_FIELDS, "csv", gzip))
+
+            for name, fn in (("export.csv_legacy_stringio", legacy),
+                             ("export.csv_streamed_legacy_columns", streamed_legacy_columns),
+                             ("export.csv_streamed_all_fields", streamed),
+                             ("export.csv_streamed_all_fields_gzip", lambda: streamed(gzip=True))):
+                results.append(bench(name, fn, repeat=repeat, rows=n, bytes=fn(), peak_mb=peak_mb(fn)))
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,70 @@
+"""
+JobSpy DataFrame -> job dicts: legacy fillna + iterrows loop vs jobspy_frame_to_jobs.
+
+    cd backend && python -m benchmarks.bench_jobspy_frame
+"""
+import random
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from benchmarks.common import bench, report
+from job_search import jobspy_frame_to_jobs
+
+
+def make_frame(n: int, seed: int = 11) -> pd.DataFrame:
+    """Synthetic frame shaped like scrape_jobs output, including gaps and extra columns."""
+    rng = random.Random(seed)
+    maybe = lambda value, p=0.1: np.nan if rng.random() < p else value
+    rows = []
+    for i in range(n):
+        rows.append({
+            "id": f"in-{i}",
+            "site": rng.choice(["indeed", "linkedin", "glassdoor"]),
+            "job_url": maybe(f"https://example.com/jobs/{i}", 0.05),
+            "job_url_direct": maybe(f"https://company.example/{i}", 0.5),
+            "title": maybe(f"Python Developer {i}", 0.02),
+            "company": maybe(f"Company {i % 300} GmbH"),
+            "location": maybe(rng.choice(["Berlin, BE, DE", "Munich, BY, DE", "Hamburg, HH, DE"])),
+            "date_posted": maybe(date(2026, 1, 1) + timedelta(days=i % 60), 0.2),
+            "job_type": maybe("fulltime", 0.3),
+            "is_remote": rng.random() < 0.3,
+            "min_amount": maybe(50000.0, 0.7),
+            "max_amount": maybe(80000.0, 0.7),
+            "description": maybe("We are hiring. " * rng.randint(20, 200), 0.1),
+            "company_industry": maybe("Software", 0.5),
+        })
+    return pd.DataFrame(rows)
+
+
+def legacy_convert(jobs_df: pd.DataFrame, location: str):
+    """The loop as it used to live inside search_jobs_in_germany."""
+    all_results = []
+    jobs_df = jobs_df.fillna("")
+    for index, row in jobs_df.iterrows():
+        title = row.get('title')
+        if not title:
+            continue
+        all_results.append({
+            "title": title,
+            "company": row.get('company') or "Unknown Company",
+            "location": row.get('location') or location,
+            "description": row.get('description') or f"View full details at {row.get('job_url')}",
+            "url": row.get('job_url') or "#",
+            "date_posted": str(row.get('date_posted')) if row.get('date_posted') else None,
+            "source": row.get('site', 'JobSpy')
+        })
+    return all_results
+
+
+def run():
+    results = []
+    for n in (100, 10000):
+        frame = make_frame(n)
+        assert legacy_convert(frame, "Germany") == jobspy_frame_to_jobs(frame, "Germany")
+        results.append(bench("jobspy_frame.legacy_iterrows", lambda: legacy_convert(frame, "Germany"), repeat=3, rows=n))
+        results.append(bench("jobspy_frame.vectorized", lambda: jobspy_frame_to_jobs(frame, "Germany"), repeat=3, rows=n))
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,40 @@
+"""
+Prompt construction: the master resume against every tracked job description,
+through each generator's prompt builder and the section packing beneath them.
+
+    cd backend && python -m benchmarks.bench_prompts
+"""
+from benchmarks.common import bench, report, load_resume_text, load_tracked_jobs
+from prompt_budget import split_sections, pack_sections, RESUME_TOKEN_BUDGET
+from resume_profile import build_profile
+from tailor import build_tailor_prompt
+from email_generator import build_cold_email_prompt
+from interview_prep import build_interview_prep_prompt
+from application_pack import build_shared_prefix
+
+
+def run():
+    resume = load_resume_text()
+    descriptions = [job["description"] for job in load_tracked_jobs()]
+    meta = {"resume_chars": len(resume), "descriptions": len(descriptions)}
+
+    def each(builder):
+        return lambda: [builder(resume, description) for description in descriptions]
+
+    sections = split_sections(resume)
+    return [
+        bench("prompts.build_profile", lambda: build_profile(resume), resume_chars=len(resume)),
+        bench("prompts.pack_resume_split_each_time",
+              lambda: [pack_sections(resume, d, RESUME_TOKEN_BUDGET, keep_first=True) for d in descriptions], **meta),
+        bench("prompts.pack_resume_profile_sections",
+              lambda: [pack_sections(resume, d, RESUME_TOKEN_BUDGET, keep_first=True, sections=sections) for d in descriptions],
+              **meta),
+        bench("prompts.tailor", each(build_tailor_prompt), **meta),
+        bench("prompts.cold_email", each(build_cold_email_prompt), **meta),
+        bench("prompts.interview_prep", each(build_interview_prep_prompt), **meta),
+        bench("prompts.application_pack_prefix", each(build_shared_prefix), **meta),
+    ]
+
+
+if __name__ == "__main__":
+    report(run())
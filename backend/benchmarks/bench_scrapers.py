@@ -0,0 +1,22 @@
+"""
+Scraper card parsing: the saved VisaSponsor results page through parse_visasponsor_html.
+
+    cd backend && python -m benchmarks.bench_scrapers
+"""
+from benchmarks.common import bench, report, load_visa_html
+from scrapers.visasponsor import parse_visasponsor_html
+
+
+def run():
+    html = load_visa_html()
+    cards = len(parse_visasponsor_html(html, limit=10_000))
+    assert cards, "fixture has no job cards; the selectors no longer match"
+    # limit=10 is what a search uses; the large limit parses every card on the page
+    return [
+        bench("scrapers.visasponsor_parse", lambda: parse_visasponsor_html(html), html_bytes=len(html), cards=min(cards, 10)),
+        bench("scrapers.visasponsor_parse_all", lambda: parse_visasponsor_html(html, limit=10_000), html_bytes=len(html), cards=cards),
+    ]
+
+
+if __name__ == "__main__":
+    report(run())
@@ -0,0 +1,60 @@
+"""
+Tracked-job load/save/update at 10, 1k and 50k jobs: SQLite storage vs the
+legacy tracked_jobs.json read-modify-write. Runs against a temporary directory.
+
+    cd backend && python -m benchmarks.bench_storage
+"""
+import json
+import os
+import tempfile
+from benchmarks.common import bench, report, scale_jobs
+from storage import Storage
+
+
+def legacy_load(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def legacy_save(path, jobs):
+    with open(path, "w") as f:
+        json.dump(jobs, f, indent=2)
+
+
+def legacy_update(path, job_id, status):
+    """The status update as main.py used to do it: load every job, change one, write them all."""
+    jobs = legacy_load(path)
+    for job in jobs:
+        if job["id"] == job_id:
+            job["status"] = status
+            break
+    legacy_save(path, jobs)
+
+
+def run():
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in (10, 1000, 50000):
+            jobs = scale_jobs(n)
+            middle_id = jobs[n // 2]["id"]
+            repeat = 3 if n >= 50000 else 5
+            number = 1 if n >= 50000 else 10
+
+            storage = Storage(os.path.join(tmp, f"bench_{n}.db"), legacy_jobs_path=None, legacy_searches_path=None)
+            results.append(bench("storage.sqlite_save_all", lambda: storage.replace_tracked_jobs(jobs), repeat=repeat, rows=n))
+            results.append(bench("storage.sqlite_load_all", storage.list_tracked_jobs, repeat=repeat, number=number, rows=n))
+            results.append(bench("storage.sqlite_load_page", lambda: storage.query_tracked_jobs(["id", "title", "status"], limit=50),
+                                 number=50, rows=n))
+            results.append(bench("storage.sqlite_update_one",
+                                 lambda: storage.update_tracked_job(middle_id, {"status": "Applied"}), number=50, rows=n))
+
+            path = os.path.join(tmp, f"bench_{n}.json")
+            results.append(bench("storage.json_save_all", lambda: legacy_save(path, jobs), repeat=repeat, rows=n))
+            results.append(bench("storage.json_load_all", lambda: legacy_load(path), repeat=repeat, number=number, rows=n))
+            results.append(bench("storage.json_update_one", lambda: legacy_update(path, middle_id, "Applied"),
+                                 repeat=repeat, number=number, rows=n))
+    return results
+
+
+if __name__ == "__main__":
+    report(run())
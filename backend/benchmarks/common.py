@@ -0,0 +1,90 @@
+import atexit
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+# Backend modules build their singletons (storage, llm_cache, search_cache) at
+# import time. Point them at a throwaway directory before any suite imports
+# one, so an offline run never creates or migrates the real backend/data files.
+_SCRATCH_DIR = tempfile.mkdtemp(prefix="job-finder-bench-")
+atexit.register(shutil.rmtree, _SCRATCH_DIR, ignore_errors=True)
+os.environ["JOB_FINDER_DB"] = os.path.join(_SCRATCH_DIR, "job_finder.db")
+os.environ["LLM_CACHE_PERSIST"] = "0"
+os.environ["SEARCH_CACHE_PERSIST"] = "0"
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Checked-in fixtures: a saved VisaSponsor results page and the sample board
+VISA_HTML_PATH = os.path.join(BACKEND_DIR, "..", "visa_jobs.json")
+TRACKED_JOBS_PATH = os.path.join(BACKEND_DIR, "data", "tracked_jobs.json")
+MASTER_RESUME_PATH = os.path.join(BACKEND_DIR, "data", "master_resume.json")
+
+
+def bench(name: str, fn: Callable[[], object], repeat: int = 5, number: int = 1, **meta) -> Dict:
+    """Runs fn `number` times per round for `repeat` rounds; reports per-call seconds."""
+    fn()  # warm up imports, caches and allocators
+    rounds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - started) / number)
+    return {
+        "name": name,
+        "min_s": min(rounds),
+        "median_s": statistics.median(rounds),
+        "max_s": max(rounds),
+        "repeat": repeat,
+        "number": number,
+        **meta,
+    }
+
+
+def report(results: List[Dict]):
+    """One JSON object per line, so runs can be diffed between commits."""
+    for result in results:
+        print(json.dumps(result))
+
+
+def load_visa_html() -> str:
+    # Despite the extension the file holds the HTML of a search results page
+    with open(VISA_HTML_PATH, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def load_tracked_jobs() -> List[Dict]:
+    with open(TRACKED_JOBS_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_resume_text() -> str:
+    with open(MASTER_RESUME_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)["text"]
+
+
+def scale_jobs(n: int, duplicate_rate: float = 0.0, seed: int = 3) -> List[Dict]:
+    """
+    `n` realistic jobs made by cycling the tracked-jobs fixture with unique ids
+    and URLs. With `duplicate_rate`, that share of them are reposts of an
+    earlier job on another board (same title/company, new URL, small edits).
+    """
+    rng = random.Random(seed)
+    corpus = load_tracked_jobs()
+    jobs = []
+    for i in range(n):
+        if jobs and rng.random() < duplicate_rate:
+            original = rng.choice(jobs)
+            jobs.append({**original, "id": f"bench-{i}", "url": f"https://other-board.example/{i}",
+                         "title": original["title"].upper(), "description": original["description"] + " Apply now."})
+            continue
+        base = corpus[i % len(corpus)]
+        cycle = i // len(corpus)
+        # Later cycles get their own title and company so they are not duplicates of the first
+        suffix = f" {cycle}" if cycle else ""
+        jobs.append({**base, "id": f"bench-{i}", "url": f"https://example.com/jobs/{i}",
+                     "title": base["title"] + suffix, "company": base["company"] + suffix})
+    return jobs
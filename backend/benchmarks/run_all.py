@@ -0,0 +1,113 @@
+"""
+Runs every offline benchmark and writes the results as JSON, so two commits
+can be compared. No network access; inputs are the checked-in fixtures.
+
+    cd backend && python -m benchmarks.run_all --output before.json
+    (change something)
+    cd backend && python -m benchmarks.run_all --output after.json --compare before.json
+
+--only dates,storage runs a subset. --compare prints the ratio of every
+benchmark's best round (min_s, the least noisy statistic) against the
+baseline file and exits with status 1 when one is slower than --threshold
+(default 1.25x).
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+from benchmarks import (
+    bench_dates, bench_dedupe, bench_export, bench_jobspy_frame, bench_prompts, bench_scrapers, bench_storage,
+)
+from benchmarks.common import BACKEND_DIR, report
+
+SUITES = {
+    "scrapers": bench_scrapers,
+    "jobspy_frame": bench_jobspy_frame,
+    "dates": bench_dates,
+    "dedupe": bench_dedupe,
+    "storage": bench_storage,
+    "export": bench_export,
+    "prompts": bench_prompts,
+}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def _key(result: Dict) -> Tuple[str, object]:
+    # The same benchmark runs at several sizes
+    return result["name"], result.get("rows")
+
+
+def compare(results: List[Dict], baseline: List[Dict], threshold: float) -> List[Dict]:
+    """Best-round ratio (current / baseline) per benchmark present in both runs."""
+    previous = {_key(result): result for result in baseline}
+    rows = []
+    for result in results:
+        before = previous.get(_key(result))
+        if before is None or not before["min_s"]:
+            continue
+        ratio = result["min_s"] / before["min_s"]
+        rows.append({"name": result["name"], "rows": result.get("rows"), "baseline_s": before["min_s"],
+                     "current_s": result["min_s"], "ratio": round(ratio, 3), "regression": ratio > threshold})
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", help=f"comma-separated suites out of: {', '.join(SUITES)}")
+    parser.add_argument("--output", help="write the run (metadata + results) to this JSON file")
+    parser.add_argument("--compare", help="JSON file of an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    args = parser.parse_args(argv)
+
+    names = [name.strip() for name in args.only.split(",")] if args.only else list(SUITES)
+    unknown = [name for name in names if name not in SUITES]
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(unknown)}")
+
+    results = []
+    for name in names:
+        started = time.perf_counter()
+        suite_results = SUITES[name].run()
+        for result in suite_results:
+            result["suite"] = name
+        report(suite_results)
+        print(f"# {name}: {len(suite_results)} benchmarks in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+        results.extend(suite_results)
+
+    run = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline["results"], args.threshold)
+        print(f"# compared with {baseline.get('commit')} ({len(rows)} benchmarks)", file=sys.stderr)
+        for row in rows:
+            flag = "  REGRESSION" if row["regression"] else ""
+            print(f"# {row['name']:<45} rows={row['rows']!s:<6} {row['baseline_s']:.6f}s -> {row['current_s']:.6f}s "
+                  f"x{row['ratio']}{flag}", file=sys.stderr)
+        if any(row["regression"] for row in rows):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import re
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Confidence flags stored on every job as `date_confidence`
+EXACT = "exact"            # an absolute calendar date/time
+RELATIVE = "relative"      # "3 days ago", "vor 2 Stunden", "heute"
+APPROXIMATE = "approximate"  # lower bounds such as "30+ days ago"
+UNKNOWN = "unknown"        # missing or unparseable, kept but flagged
+
+_ABSOLUTE_FORMATS = [
+    (re.compile(r"^\d{4}-\d{2}-\d{2}$"), "%Y-%m-%d"),
+    (re.compile(r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}$"), None),  # pandas / ISO datetime
+    (re.compile(r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?([+-]\d{2}:?\d{2}|Z)$"), None),
+    (re.compile(r"^\d{2}-\d{2}-\d{4}$"), "%d-%m-%Y"),      # VisaSponsor
+    (re.compile(r"^\d{2}\.\d{2}\.\d{4}$"), "%d.%m.%Y"),    # German boards
+    (re.compile(r"^\d{2}/\d{2}/\d{4}$"), "%d/%m/%Y"),      # EuropeanJobDays
+]
+
+_UNIT_SECONDS = {
+    "minute": 60, "min": 60,
+    "hour": 3600, "hr": 3600, "stunde": 3600,
+    "day": 86400, "tag": 86400,
+    "week": 604800, "woche": 604800,
+    "month": 2592000, "monat": 2592000,
+}
+_NUMBER_WORDS = {"a": 1, "an": 1, "one": 1, "ein": 1, "eine": 1, "einem": 1, "einer": 1, "einen": 1}
+
+# "3 days ago", "30+ days ago", "an hour ago", "vor 3 Tagen", "vor einer Woche"
+_RELATIVE_RE = re.compile(
+    r"\b(?:vor\s+)?(?P<num>\d+|a|an|one|ein|eine|einem|einer|einen)(?P<plus>\+)?\s*"
+    r"(?P<unit>minute|min|hour|hr|day|week|month|stunde|tag|woche|monat)[a-z]*"
+)
+_NOW_WORDS = ("just now", "today", "heute", "gerade eben", "soeben", "jetzt", "minute")
+_YESTERDAY_WORDS = ("yesterday", "gestern")
+
+
+@lru_cache(maxsize=8192)
+def _parse_text(text: str) -> Tuple[str, float, str]:
+    """
+    Memoized core. Returns (kind, value, confidence) where kind is "abs"
+    (value = UTC epoch seconds) or "rel" (value = seconds before now).
+    Relative results are cached as offsets so the cache never goes stale.
+    """
+    for pattern, fmt in _ABSOLUTE_FORMATS:
+        if pattern.match(text):
+            try:
+                if fmt:
+                    parsed = datetime.strptime(text, fmt)
+                else:
+                    parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+            except ValueError:
+                break
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            return "abs", parsed.timestamp(), EXACT
+
+    lower = text.lower()
+    if "vorgestern" in lower:
+        return "rel", 2 * 86400, RELATIVE
+    if any(word in lower for word in _YESTERDAY_WORDS):
+        return "rel", 86400, RELATIVE
+
+    match = _RELATIVE_RE.search(lower)
+    if match:
+        num = match.group("num")
+        amount = int(num) if num.isdigit() else _NUMBER_WORDS[num]
+        confidence = APPROXIMATE if match.group("plus") else RELATIVE
+        return "rel", amount * _UNIT_SECONDS[match.group("unit")], confidence
+
+    if any(word in lower for word in _NOW_WORDS):
+        return "rel", 0.0, RELATIVE
+
+    return "rel", 0.0, UNKNOWN
+
+
+def parse_date(value, now: Optional[float] = None) -> Tuple[Optional[float], str]:
+    """Returns (UTC epoch seconds or None, confidence) for any date_posted value."""
+    if value is None:
+        return None, UNKNOWN
+    text = str(value).strip()
+    if not text or text.lower() in ("none", "nan", "nat"):
+        return None, UNKNOWN
+    kind, amount, confidence = _parse_text(text)
+    if confidence == UNKNOWN:
+        return None, UNKNOWN
+    if kind == "abs":
+        return amount, confidence
+    return (time.time() if now is None else now) - amount, confidence
+
+
+def normalize_job_dates(jobs: List[Dict], now: Optional[float] = None) -> List[Dict]:
+    """
+    Adds `posted_ts` (UTC epoch seconds), `posted_at` (ISO 8601 UTC) and
+    `date_confidence` to each job, in place. Meant to run once at ingestion.
+    """
+    now = time.time() if now is None else now
+    for job in jobs:
+        ts, confidence = parse_date(job.get('date_posted'), now)
+        job['posted_ts'] = ts
+        job['posted_at'] = datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts is not None else None
+        job['date_confidence'] = confidence
+    return jobs
+
+
+def filter_recent(jobs: List[Dict], hours_old: int, now: Optional[float] = None) -> List[Dict]:
+    """
+    Keeps jobs posted within `hours_old` hours. Jobs with an unknown date are
+    kept (flagged by date_confidence). Jobs not normalized yet are normalized first.
+    """
+    now = time.time() if now is None else now
+    cutoff = now - hours_old * 3600
+    pending = [job for job in jobs if 'posted_ts' not in job]
+    if pending:
+        normalize_job_dates(pending, now)
+    return [job for job in jobs if job['posted_ts'] is None or job['posted_ts'] >= cutoff]
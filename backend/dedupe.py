@@ -0,0 +1,209 @@
+import hashlib
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, parse_qsl, urlencode
+import numpy as np
+
+# Gender/diversity markers German postings append to titles
+_GENDER_RE = re.compile(
+    r"\(\s*(?:[mwfdxg]\s*/\s*)+[mwfdxg]\s*\)|\(\s*(?:all|alle)\s+gender[s]?\s*\)|\(\s*gn\*?\s*\)|\b(?:all|alle)\s+genders?\b|\b[mwfd]/[mwfd]/[mwfdx]\b"
+)
+_COMPANY_SUFFIX_RE = re.compile(
+    r"\b(?:gmbh\s*&\s*co\.?\s*kg(?:aa)?|gmbh|mbh|ag|se|kg|kgaa|ug|e\.?\s*v|ohg|inc|ltd|llc|plc|b\.?v|s\.?a|s\.?a\.?r\.?l|corp|co)\b\.?"
+)
+_NON_WORD_RE = re.compile(r"[^0-9a-zäöüß]+")
+_WORD_RE = re.compile(r"[0-9a-zäöüß]+")
+_TRACKING_PARAMS = {"utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content", "refid", "trackingid", "trk", "from", "src", "ref"}
+
+# Scrapers fill these in when a board gives no description; they say nothing about the posting
+PLACEHOLDER_PREFIXES = ("View full details at", "Visa Sponsored Job:", "European Job Days:", "Scraping failed.")
+
+# MinHash parameters: 16 bands x 4 rows => pairs at Jaccard 0.8 collide with p > 0.999
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+MIN_SHINGLES = 10
+_rng = np.random.default_rng(42)
+# Multiply-shift hash family: h(x) = (a * x + b) >> 32 with odd a, wrapping uint64 arithmetic
+_PERM_A = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_PERM_B = _rng.integers(0, 2**63, size=NUM_PERM, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+_MIX_1, _MIX_2 = np.uint64(0x9E3779B97F4A7C15), np.uint64(0xC2B2AE3D27D4EB4F)
+
+_CONFIDENCE_RANK = {"exact": 3, "relative": 2, "approximate": 1}
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """'Fullstack Engineer – Python / React (all genders)' -> 'fullstack engineer python react'"""
+    text = _GENDER_RE.sub(" ", (title or "").lower())
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+
+def normalize_company(company: Optional[str]) -> str:
+    """'Kertos GmbH' -> 'kertos'"""
+    text = _COMPANY_SUFFIX_RE.sub(" ", (company or "").lower())
+    return " ".join(_NON_WORD_RE.sub(" ", text).split())
+
+
+def normalize_url(url: Optional[str]) -> str:
+    """Drops scheme, 'www.', fragments, trailing slashes and tracking parameters."""
+    url = (url or "").strip()
+    if not url or url == "#":
+        return ""
+    parts = urlsplit(url)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query) if k.lower() not in _TRACKING_PARAMS))
+    return f"{host}{parts.path.rstrip('/')}" + (f"?{query}" if query else "")
+
+
+def job_key(job: Dict) -> str:
+    """Stable id for a posting across boards, from the normalized title and company."""
+    basis = f"{normalize_title(job.get('title'))}|{normalize_company(job.get('company'))}"
+    return "job_" + hashlib.sha1(basis.encode()).hexdigest()[:16]
+
+
+def minhash_signature(text: Optional[str]) -> Optional[np.ndarray]:
+    """MinHash over 3-word shingles; None when the text is too short or a placeholder."""
+    if not text or text.startswith(PLACEHOLDER_PREFIXES):
+        return None
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < MIN_SHINGLES + 2:
+        return None
+    # Hash each word once and combine neighbours arithmetically instead of
+    # joining shingle strings. str hashes are salted per process, which is
+    # fine: signatures are never persisted.
+    word_hashes = np.fromiter(map(hash, words), dtype=np.int64, count=len(words)).view(np.uint64)
+    shingles = word_hashes[:-2] * _MIX_1 + word_hashes[1:-1] * _MIX_2 + word_hashes[2:]
+    # Every permutation at once, then the min per permutation
+    return ((np.outer(_PERM_A, shingles) + _PERM_B[:, None]) >> _SHIFT).min(axis=1)
+
+
+def _record_quality(job: Dict) -> Tuple:
+    description = job.get('description') or ""
+    return (
+        0 if description.startswith(PLACEHOLDER_PREFIXES) else len(description),
+        _CONFIDENCE_RANK.get(job.get('date_confidence'), 0),
+        bool(normalize_url(job.get('url'))),
+        job.get('company') not in (None, "", "Unknown Company"),
+    )
+
+
+class DedupeIndex:
+    """
+    Groups near-duplicate postings as they are added.
+
+    Two postings land in the same group when they share a normalized URL, a
+    normalized title + company, or near-identical descriptions (MinHash
+    Jaccard >= threshold) plus the same normalized title or company.
+    Description candidates come from LSH buckets, so adding a posting costs
+    roughly the same whether the index holds ten postings or ten thousand.
+    """
+
+    def __init__(self, threshold: float = 0.8):
+        self.threshold = threshold
+        self.jobs: List[Dict] = []
+        self._parent: List[int] = []
+        self._names: List[Tuple[str, str]] = []
+        self._signatures: List[Optional[np.ndarray]] = []
+        self._by_url: Dict[str, int] = {}
+        self._by_key: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = defaultdict(list)
+
+    def _find(self, i: int) -> int:
+        while self._parent[i] != i:
+            self._parent[i] = self._parent[self._parent[i]]
+            i = self._parent[i]
+        return i
+
+    def _union(self, a: int, b: int):
+        ra, rb = self._find(a), self._find(b)
+        if ra != rb:
+            # The earliest posting stays the root, so groups keep arrival order
+            self._parent[max(ra, rb)] = min(ra, rb)
+
+    def add(self, job: Dict) -> bool:
+        """Indexes the job. Returns True if it starts a new group, False if it is a duplicate."""
+        idx = len(self.jobs)
+        self.jobs.append(job)
+        self._parent.append(idx)
+        title, company = normalize_title(job.get('title')), normalize_company(job.get('company'))
+        self._names.append((title, company))
+
+        url = normalize_url(job.get('url'))
+        if url:
+            if url in self._by_url:
+                self._union(idx, self._by_url[url])
+            else:
+                self._by_url[url] = idx
+
+        key = f"{title}|{company}"
+        if title:
+            if key in self._by_key:
+                self._union(idx, self._by_key[key])
+            else:
+                self._by_key[key] = idx
+
+        signature = minhash_signature(job.get('description'))
+        self._signatures.append(signature)
+        if signature is not None:
+            buckets = [self._buckets[(band, signature[band * ROWS:(band + 1) * ROWS].tobytes())] for band in range(BANDS)]
+            candidates = set()
+            for bucket in buckets:
+                candidates.update(bucket)
+            matched = False
+            for other in sorted(candidates):
+                if self._find(other) == self._find(idx):
+                    continue
+                other_title, other_company = self._names[other]
+                if (title and title == other_title) or (company and company == other_company):
+                    if float(np.mean(signature == self._signatures[other])) >= self.threshold:
+                        self._union(idx, other)
+                        matched = True
+            # A description that matched an indexed one adds nothing new to the
+            # buckets; skipping it keeps bucket sizes bounded by group count
+            if not matched:
+                for bucket in buckets:
+                    bucket.append(idx)
+
+        return self._find(idx) == idx
+
+    def groups(self) -> List[List[int]]:
+        grouped: Dict[int, List[int]] = {}
+        for i in range(len(self.jobs)):
+            grouped.setdefault(self._find(i), []).append(i)
+        return [grouped[root] for root in sorted(grouped)]
+
+    def merged_jobs(self) -> List[Dict]:
+        """Best record of each group, with every source URL and board attached."""
+        merged = []
+        for members in self.groups():
+            records = [self.jobs[i] for i in members]
+            best = max(records, key=_record_quality)
+            urls, sources = [], []
+            for record in [best] + records:
+                # Records may already be merged groups (e.g. a batch of per-search results)
+                for url in [record.get('url')] + (record.get('urls') or []):
+                    if url and url != "#" and url not in urls:
+                        urls.append(url)
+                for source in [record.get('source')] + (record.get('sources') or []):
+                    if source and source not in sources:
+                        sources.append(source)
+            merged.append({
+                **best,
+                "job_id": job_key(best),
+                "urls": urls,
+                "sources": sources,
+                "duplicates": len(records) - 1 + sum(record.get('duplicates') or 0 for record in records),
+            })
+        return merged
+
+
+def dedupe_jobs(jobs: List[Dict], threshold: float = 0.8) -> List[Dict]:
+    """Collapses duplicate postings across boards, keeping the best record of each."""
+    index = DedupeIndex(threshold)
+    for job in jobs:
+        index.add(job)
+    return index.merged_jobs()
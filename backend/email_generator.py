@@ -1,21 +1,29 @@
-import requests
-import json
 import logging
+from typing import Dict, Iterator
+from llm_cache import llm_cache, make_llm_key
+from llm_client import llm_client
+from llm_stream import stream_generation
+from prompt_budget import compress_pair
+from resume_profile import resume_profiles
 
 logger = logging.getLogger(__name__)
 
-def generate_cold_email(resume_text: str, job_description: str, hiring_manager_name: str = None, platform: str = "Email"):
-    """
-    Generates a cold email or LinkedIn message using a local LLM (Ollama/Mistral).
-    """
-    
-    # Construct the Prompt
-    recipient = hiring_manager_name if hiring_manager_name else "Hiring Manager"
-    
+# Bump when the prompt below changes so cached generations are not reused
+PROMPT_VERSION = 2
+MODEL = "mistral"
+OPTIONS = {
+    "temperature": 0.7,
+    "num_ctx": 4096
+}
+# Token budget per side; emails are short, so they get less context than tailoring
+CONTEXT_TOKENS = 375
+
+def platform_instruction(platform: str) -> str:
+    """Length and format instruction for an Email, LinkedIn note or Cover Letter."""
     if platform == "LinkedIn":
-        limit_instruction = "IMPORTANT: This is for a LinkedIn connection note. MAX 300 CHARACTERS. Be casual but professional."
+        return "IMPORTANT: This is for a LinkedIn connection note. MAX 300 CHARACTERS. Be casual but professional."
     elif platform == "Cover Letter":
-        limit_instruction = """
+        return """
         IMPORTANT: This is a FORMAL COVER LETTER. 
         Structure it properly with:
         - Header (Applicant details)
@@ -28,18 +36,26 @@ def generate_cold_email(resume_text: str, job_description: str, hiring_manager_n
         Length: ~300-400 words. Professional tone.
         """
     else:
-        limit_instruction = "Keep it concise (approx 150 words). Standard professional email format."
+        return "Keep it concise (approx 150 words). Standard professional email format."
+
+def build_cold_email_prompt(resume_text: str, job_description: str, hiring_manager_name: str = None, platform: str = "Email") -> str:
+    # The sections of each side most relevant to the other, within the token budget
+    resume_context, jd_context, _ = compress_pair(resume_text, job_description, CONTEXT_TOKENS, CONTEXT_TOKENS,
+                                                   resume_sections=resume_profiles.sections(resume_text))
+    # Construct the Prompt
+    recipient = hiring_manager_name if hiring_manager_name else "Hiring Manager"
+    limit_instruction = platform_instruction(platform)
     
-    prompt = f"""
+    return f"""
     You are an expert career coach and copywriter. Write a {platform} for me to apply for a job.
     
     CONTEXT:
     - Recipient: {recipient}
     - Platform: {platform}
     - My Resume Summary (Start):
-    {resume_text[:1500]}
+    {resume_context}
     - Job Description (Start):
-    {job_description[:1500]}
+    {jd_context}
     
     INSTRUCTIONS:
     - {limit_instruction}
@@ -48,24 +64,51 @@ def generate_cold_email(resume_text: str, job_description: str, hiring_manager_n
     - Output ONLY the message content. No preamble.
     """
 
+def _cache_key(resume_text: str, job_description: str, hiring_manager_name: str, platform: str) -> str:
+    # The token budget decides what the prompt contains, so it is part of the key
+    return make_llm_key("cold_email", PROMPT_VERSION, MODEL, OPTIONS,
+                        resume_text=resume_text, job_description=job_description,
+                        hiring_manager_name=hiring_manager_name, platform=platform,
+                        budgets=[CONTEXT_TOKENS, CONTEXT_TOKENS])
+
+def _require_text(text: str) -> str:
+    if not text:
+        raise ValueError("No response from LLM.")
+    return text
+
+def call_cold_email_model(resume_text: str, job_description: str, hiring_manager_name: str = None, platform: str = "Email") -> str:
+    """One uncached model call; raises when the model fails or returns nothing."""
+    prompt = build_cold_email_prompt(resume_text, job_description, hiring_manager_name, platform)
+    return _require_text(llm_client.generate(prompt, MODEL, OPTIONS))
+
+def generate_cold_email(resume_text: str, job_description: str, hiring_manager_name: str = None, platform: str = "Email",
+                        regenerate: bool = False):
+    """
+    Generates a cold email or LinkedIn message using a local LLM (Ollama/Mistral).
+    Cached on disk per resume/JD/recipient/platform; regenerate=True asks the model again.
+    """
     try:
-        url = "http://localhost:11434/api/generate"
-        payload = {
-            "model": "mistral",
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.7,
-                "num_ctx": 4096
-            }
-        }
-        
-        response = requests.post(url, json=payload)
-        response.raise_for_status()
-        
-        data = response.json()
-        return data.get("response", "Error: No response from LLM.")
+        # The prompt is built on a miss only, so cache hits skip the compression
+        key = _cache_key(resume_text, job_description, hiring_manager_name, platform)
+        email, cache_state = llm_cache.get_or_generate(
+            key, lambda: call_cold_email_model(resume_text, job_description, hiring_manager_name, platform),
+            regenerate, template="cold_email", model=MODEL,
+        )
+        logger.info(f"Generated {platform} message ({cache_state})")
+        return email
 
     except Exception as e:
         logger.error(f"Failed to generate email: {e}")
         return f"Error generating email: {str(e)}"
+
+def stream_cold_email(resume_text: str, job_description: str, hiring_manager_name: str = None, platform: str = "Email", regenerate: bool = False) -> Iterator[Dict]:
+    """Streaming generate_cold_email: token events as the message is written, then done."""
+    return stream_generation(
+        _cache_key(resume_text, job_description, hiring_manager_name, platform),
+        lambda: llm_client.stream(build_cold_email_prompt(resume_text, job_description, hiring_manager_name, platform),
+                                  MODEL, OPTIONS),
+        to_value=_require_text,
+        regenerate=regenerate,
+        template="cold_email",
+        model=MODEL,
+    )
@@ -1,24 +1,35 @@
-import requests
 import json
 import logging
+from llm_cache import llm_cache, make_llm_key
+from typing import Dict, Iterator
+from llm_client import llm_client
+from llm_stream import stream_generation
+from prompt_budget import compress_pair, RESUME_TOKEN_BUDGET, JD_TOKEN_BUDGET
+from resume_profile import resume_profiles
 
 logger = logging.getLogger(__name__)
 
-def generate_interview_prep(resume_text: str, job_description: str):
-    """
-    Generates interview preparation questions and answers using a local LLM (Ollama/Mistral).
-    Returns a structured JSON object with Technical and Behavioral sections.
-    """
-    
-    prompt = f"""
+# Bump when the prompt below changes so cached generations are not reused
+PROMPT_VERSION = 2
+MODEL = "mistral"
+OPTIONS = {
+    "temperature": 0.5,
+    "num_ctx": 4096
+}
+
+def build_interview_prep_prompt(resume_text: str, job_description: str) -> str:
+    # The sections of each side most relevant to the other, within the token budget
+    resume_context, jd_context, _ = compress_pair(resume_text, job_description,
+                                                   resume_sections=resume_profiles.sections(resume_text))
+    return f"""
     You are an expert technical interviewer and career coach.
     Based on the Candidate's Resume and the Job Description, generate a preparation guide.
     
     JOB DESCRIPTION:
-    {job_description[:2000]}...
+    {jd_context}
     
     CANDIDATE RESUME:
-    {resume_text[:2000]}...
+    {resume_context}
     
     TASK:
     Generate a JSON response with 2 sections:
@@ -40,33 +51,41 @@ def generate_interview_prep(resume_text: str, job_description: str):
     Ensure the JSON is valid and do not include markdown formatting like ```json.
     """
 
+def _cache_key(resume_text: str, job_description: str) -> str:
+    # The token budgets decide what the prompt contains, so they are part of the key
+    return make_llm_key("interview_prep", PROMPT_VERSION, MODEL, {**OPTIONS, "format": "json"},
+                        resume_text=resume_text, job_description=job_description,
+                        budgets=[RESUME_TOKEN_BUDGET, JD_TOKEN_BUDGET])
+
+def parse_prep_json(raw_response: str) -> dict:
+    """Parse JSON from LLM (a parse error propagates, so it is never cached)."""
+    raw_response = raw_response or "{}"
     try:
-        url = "http://localhost:11434/api/generate"
-        payload = {
-            "model": "mistral",
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": 0.5,
-                "num_ctx": 4096
-            },
-            "format": "json" # Force JSON mode if model supports it
-        }
-        
-        response = requests.post(url, json=payload)
-        response.raise_for_status()
-        
-        data = response.json()
-        raw_response = data.get("response", "{}")
-        
-        # Parse JSON from LLM
-        try:
-            prep_data = json.loads(raw_response)
-        except json.JSONDecodeError:
-            # Fallback simple cleaning if strict JSON fails
-            clean_text = raw_response.replace("```json", "").replace("```", "").strip()
-            prep_data = json.loads(clean_text)
-            
+        return json.loads(raw_response)
+    except json.JSONDecodeError:
+        # Fallback simple cleaning if strict JSON fails
+        clean_text = raw_response.replace("```json", "").replace("```", "").strip()
+        return json.loads(clean_text)
+
+def call_interview_prep_model(resume_text: str, job_description: str) -> dict:
+    """One uncached model call; raises when the model fails or returns invalid JSON."""
+    prompt = build_interview_prep_prompt(resume_text, job_description)
+    # Force JSON mode if model supports it
+    return parse_prep_json(llm_client.generate(prompt, MODEL, OPTIONS, format="json"))
+
+def generate_interview_prep(resume_text: str, job_description: str, regenerate: bool = False):
+    """
+    Generates interview preparation questions and answers using a local LLM (Ollama/Mistral).
+    Returns a structured JSON object with Technical and Behavioral sections.
+    Cached on disk per resume/JD; regenerate=True asks the model again.
+    """
+    try:
+        # The prompt is built on a miss only, so cache hits skip the compression
+        prep_data, cache_state = llm_cache.get_or_generate(
+            _cache_key(resume_text, job_description), lambda: call_interview_prep_model(resume_text, job_description),
+            regenerate, template="interview_prep", model=MODEL,
+        )
+        logger.info(f"Generated interview prep ({cache_state})")
         return prep_data
 
     except Exception as e:
@@ -75,3 +94,20 @@ def generate_interview_prep(resume_text: str, job_description: str):
             "technical_questions": [{"question": "Error generating questions.", "answer_tips": str(e)}],
             "behavioral_questions": []
         }
+
+def stream_interview_prep(resume_text: str, job_description: str, regenerate: bool = False) -> Iterator[Dict]:
+    """
+    Streaming generate_interview_prep: token events, an item event for every
+    completed question (so questions render one by one), a field event per
+    finished section, then done with the parsed guide.
+    """
+    return stream_generation(
+        _cache_key(resume_text, job_description),
+        lambda: llm_client.stream(build_interview_prep_prompt(resume_text, job_description), MODEL, OPTIONS, format="json"),
+        to_value=parse_prep_json,
+        to_text=json.dumps,
+        json_output=True,
+        regenerate=regenerate,
+        template="interview_prep",
+        model=MODEL,
+    )
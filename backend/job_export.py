@@ -0,0 +1,125 @@
+import csv
+import io
+import json
+import logging
+import zlib
+from typing import Dict, Iterable, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+# Rows per CSV/NDJSON chunk and per Parquet row group
+CHUNK_ROWS = 500
+
+
+class ExportUnavailable(Exception):
+    """The requested format needs a dependency that is not installed."""
+
+
+def _chunks(rows: Iterable[Dict], size: int = CHUNK_ROWS) -> Iterator[List[Dict]]:
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv(rows: Iterable[Dict], fields: List[str]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    for chunk in _chunks(rows):
+        writer.writerows([row.get(field) for field in fields] for row in chunk)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only: nothing matched
+        yield buffer.getvalue().encode()
+
+
+def iter_ndjson(rows: Iterable[Dict], fields: List[str]) -> Iterator[bytes]:
+    for chunk in _chunks(rows):
+        yield "".join(json.dumps({field: row.get(field) for field in fields}) + "\n" for row in chunk).encode()
+
+
+class _Drain(io.RawIOBase):
+    """Write-only sink whose bytes are taken out after every row group."""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.parts.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def take(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def iter_parquet(rows: Iterable[Dict], fields: List[str]) -> Iterator[bytes]:
+    """One row group per CHUNK_ROWS rows, each sent as soon as it is written."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ExportUnavailable("Parquet export needs pyarrow (pip install pyarrow)")
+
+    # Every column as nullable text, so the schema is known before the first row
+    schema = pa.schema([(field, pa.string()) for field in fields])
+    sink = _Drain()
+    writer = pq.ParquetWriter(sink, schema, compression="snappy")
+    try:
+        for chunk in _chunks(rows):
+            columns = {field: [None if row.get(field) is None else str(row.get(field)) for row in chunk] for field in fields}
+            writer.write_table(pa.table(columns, schema=schema))
+            yield sink.take()
+    finally:
+        writer.close()
+    yield sink.take()
+
+
+WRITERS = {"csv": iter_csv, "ndjson": iter_ndjson, "parquet": iter_parquet}
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # wbits 31: gzip container
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_stream(rows: Iterable[Dict], fields: List[str], format: str = "csv", gzip: bool = False) -> Iterator[bytes]:
+    """
+    Encoded export of `rows` (consumed lazily) with the given columns. The
+    first chunk is produced eagerly, so an unavailable format fails before the
+    response starts.
+    """
+    chunks = WRITERS[format](rows, fields)
+    first = next(chunks, b"")
+
+    def all_chunks() -> Iterator[bytes]:
+        yield first
+        yield from chunks
+
+    return gzip_stream(all_chunks()) if gzip else all_chunks()
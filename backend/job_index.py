@@ -0,0 +1,181 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+from dedupe import job_key
+from storage import DB_PATH, storage
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    rowid INTEGER PRIMARY KEY,
+    job_id TEXT NOT NULL UNIQUE,
+    title TEXT,
+    company TEXT,
+    location TEXT,
+    description TEXT,
+    source TEXT,
+    posted_ts REAL,
+    tracked INTEGER NOT NULL DEFAULT 0,
+    indexed_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_postings_posted ON postings (posted_ts);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5(
+    title, company, location, description,
+    content='postings', content_rowid='rowid',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+-- Keep the external-content FTS table in sync with postings
+CREATE TRIGGER IF NOT EXISTS postings_ai AFTER INSERT ON postings BEGIN
+    INSERT INTO postings_fts (rowid, title, company, location, description)
+    VALUES (new.rowid, new.title, new.company, new.location, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS postings_ad AFTER DELETE ON postings BEGIN
+    INSERT INTO postings_fts (postings_fts, rowid, title, company, location, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS postings_au AFTER UPDATE OF title, company, location, description ON postings BEGIN
+    INSERT INTO postings_fts (postings_fts, rowid, title, company, location, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+    INSERT INTO postings_fts (rowid, title, company, location, description)
+    VALUES (new.rowid, new.title, new.company, new.location, new.description);
+END;
+"""
+
+UPSERT_SQL = """
+INSERT INTO postings (job_id, title, company, location, description, source, posted_ts, tracked, indexed_at, data)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (job_id) DO UPDATE SET
+    title = excluded.title,
+    company = excluded.company,
+    location = excluded.location,
+    description = excluded.description,
+    source = excluded.source,
+    posted_ts = COALESCE(excluded.posted_ts, postings.posted_ts),
+    tracked = MAX(postings.tracked, excluded.tracked),
+    indexed_at = excluded.indexed_at,
+    data = excluded.data
+"""
+
+# Column weights for bm25(): a title hit counts most, description least
+BM25_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def to_fts_query(text: str) -> str:
+    """Free text -> FTS5 query: every word must match, each as a quoted prefix term."""
+    tokens = _TOKEN_RE.findall(text or "")
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class JobIndex:
+    """
+    Local full-text index (SQLite FTS5, BM25 ranking) over every posting that
+    came through a search plus every tracked job. One row per posting, keyed
+    by dedupe.job_key, so the same posting from several boards is stored once.
+    """
+
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def add_jobs(self, jobs: List[Dict], tracked: bool = False) -> int:
+        """Upserts postings. Returns how many rows were written."""
+        now = time.time()
+        rows = []
+        for job in jobs:
+            if not job.get('title'):
+                continue
+            rows.append((
+                job.get('job_id') or job_key(job),
+                job.get('title'),
+                job.get('company'),
+                job.get('location'),
+                job.get('description'),
+                job.get('source'),
+                job.get('posted_ts'),
+                1 if tracked else 0,
+                now,
+                json.dumps(job, default=str),
+            ))
+        if rows:
+            conn = self._connect()
+            with conn:
+                conn.executemany(UPSERT_SQL, rows)
+        return len(rows)
+
+    def untrack(self, job: Dict):
+        conn = self._connect()
+        with conn:
+            conn.execute("UPDATE postings SET tracked = 0 WHERE job_id = ?", (job.get('job_id') or job_key(job),))
+
+    def search(
+        self,
+        query: str,
+        location: Optional[str] = None,
+        source: Optional[str] = None,
+        hours_old: Optional[int] = None,
+        tracked_only: bool = False,
+        limit: int = 50,
+    ) -> List[Dict]:
+        """BM25-ranked postings matching every word of `query`, best first."""
+        fts_query = to_fts_query(query)
+        if not fts_query:
+            return []
+        sql = (
+            f"SELECT p.data, p.tracked, bm25(postings_fts, {', '.join(map(str, BM25_WEIGHTS))}) AS score "
+            "FROM postings_fts JOIN postings p ON p.rowid = postings_fts.rowid "
+            "WHERE postings_fts MATCH ?"
+        )
+        params: list = [fts_query]
+        if location and location.strip().lower() not in ("germany", "deutschland", ""):
+            # The boards mostly return cities; "Germany" would filter everything out
+            sql += " AND p.location LIKE ?"
+            params.append(f"%{location.strip()}%")
+        if source:
+            sql += " AND lower(p.source) = lower(?)"
+            params.append(source)
+        if hours_old is not None:
+            # Same rule as the live filter: unknown dates are kept
+            sql += " AND (p.posted_ts IS NULL OR p.posted_ts >= ?)"
+            params.append(time.time() - hours_old * 3600)
+        if tracked_only:
+            sql += " AND p.tracked = 1"
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        results = []
+        for row in self._connect().execute(sql, params).fetchall():
+            job = json.loads(row["data"])
+            # bm25() is lower-is-better; flip it so clients can sort descending
+            job['relevance'] = round(-row["score"], 4)
+            job['tracked'] = bool(row["tracked"])
+            results.append(job)
+        return results
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+
+# Lives in the same SQLite file as the tracked jobs
+job_index = JobIndex(storage.path)
@@ -1,149 +1,323 @@
 import logging
-import csv
-from typing import List, Dict
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeoutError
+from typing import List, Dict, Iterator, Optional, Tuple
+import pandas as pd
 from jobspy import scrape_jobs
 from scrapers.visasponsor import scrape_visasponsor
 from scrapers.europeanjobdays import scrape_europeanjobdays
+from search_cache import search_cache, make_search_key
+from date_normalizer import normalize_job_dates, filter_recent
+from dedupe import DedupeIndex, dedupe_jobs
+from job_index import job_index
 
 logger = logging.getLogger(__name__)
 
-def search_jobs_in_germany(query: str, location: str = "Germany", hours_old: int = 72) -> List[Dict[str, str]]:
+# Per-source deadline in seconds, counted from when the source gets a board slot.
+# A source that has not finished by then is reported as "timeout" and its (late)
+# results are dropped for this request.
+DEFAULT_SOURCE_TIMEOUT = float(os.getenv("JOB_SOURCE_TIMEOUT", "45"))
+SOURCE_TIMEOUTS = {
+    "jobspy": DEFAULT_SOURCE_TIMEOUT,
+    "visasponsor": DEFAULT_SOURCE_TIMEOUT,
+    "europeanjobdays": DEFAULT_SOURCE_TIMEOUT,
+}
+
+# How many scrapes of each board may run at once across all requests (batch runs
+# of saved searches included). Keeps us from hammering a single board.
+SOURCE_CONCURRENCY = {
+    "jobspy": int(os.getenv("JOBSPY_CONCURRENCY", "2")),
+    "visasponsor": int(os.getenv("VISASPONSOR_CONCURRENCY", "4")),
+    "europeanjobdays": int(os.getenv("EUROPEANJOBDAYS_CONCURRENCY", "2")),
+}
+_source_slots = {name: threading.BoundedSemaphore(limit) for name, limit in SOURCE_CONCURRENCY.items()}
+
+# Shared pools so a timed-out scrape keeps running in the background without
+# blocking the request that gave up on it (a `with` block would join it).
+# _source_executor threads wait for a board slot, _scrape_executor threads scrape.
+_source_executor = ThreadPoolExecutor(max_workers=12, thread_name_prefix="job-source")
+_scrape_executor = ThreadPoolExecutor(max_workers=12, thread_name_prefix="job-scrape")
+
+
+JOBSPY_RESULTS_WANTED = int(os.getenv("JOBSPY_RESULTS_WANTED", "10"))
+JOBSPY_COLUMNS = ["title", "company", "location", "description", "job_url", "date_posted", "site"]
+
+
+def _blank(column: pd.Series) -> pd.Series:
+    """True where the legacy `row.get(col) or default` would have used the default."""
+    return column.isna() | column.eq("")
+
+
+def jobspy_frame_to_jobs(jobs_df: pd.DataFrame, location: str) -> List[Dict[str, str]]:
     """
-    Searches for jobs in Germany using python-jobspy and custom scrapers.
-    Scrapes Indeed, LinkedIn, Glassdoor, VisaSponsor, and EuropeanJobDays.
+    Converts a JobSpy DataFrame into job dicts column-wise: defaults, the
+    missing-title filter, the description fallback and date stringification
+    are vectorized, then every column is exported once with tolist() and the
+    records are zipped together (much cheaper than to_dict's per-cell boxing).
     """
+    df = jobs_df.reindex(columns=JOBSPY_COLUMNS)
+    df = df[~_blank(df["title"])]
+    if df.empty:
+        return []
+
+    url_blank = _blank(df["job_url"])
+    date_blank = _blank(df["date_posted"])
+    out = pd.DataFrame({
+        "title": df["title"],
+        "company": df["company"].where(~_blank(df["company"]), "Unknown Company"),
+        "location": df["location"].where(~_blank(df["location"]), location),
+        "description": df["description"].where(
+            ~_blank(df["description"]), "View full details at " + df["job_url"].astype(str).where(~url_blank, "")
+        ),
+        "url": df["job_url"].where(~url_blank, "#"),
+        "date_posted": df["date_posted"].astype(str).astype(object).where(~date_blank, None),
+        "source": df["site"].where(~_blank(df["site"]), "JobSpy"),
+    })
+    keys = list(out.columns)
+    return [dict(zip(keys, values)) for values in zip(*(out[key].tolist() for key in keys))]
+
+
+def _scrape_jobspy(query: str, location: str, hours_old: int, timeout: Optional[float] = None) -> List[Dict[str, str]]:
+    """Indeed, LinkedIn and Glassdoor via python-jobspy."""
+    # JobSpy has no deadline parameter; _run_source stops waiting for it instead
+    jobs_df = scrape_jobs(
+        site_name=["indeed", "linkedin", "glassdoor"],
+        search_term=query,
+        location=location,
+        results_wanted=JOBSPY_RESULTS_WANTED,
+        hours_old=hours_old,
+        country_indeed='Germany'
+    )
+    return jobspy_frame_to_jobs(jobs_df, location)
+
+
+def _scrape_visasponsor(query: str, location: str, hours_old: int, timeout: Optional[float] = None) -> List[Dict[str, str]]:
+    return scrape_visasponsor(query, location, timeout=timeout)
+
+
+def _scrape_europeanjobdays(query: str, location: str, hours_old: int, timeout: Optional[float] = None) -> List[Dict[str, str]]:
+    # EuropeanJobDays search seems location agnostic or hard to filter by city in URL,
+    # but we pass query.
+    return scrape_europeanjobdays(query, timeout=timeout)
+
+
+SOURCES = {
+    "jobspy": _scrape_jobspy,
+    "visasponsor": _scrape_visasponsor,
+    "europeanjobdays": _scrape_europeanjobdays,
+}
+
+
+class SourceTimeout(Exception):
+    """A source did not finish within its timeout."""
+
+
+def _run_source(name: str, query: str, location: str, hours_old: int, timeout: float) -> List[Dict[str, str]]:
+    slot = _source_slots.get(name)
+    if slot is not None:
+        slot.acquire()
+    # The deadline starts once the board slot is ours, so waiting behind other
+    # searches for the same board does not count against it
+    try:
+        future = _scrape_executor.submit(SOURCES[name], query, location, hours_old, timeout)
+    except BaseException:
+        if slot is not None:
+            slot.release()
+        raise
+    if slot is not None:
+        # Held until the scrape really ends; browser scrapes are cancelled at the
+        # deadline, so only a JobSpy call can outlive it
+        future.add_done_callback(lambda _: slot.release())
+    try:
+        jobs = future.result(timeout)
+    except FutureTimeoutError:
+        raise SourceTimeout(f"{name} did not finish within {timeout:g}s")
+    # Parse every date_posted exactly once, on the worker thread that fetched it
+    return normalize_job_dates(jobs)
+
+
+def iter_source_results(
+    query: str,
+    location: str = "Germany",
+    hours_old: int = 72,
+    sources: Optional[List[str]] = None,
+    timeout: Optional[float] = None,
+) -> Iterator[Tuple[str, str, List[Dict[str, str]]]]:
+    """
+    Runs every source concurrently and yields (source, status, jobs) as each one
+    finishes. Status is "ok", "error" or "timeout". A source's timeout counts
+    from the moment it gets one of its board's concurrency slots.
+    """
+    names = list(sources) if sources else list(SOURCES)
+    started = time.monotonic()
+    pending = {}
+    for name in names:
+        if name not in SOURCES:
+            raise ValueError(f"Unknown job source: {name}")
+        source_timeout = timeout if timeout is not None else SOURCE_TIMEOUTS.get(name, DEFAULT_SOURCE_TIMEOUT)
+        pending[_source_executor.submit(_run_source, name, query, location, hours_old, source_timeout)] = name
+
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = pending.pop(future)
+            try:
+                jobs = future.result()
+                logger.info(f"{name}: {len(jobs)} jobs in {time.monotonic() - started:.1f}s")
+                yield name, "ok", jobs
+            except SourceTimeout as e:
+                logger.warning(f"{e}, skipping")
+                yield name, "timeout", []
+            except Exception as e:
+                logger.error(f"{name} scraping failed: {e}")
+                yield name, "error", []
+
+
+def _search_uncached(
+    query: str,
+    location: str,
+    hours_old: int,
+    sources: Optional[List[str]],
+    timeout: Optional[float],
+) -> Dict[str, object]:
     logger.info(f"Scraping jobs for {query} in {location} (last {hours_old}h)...")
-    
+
     all_results = []
-    
-    # 1. JobSpy Scraper (Indeed, LinkedIn, Glassdoor)
-    try:
-        jobs_df = scrape_jobs(
-            site_name=["indeed", "linkedin", "glassdoor"],
-            search_term=query,
-            location=location,
-            results_wanted=10,
-            hours_old=hours_old,
-            country_indeed='Germany'
-        )
-        
-        jobs_df = jobs_df.fillna("")
-        
-        for index, row in jobs_df.iterrows():
-            title = row.get('title')
-            if not title:
-                continue
-
-            all_results.append({
-                "title": title,
-                "company": row.get('company') or "Unknown Company",
-                "location": row.get('location') or location,
-                "description": row.get('description') or f"View full details at {row.get('job_url')}",
-                "url": row.get('job_url') or "#",
-                "date_posted": str(row.get('date_posted')) if row.get('date_posted') else None,
-                "source": row.get('site', 'JobSpy')
-            })
-            
-    except Exception as e:
-        logger.error(f"JobSpy scraping failed: {e}")
+    source_status = {}
+
+    for name, status, jobs in iter_source_results(query, location, hours_old, sources, timeout):
+        source_status[name] = status
+        all_results.extend(jobs)
+
+    # Merge all results
+    logger.info(f"Total raw jobs found: {len(all_results)}")
+
+    final_results = filter_recent(all_results, hours_old)
+
+    logger.info(f"Filtered jobs (last {hours_old}h): {len(final_results)}")
 
-    # 2. VisaSponsor Scraper
+    # The same posting often comes back from several boards
+    final_results = dedupe_jobs(final_results)
+
+    logger.info(f"Unique jobs after dedupe: {len(final_results)}")
+
+    _index_results(final_results)
+
+    return {"jobs": final_results, "source_status": source_status}
+
+
+def _index_results(jobs: List[Dict[str, str]]):
+    """Remember every posting we have seen in the local full-text index."""
     try:
-        vs_results = scrape_visasponsor(query, location)
-        all_results.extend(vs_results)
+        job_index.add_jobs(jobs)
     except Exception as e:
-        logger.error(f"VisaSponsor integration failed: {e}")
+        logger.warning(f"Could not index search results: {e}")
+
 
-    # 3. EuropeanJobDays Scraper
+def search_jobs_with_status(
+    query: str,
+    location: str = "Germany",
+    hours_old: int = 72,
+    timeout: Optional[float] = None,
+    sources: Optional[List[str]] = None,
+    refresh: bool = False,
+    fallback: bool = True,
+) -> Tuple[List[Dict[str, str]], Dict[str, str], str]:
+    """
+    Same as search_jobs_in_germany, but also returns the per-source status
+    ({"jobspy": "ok", "visasponsor": "timeout", ...}) and the cache state
+    ("hit", "stale" or "miss"). `refresh=True` bypasses the cached result.
+    With `fallback=False` an empty search returns [] instead of the mock jobs.
+    """
+    key = make_search_key(query, location, hours_old, sources or SOURCES)
+    result, cache_state = search_cache.get_or_load(
+        key,
+        lambda: _search_uncached(query, location, hours_old, sources, timeout),
+        refresh=refresh,
+        # Don't remember a search where every board failed
+        cacheable=lambda result: "ok" in result["source_status"].values(),
+    )
+
+    if not result["jobs"] and fallback:
+        return get_mock_jobs(query, location), result["source_status"], cache_state
+
+    # Callers tag jobs in place (e.g. source_query), so never hand out the cached dicts
+    return [dict(job) for job in result["jobs"]], dict(result["source_status"]), cache_state
+
+
+def search_jobs_in_germany(query: str, location: str = "Germany", hours_old: int = 72, timeout: Optional[float] = None) -> List[Dict[str, str]]:
+    """
+    Searches for jobs in Germany using python-jobspy and custom scrapers.
+    Scrapes Indeed, LinkedIn, Glassdoor, VisaSponsor, and EuropeanJobDays
+    concurrently; total latency is bounded by the slowest source or its deadline.
+    """
+    jobs, _, _ = search_jobs_with_status(query, location, hours_old, timeout)
+    return jobs
+
+def iter_search_events(
+    query: str,
+    location: str = "Germany",
+    hours_old: int = 72,
+    timeout: Optional[float] = None,
+    sources: Optional[List[str]] = None,
+) -> Iterator[Dict[str, object]]:
+    """
+    Streaming variant of search_jobs_with_status. Yields one event per step:
+      {"event": "jobs", "source": "index", "jobs": [...]}  local index hits, first
+      {"event": "jobs", "source": ..., "jobs": [...]}      new, recent, deduped jobs
+      {"event": "done" | "error" | "timeout", "source": ..., "count": n, "elapsed": s}
+      {"event": "summary", "total": n, "indexed": n, "source_status": {...}, "cache": ..., "elapsed": s}
+    "total" counts the live postings, the only ones that get cached; index hits
+    are not. A fresh cached result is sent as a single "jobs" event with source "cache".
+    """
+    started = time.monotonic()
+    key = make_search_key(query, location, hours_old, sources or SOURCES)
+    cached = search_cache.peek(key)
+    if cached is not None:
+        yield {"event": "jobs", "source": "cache", "jobs": cached["jobs"]}
+        yield {"event": "summary", "total": len(cached["jobs"]), "indexed": 0, "source_status": cached["source_status"],
+               "cache": "hit", "elapsed": round(time.monotonic() - started, 3)}
+        return
+
+    # Answer from the local index in milliseconds; live boards only add what it lacks.
+    # The index hits are a stream-only prelude: `streamed` suppresses re-sending
+    # them, while `live` holds just what the boards returned, which is what gets cached.
+    streamed = DedupeIndex()
+    live = DedupeIndex()
     try:
-        # EuropeanJobDays search seems location agnostic or hard to filter by city in URL, 
-        # but we pass query.
-        ejd_results = scrape_europeanjobdays(query)
-        all_results.extend(ejd_results)
+        known = job_index.search(query, location, hours_old=hours_old)
     except Exception as e:
-        logger.error(f"EuropeanJobDays integration failed: {e}")
+        logger.warning(f"Local index lookup failed: {e}")
+        known = []
+    for job in known:
+        streamed.add(job)
+    if known:
+        yield {"event": "jobs", "source": "index", "jobs": known}
 
-    # Merge all results
-    logger.info(f"Total raw jobs found: {len(all_results)}")
+    source_status = {}
+    for name, status, jobs in iter_source_results(query, location, hours_old, sources, timeout):
+        source_status[name] = status
+        fresh = []
+        for job in filter_recent(jobs, hours_old):
+            live.add(job)
+            if streamed.add(job):
+                fresh.append(job)
+        if fresh:
+            yield {"event": "jobs", "source": name, "jobs": fresh}
+        yield {"event": "done" if status == "ok" else status, "source": name, "count": len(fresh),
+               "elapsed": round(time.monotonic() - started, 3)}
 
-    # Post-processing Filter: Enforce hours_old
-    final_results = []
-    from datetime import datetime, timedelta
-    
-    # Helper for relative dates
-    def parse_job_date(date_str):
-        if not date_str or str(date_str).lower() == 'none' or str(date_str) == '':
-            return None
-            
-        date_str = str(date_str).strip()
-        
-        # 1. Try ISO format YYYY-MM-DD
-        try:
-            return datetime.strptime(date_str, "%Y-%m-%d")
-        except:
-            pass
-            
-        # 2. Try DD-MM-YYYY
-        try:
-            return datetime.strptime(date_str, "%d-%m-%Y")
-        except:
-            pass
-
-        # 3. Try Relative Dates (e.g. "2 days ago", "just now", "14 hours ago")
-        lower = date_str.lower()
-        now = datetime.now()
-        
-        if "just now" in lower or "today" in lower:
-            return now
-            
-        if "yesterday" in lower:
-            return now - timedelta(days=1)
-            
-        # "X hours ago" or "X minutes ago"
-        if "hour" in lower:
-            try:
-                import re
-                hours = int(re.search(r'(\d+)', lower).group(1))
-                return now - timedelta(hours=hours)
-            except:
-                pass
-        
-        if "minute" in lower: # Treat as now/very recent
-            return now
-            
-        if "day" in lower:
-            # "3 days ago", "30+ days ago"
-            try:
-                import re
-                days = int(re.search(r'(\d+)', lower).group(1))
-                return now - timedelta(days=days)
-            except:
-                pass
-                
-        return None
-
-    cutoff = datetime.now() - timedelta(hours=hours_old)
-    
-    for job in all_results:
-        d_str = job.get('date_posted')
-        
-        job_date = parse_job_date(str(d_str))
-        
-        if job_date:
-            # Compare
-            if job_date >= cutoff:
-                final_results.append(job)
-        else:
-            # If we can't parse date, verify if it is safe to include
-            # For now, append it to be safe.
-            final_results.append(job)
+    # Later duplicates may carry a better record than the one already streamed;
+    # the cache (and thus /search-jobs/) gets the merged best-of-group live list
+    final_results = live.merged_jobs()
+    _index_results(final_results)
+    if "ok" in source_status.values():
+        search_cache.set(key, {"jobs": final_results, "source_status": source_status})
+    yield {"event": "summary", "total": len(final_results), "indexed": len(known), "source_status": source_status,
+           "cache": "miss", "elapsed": round(time.monotonic() - started, 3)}
 
-    logger.info(f"Filtered jobs (last {hours_old}h): {len(final_results)}")
-    
-    if not final_results:
-        return get_mock_jobs(query, location)
-        
-    return final_results
 
 def get_mock_jobs(query, location):
     return [
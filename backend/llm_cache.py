@@ -0,0 +1,190 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+LLM_CACHE_DIR = os.path.join(DATA_DIR, "llm_cache")
+
+
+def make_llm_key(template: str, version: int, model: str, options: Optional[Dict] = None, **inputs) -> str:
+    """
+    Content address of one generation: prompt template name + version, model,
+    sampling options and every input that goes into the prompt (resume, JD,
+    platform, hiring manager, ...). Bump the template version when a prompt changes.
+    """
+    basis = json.dumps(
+        {"template": template, "version": version, "model": model, "options": options or {}, "inputs": inputs},
+        sort_keys=True, default=str,
+    )
+    return hashlib.sha256(basis.encode()).hexdigest()
+
+
+class LLMCache:
+    """
+    Persistent cache for LLM generations, one JSON file per key in `directory`.
+
+    Entries never expire (the key already covers everything the output depends
+    on); the least recently used ones are deleted once the cache holds more
+    than `max_entries` files or `max_bytes` bytes. A hit touches the file, so
+    LRU order survives restarts via mtimes. Only successful generations are
+    stored: the generator raises on failure and nothing is written.
+    """
+
+    def __init__(self, directory: Optional[str], max_entries: int = 2000, max_bytes: int = 50 * 1024 * 1024):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> size in bytes, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._inflight: Dict[str, Future] = {}
+        self.stats_counters = {"hits": 0, "misses": 0, "regenerations": 0, "errors": 0, "evictions": 0}
+        if directory:
+            self._load()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            if key not in self._entries:
+                return None
+            try:
+                with open(self._path(key), "r") as f:
+                    value = json.load(f)["value"]
+            except Exception as e:
+                logger.warning(f"Dropping unreadable LLM cache entry {key[:12]}: {e}")
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            try:
+                os.utime(self._path(key))
+            except OSError:
+                pass
+            return value
+
+    def lookup(self, key: str, regenerate: bool = False) -> Optional[Any]:
+        """get() that counts a hit, a miss or (regenerate=True, never reads) a regeneration."""
+        if regenerate:
+            with self._lock:
+                self.stats_counters["regenerations"] += 1
+            return None
+        value = self.get(key)
+        with self._lock:
+            self.stats_counters["hits" if value is not None else "misses"] += 1
+        return value
+
+    def get_or_generate(self, key: str, generate: Callable[[], Any], regenerate: bool = False, persist: bool = True,
+                        **meta) -> Tuple[Any, str]:
+        """
+        Returns (value, state) where state is "hit", "miss", "regenerated" or "uncached".
+        `regenerate=True` skips the lookup and overwrites the entry.
+        `persist=False` neither reads nor writes the cache ("uncached").
+        Concurrent misses for the same key share one generation.
+        """
+        if not persist:
+            return generate(), "uncached"
+        value = self.lookup(key, regenerate)
+        if value is not None:
+            return value, "hit"
+        state = "regenerated" if regenerate else "miss"
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            return future.result(), state
+
+        try:
+            value = generate()
+            self.set(key, value, **meta)
+            future.set_result(value)
+            return value, state
+        except BaseException as e:
+            with self._lock:
+                self.stats_counters["errors"] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def set(self, key: str, value: Any, **meta):
+        if not self.directory:
+            return
+        payload = json.dumps({"created_at": time.time(), **meta, "value": value}, default=str)
+        with self._lock:
+            try:
+                tmp_path = self._path(key) + ".tmp"
+                with open(tmp_path, "w") as f:
+                    f.write(payload)
+                os.replace(tmp_path, self._path(key))
+            except Exception as e:
+                logger.warning(f"Could not persist LLM cache entry: {e}")
+                return
+            self._bytes -= self._entries.pop(key, 0)
+            self._entries[key] = len(payload)
+            self._bytes += len(payload)
+            self._evict()
+
+    def _drop(self, key: str):
+        self._bytes -= self._entries.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            self._drop(next(iter(self._entries)))
+            self.stats_counters["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._drop(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.stats_counters["hits"] + self.stats_counters["misses"]
+            return {
+                **self.stats_counters,
+                "hit_rate": round(self.stats_counters["hits"] / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _load(self):
+        os.makedirs(self.directory, exist_ok=True)
+        files = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                stat = os.stat(os.path.join(self.directory, name))
+                files.append((stat.st_mtime, name[:-5], stat.st_size))
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._bytes += size
+        self._evict()
+        if self._entries:
+            logger.info(f"LLM cache: {len(self._entries)} generations on disk")
+
+
+llm_cache = LLMCache(
+    LLM_CACHE_DIR if os.getenv("LLM_CACHE_PERSIST", "1") == "1" else None,
+    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000")),
+    max_bytes=int(os.getenv("LLM_CACHE_MAX_BYTES", str(50 * 1024 * 1024))),
+)
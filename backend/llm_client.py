@@ -0,0 +1,285 @@
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Dict, Iterator, List, Optional, Sequence
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434").rstrip("/")
+CHAT = "chat"          # OpenAI-compatible /v1/chat/completions
+GENERATE = "generate"  # native /api/generate
+
+
+class LLMUnavailable(Exception):
+    """The model server could not be reached or returned an error."""
+
+
+class _FairSemaphore:
+    """Semaphore that admits waiters strictly in arrival order."""
+
+    def __init__(self, value: int):
+        self._value = value
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._value > 0 and not self._waiters:
+                self._value -= 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        # The releaser hands its slot straight to us, so no re-check is needed
+        event.wait()
+
+    def release(self):
+        with self._lock:
+            if self._waiters:
+                self._waiters.popleft().set()
+            else:
+                self._value += 1
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class LLMClient:
+    """
+    One pooled keep-alive HTTP session to the local Ollama server, shared by
+    tailoring, cold emails and interview prep.
+
+    Every request has explicit connect/read timeouts. At most `max_concurrency`
+    generations run at once; further callers wait in arrival order. For each
+    model the client remembers which endpoint answered, so a model without the
+    chat endpoint is only probed once instead of on every call.
+    """
+
+    def __init__(self, base_url: str = OLLAMA_URL, max_concurrency: int = 2,
+                 connect_timeout: float = 5.0, read_timeout: float = 180.0):
+        self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_concurrency = max_concurrency
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(4, max_concurrency * 2))
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._slots = _FairSemaphore(max_concurrency)
+        self._endpoints: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats_counters = {"requests": 0, "errors": 0, "endpoint_fallbacks": 0}
+
+    def generate(
+        self,
+        prompt: str,
+        model: str,
+        options: Optional[Dict] = None,
+        format: Optional[str] = None,
+        endpoints: Sequence[str] = (GENERATE,),
+        read_timeout: Optional[float] = None,
+    ) -> str:
+        """
+        Returns the completion text. `endpoints` lists the endpoints to try in
+        order; once one works for `model` it is used first from then on.
+        `format` ("json") is passed to the native endpoint only.
+        Raises LLMUnavailable when none answers.
+        """
+        remembered = self._endpoints.get(model)
+        order = [remembered] + [e for e in endpoints if e != remembered] if remembered in endpoints else list(endpoints)
+        timeout = (self.timeout[0], read_timeout or self.timeout[1])
+
+        with self._slots:
+            with self._lock:
+                self._in_flight += 1
+            try:
+                last_error: Optional[Exception] = None
+                for endpoint in order:
+                    try:
+                        text = self._call(endpoint, prompt, model, options or {}, format, timeout)
+                    except requests.ConnectionError as e:
+                        # The server is down; another endpoint will not help
+                        self.stats_counters["errors"] += 1
+                        raise LLMUnavailable(f"Cannot reach {self.base_url}: {e}") from e
+                    except Exception as e:
+                        self.stats_counters["errors"] += 1
+                        self.stats_counters["endpoint_fallbacks"] += 1
+                        logger.warning(f"{endpoint} endpoint failed for {model}: {e}")
+                        last_error = e
+                        continue
+                    if self._endpoints.get(model) != endpoint:
+                        self._endpoints[model] = endpoint
+                        logger.info(f"Using the {endpoint} endpoint for {model}")
+                    return text
+                raise LLMUnavailable(f"No endpoint answered for {model}: {last_error}")
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+    def generate_native(
+        self,
+        prompt: str,
+        model: str,
+        options: Optional[Dict] = None,
+        format: Optional[str] = None,
+        context: Optional[List[int]] = None,
+        read_timeout: Optional[float] = None,
+    ) -> Dict:
+        """
+        One non-streaming call to the native endpoint, returning Ollama's whole
+        reply: "response", "context" (the evaluated tokens, to continue from
+        without re-evaluating them) and the prompt_eval/eval counts and
+        durations. Raises LLMUnavailable on any failure.
+        """
+        payload = {"model": model, "prompt": prompt, "stream": False, "options": options or {}}
+        if format:
+            payload["format"] = format
+        if context:
+            payload["context"] = context
+        timeout = (self.timeout[0], read_timeout or self.timeout[1])
+
+        with self._slots:
+            with self._lock:
+                self._in_flight += 1
+            try:
+                self.stats_counters["requests"] += 1
+                response = self.session.post(f"{self.base_url}/api/generate", json=payload, timeout=timeout)
+                response.raise_for_status()
+                return response.json()
+            except requests.ConnectionError as e:
+                self.stats_counters["errors"] += 1
+                raise LLMUnavailable(f"Cannot reach {self.base_url}: {e}") from e
+            except Exception as e:
+                self.stats_counters["errors"] += 1
+                raise LLMUnavailable(f"generate endpoint failed for {model}: {e}") from e
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+    def stream(
+        self,
+        prompt: str,
+        model: str,
+        options: Optional[Dict] = None,
+        format: Optional[str] = None,
+        endpoints: Sequence[str] = (GENERATE,),
+        read_timeout: Optional[float] = None,
+    ) -> Iterator[str]:
+        """
+        Like generate(), but yields text chunks as the model produces them.
+        The concurrency slot is held until the iterator is exhausted or closed.
+        Endpoint fallback only happens before the first chunk.
+        """
+        remembered = self._endpoints.get(model)
+        order = [remembered] + [e for e in endpoints if e != remembered] if remembered in endpoints else list(endpoints)
+        timeout = (self.timeout[0], read_timeout or self.timeout[1])
+
+        with self._slots:
+            with self._lock:
+                self._in_flight += 1
+            try:
+                last_error: Optional[Exception] = None
+                for endpoint in order:
+                    try:
+                        response = self._open_stream(endpoint, prompt, model, options or {}, format, timeout)
+                    except requests.ConnectionError as e:
+                        self.stats_counters["errors"] += 1
+                        raise LLMUnavailable(f"Cannot reach {self.base_url}: {e}") from e
+                    except Exception as e:
+                        self.stats_counters["errors"] += 1
+                        self.stats_counters["endpoint_fallbacks"] += 1
+                        logger.warning(f"{endpoint} endpoint failed for {model}: {e}")
+                        last_error = e
+                        continue
+                    self._endpoints[model] = endpoint
+                    with response:
+                        yield from _iter_chunks(endpoint, response)
+                    return
+                raise LLMUnavailable(f"No endpoint answered for {model}: {last_error}")
+            finally:
+                with self._lock:
+                    self._in_flight -= 1
+
+    def _open_stream(self, endpoint: str, prompt: str, model: str, options: Dict, format: Optional[str], timeout) -> requests.Response:
+        self.stats_counters["requests"] += 1
+        if endpoint == CHAT:
+            url = f"{self.base_url}/v1/chat/completions"
+            payload = {"model": model, "messages": [{"role": "user", "content": prompt}], "stream": True, **options}
+        else:
+            url = f"{self.base_url}/api/generate"
+            payload = {"model": model, "prompt": prompt, "stream": True, "options": options}
+            if format:
+                payload["format"] = format
+        response = self.session.post(url, json=payload, timeout=timeout, stream=True)
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        return response
+
+    def _call(self, endpoint: str, prompt: str, model: str, options: Dict, format: Optional[str], timeout) -> str:
+        self.stats_counters["requests"] += 1
+        if endpoint == CHAT:
+            payload = {"model": model, "messages": [{"role": "user", "content": prompt}], **options}
+            response = self.session.post(f"{self.base_url}/v1/chat/completions", json=payload, timeout=timeout)
+            response.raise_for_status()
+            return response.json()["choices"][0]["message"]["content"]
+        payload = {"model": model, "prompt": prompt, "stream": False, "options": options}
+        if format:
+            payload["format"] = format
+        response = self.session.post(f"{self.base_url}/api/generate", json=payload, timeout=timeout)
+        response.raise_for_status()
+        return response.json().get("response", "")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                **self.stats_counters,
+                "in_flight": self._in_flight,
+                "queued": self._slots.waiting,
+                "max_concurrency": self.max_concurrency,
+                "endpoints": dict(self._endpoints),
+                "timeout": {"connect": self.timeout[0], "read": self.timeout[1]},
+            }
+
+
+def _iter_chunks(endpoint: str, response: requests.Response) -> Iterator[str]:
+    """Text chunks from a streaming response: SSE for chat, NDJSON for native generate."""
+    for line in response.iter_lines(decode_unicode=True):
+        if not line:
+            continue
+        if endpoint == CHAT:
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                return
+            text = (json.loads(data)["choices"][0].get("delta") or {}).get("content")
+        else:
+            message = json.loads(line)
+            if message.get("error"):
+                raise LLMUnavailable(message["error"])
+            text = message.get("response")
+            if message.get("done") and not text:
+                return
+        if text:
+            yield text
+
+
+llm_client = LLMClient(
+    max_concurrency=int(os.getenv("LLM_MAX_CONCURRENCY", "2")),
+    connect_timeout=float(os.getenv("LLM_CONNECT_TIMEOUT", "5")),
+    read_timeout=float(os.getenv("LLM_READ_TIMEOUT", "180")),
+)
@@ -0,0 +1,152 @@
+import json
+import logging
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from llm_cache import llm_cache
+
+logger = logging.getLogger(__name__)
+
+
+class PartialJSONObject:
+    """
+    Incremental scanner for a JSON object arriving in chunks.
+
+    feed() returns what became complete with that chunk:
+      {"event": "item", "field": k, "index": i, "value": v}  one element of a top-level array
+      {"event": "field", "field": k, "value": v}             one top-level field
+    Text before the first "{" (prose, ```json fences) is ignored.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._field_start: Optional[int] = None
+        self._field: Optional[str] = None
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self.buffer += chunk
+        events = []
+        buf = self.buffer
+        while self._pos < len(buf) and not self.done:
+            i, ch = self._pos, buf[self._pos]
+            self._pos += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if not self._stack:
+                if ch == "{":
+                    self._stack.append("{")
+                    self._field_start = i + 1
+                continue
+            depth = len(self._stack)
+            if ch == '"':
+                self._in_string = True
+            elif ch == ":" and depth == 1 and self._field is None:
+                self._field = _loads(buf[self._field_start:i])
+            elif ch in "{[":
+                self._stack.append(ch)
+                if ch == "[" and depth == 1:
+                    self._item_start, self._item_index = i + 1, 0
+            elif ch in "}]":
+                if ch == "]" and depth == 2 and self._stack[-1] == "[":
+                    self._emit_item(buf[self._item_start:i], events)
+                self._stack.pop()
+                if not self._stack:
+                    self._emit_field(buf[self._field_start:i], events)
+                    self.done = True
+            elif ch == ",":
+                if depth == 1:
+                    self._emit_field(buf[self._field_start:i], events)
+                    self._field_start, self._field = i + 1, None
+                elif depth == 2 and self._stack[-1] == "[":
+                    self._emit_item(buf[self._item_start:i], events)
+                    self._item_start = i + 1
+        return events
+
+    def _emit_item(self, text: str, events: List[Dict[str, Any]]):
+        if text.strip():
+            value = _loads(text)
+            if value is not _INVALID:
+                events.append({"event": "item", "field": self._field, "index": self._item_index, "value": value})
+            self._item_index += 1
+
+    def _emit_field(self, text: str, events: List[Dict[str, Any]]):
+        if text.strip():
+            value = _loads("{" + text + "}")
+            if isinstance(value, dict):
+                events.extend({"event": "field", "field": k, "value": v} for k, v in value.items())
+
+
+_INVALID = object()
+
+
+def _loads(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return _INVALID
+
+
+def stream_generation(
+    key: str,
+    chunks: Callable[[], Iterator[str]],
+    to_value: Callable[[str], Any] = lambda text: text,
+    to_text: Callable[[Any], str] = lambda value: value,
+    to_result: Callable[[Any], Any] = lambda value: value,
+    json_output: bool = False,
+    regenerate: bool = False,
+    **meta,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Event stream for one generation, backed by the same llm_cache entry as the
+    blocking call:
+      {"event": "token", "text": ...}            as the model produces text
+      {"event": "item" | "field", ...}           with json_output, see PartialJSONObject
+      {"event": "done", "result": ..., "cache": "hit"|"miss"|"regenerated", "ttft": s, "elapsed": s}
+      {"event": "error", "detail": ...}
+    `to_value` turns the full text into the cached value (raising if it is not
+    usable, so nothing is cached), `to_text` replays a cached value as text and
+    `to_result` builds the final result from the cached value.
+    """
+    started = time.monotonic()
+    parser = PartialJSONObject() if json_output else None
+    cached = llm_cache.lookup(key, regenerate)
+
+    def emit(text: str) -> Iterator[Dict[str, Any]]:
+        yield {"event": "token", "text": text}
+        if parser is not None:
+            yield from parser.feed(text)
+
+    if cached is not None:
+        yield from emit(to_text(cached))
+        elapsed = round(time.monotonic() - started, 3)
+        yield {"event": "done", "result": to_result(cached), "cache": "hit", "ttft": elapsed, "elapsed": elapsed}
+        return
+
+    ttft = None
+    parts = []
+    try:
+        for text in chunks():
+            if ttft is None:
+                ttft = round(time.monotonic() - started, 3)
+            parts.append(text)
+            yield from emit(text)
+        value = to_value("".join(parts))
+    except Exception as e:
+        logger.error(f"Streaming generation failed: {e}")
+        yield {"event": "error", "detail": str(e)}
+        return
+    llm_cache.set(key, value, **meta)
+    yield {"event": "done", "result": to_result(value), "cache": "regenerated" if regenerate else "miss",
+           "ttft": ttft, "elapsed": round(time.monotonic() - started, 3)}
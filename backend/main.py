@@ -1,23 +1,54 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
-from fastapi.responses import StreamingResponse
-import csv
-import io
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Request, Response
+from fastapi.responses import StreamingResponse, JSONResponse
+import hashlib
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from typing import List, Optional
-import shutil
+from typing import List, Optional, Tuple
 import os
+import time
 import logging
-from resume_parser import parse_resume
-from job_search import search_jobs_in_germany
-from tailor import tailor_resume
+from contextlib import asynccontextmanager
+from resume_parser import resume_parser, parse_resume_bytes, ResumeParseError, ResumeTooLarge
+from job_search import search_jobs_in_germany, search_jobs_with_status, iter_search_events
+from search_cache import search_cache
+from search_batch import run_search_batch, SEARCH_BATCH_CONCURRENCY
+from search_scheduler import SearchScheduler
+from tailor import tailor_resume, stream_tailor_resume
+from tailor_batch import tailor_batches
+from task_queue import task_queue, wait_for_notify, INTERACTIVE, BATCH
+from resume_match import rank_jobs
 from apply_bot import apply_to_linkedin
+from scrapers.browser_pool import browser_pool
+from storage import storage, TRACKED_JOB_FIELDS
+from llm_cache import llm_cache
+from llm_client import llm_client
+from prompt_budget import budget_stats
+from job_index import job_index
+from job_export import EXPORT_FORMATS, ExportUnavailable, export_stream
+from resume_profile import resume_profiles
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Job Tailor API")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if job_index.count() == 0:
+        # First run with the local index: seed it with the board
+        job_index.add_jobs(storage.list_tracked_jobs(), tracked=True)
+    task_queue.start()
+    if os.getenv("SEARCH_SCHEDULER_ENABLED", "1") == "1":
+        search_scheduler.start()
+    yield
+    search_scheduler.stop()
+    task_queue.stop()
+    resume_parser.close()
+    search_cache.close()
+    # The shared scraper browser is launched lazily on first use; close it on exit
+    browser_pool.close()
+
+app = FastAPI(title="Job Tailor API", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -26,6 +57,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Source-Status", "X-Cache", "ETag"],
 )
 
 class Job(BaseModel):
@@ -35,30 +67,43 @@ class Job(BaseModel):
     description: str
     url: Optional[str] = None
     date_posted: Optional[str] = None
+    posted_at: Optional[str] = None # canonical UTC timestamp parsed from date_posted
+    date_confidence: Optional[str] = None # exact, relative, approximate or unknown
+    job_id: Optional[str] = None # stable across boards, see dedupe.job_key
+    urls: Optional[List[str]] = None # every board's URL for this posting
+    sources: Optional[List[str]] = None
+    duplicates: Optional[int] = 0
+    prescore: Optional[int] = None # 0-100 TF-IDF similarity to the master resume, see resume_match.py
+    matched_skills: Optional[List[str]] = None
 
 class TailorRequest(BaseModel):
-    resume_text: str
+    resume_text: Optional[str] = None
+    resume_ref: Optional[str] = None # profile hash or "master", instead of resending resume_text
     job_description: str
+    regenerate: bool = False # skip the LLM cache and ask the model again
 
 @app.get("/")
 def read_root():
     return {"message": "Job Tailor API is running"}
 
+async def extract_upload_text(file: UploadFile) -> str:
+    """Parses an uploaded PDF from memory, off the event loop, within the size/page limits."""
+    # One byte over the limit is enough to know it is too large
+    data = await file.read(resume_parser.max_bytes + 1)
+    try:
+        return await run_in_threadpool(parse_resume_bytes, data)
+    except ResumeTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ResumeParseError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.post("/upload-resume/")
 async def upload_resume(file: UploadFile = File(...)):
     try:
-        # Save temp file
-        file_location = f"temp_{file.filename}"
-        with open(file_location, "wb+") as file_object:
-            shutil.copyfileobj(file.file, file_object)
-        
-        # Parse text
-        text = parse_resume(file_location)
-        
-        # Cleanup
-        os.remove(file_location)
-        
+        text = await extract_upload_text(file)
         return {"filename": file.filename, "extracted_text": text}
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error uploading resume: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -72,45 +117,83 @@ import json
 async def save_master_resume(file: UploadFile = File(...)):
     """Uploads, extracts, and SAVES the resume text permanently."""
     try:
-        # 1. Save temp file
-        file_location = f"temp_{file.filename}"
-        with open(file_location, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-            
-        # 2. Extract Text
-        extracted_text = parse_resume(file_location)
-        
-        # 3. Cleanup temp file
-        os.remove(file_location)
-        
-        # 4. Save to persistent storage
+        # 1. Extract text from the upload in memory
+        extracted_text = await extract_upload_text(file)
+
+        # 2. Build the profile once, then save to persistent storage
+        profile = await run_in_threadpool(resume_profiles.get_or_build, extracted_text, file.filename)
         resume_data = {
             "filename": file.filename,
-            "text": extracted_text
+            "text": extracted_text,
+            "profile_hash": profile["hash"],
         }
-        with open(MASTER_RESUME_PATH, "w") as f:
+        # Write-then-rename, so a concurrent reader never sees a half-written file
+        tmp_path = MASTER_RESUME_PATH + ".tmp"
+        with open(tmp_path, "w") as f:
             json.dump(resume_data, f)
-            
-        return {"filename": file.filename, "extracted_text": extracted_text, "message": "Master Resume Saved!"}
+        os.replace(tmp_path, MASTER_RESUME_PATH)
+
+        return {"filename": file.filename, "extracted_text": extracted_text, "message": "Master Resume Saved!",
+                "resume_ref": profile["hash"], "skills": profile["skills"], "summary": profile["summary"]}
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error saving master resume: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def resolve_resume(resume_text: Optional[str], resume_ref: Optional[str], default_master: bool = False) -> Tuple[str, Optional[dict]]:
+    """
+    (resume text, profile) from a profile reference, the request body or
+    (optionally) the master resume. Pasted text has no profile: profiles are
+    only built for uploaded resumes, so arbitrary text never fills the disk.
+    """
+    if resume_ref:
+        profile = resume_profiles.resolve(resume_ref)
+        if profile is None:
+            raise HTTPException(status_code=404, detail=f"Unknown resume_ref '{resume_ref}'")
+        return profile["text"], profile
+    if resume_text:
+        return resume_text, None
+    if default_master:
+        profile = resume_profiles.master()
+        if profile:
+            return profile["text"], profile
+        raise HTTPException(status_code=400, detail="No resume text given and no master resume saved")
+    raise HTTPException(status_code=400, detail="Either resume_text or resume_ref is required")
+
+def resolve_resume_text(resume_text: Optional[str], resume_ref: Optional[str], default_master: bool = False) -> str:
+    return resolve_resume(resume_text, resume_ref, default_master)[0]
+
+def rank_against_profile(resume_text: str, profile: Optional[dict], jobs: List[dict]) -> List[dict]:
+    """rank_jobs using the profile's cached keyword vector when there is one."""
+    return rank_jobs(resume_text, jobs, profile["keywords"] if profile else None)
+
 @app.get("/get-master-resume/")
 async def get_master_resume():
     """Retrieves the saved master resume if it exists."""
     if os.path.exists(MASTER_RESUME_PATH):
         try:
             with open(MASTER_RESUME_PATH, "r") as f:
-                return json.load(f)
+                data = json.load(f)
+            if not data.get("profile_hash") and data.get("text"):
+                profile = resume_profiles.master()
+                data["profile_hash"] = profile["hash"] if profile else None
+            return data
         except Exception as e:
             logger.error(f"Error reading master resume: {e}")
-    return {"filename": None, "text": None}
+    return {"filename": None, "text": None, "profile_hash": None}
+
+@app.get("/resume-profile/{resume_ref}")
+def get_resume_profile(resume_ref: str, include_text: bool = False):
+    """The parsed profile (sections, skills, summary, keywords) of a resume hash or "master"."""
+    profile = resume_profiles.resolve(resume_ref)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Resume profile not found")
+    return profile if include_text else {k: v for k, v in profile.items() if k != "text"}
 
 
-# Tracking Persistence
-TRACKED_JOBS_PATH = os.path.join(DATA_DIR, "tracked_jobs.json")
+# Tracking Persistence (SQLite, see storage.py; the old JSON files are imported once)
 
 class TrackedJob(BaseModel):
     id: str # unique id (e.g. title+company)
@@ -126,128 +209,368 @@ class TrackedJob(BaseModel):
     match_score: Optional[int] = 0
 
 def load_tracked_jobs():
-    if os.path.exists(TRACKED_JOBS_PATH):
-        try:
-            with open(TRACKED_JOBS_PATH, "r") as f:
-                return json.load(f)
-        except:
-            return []
-    return []
+    return storage.list_tracked_jobs()
 
 def save_tracked_jobs(jobs):
-    with open(TRACKED_JOBS_PATH, "w") as f:
-        json.dump(jobs, f, indent=2)
+    storage.replace_tracked_jobs(jobs)
 
 @app.get("/tracked-jobs/")
-def get_tracked_jobs():
-    return load_tracked_jobs()
+def get_tracked_jobs(
+    request: Request,
+    fields: Optional[str] = None,
+    status: Optional[str] = None,
+    cursor: Optional[int] = None,
+    limit: Optional[int] = None,
+    group_by: Optional[str] = None,
+):
+    """
+    Without parameters returns every tracked job, as before. Optional:
+      fields=id,title,status   only these columns (id is always included)
+      status=Saved,Applied     only these statuses
+      limit=50&cursor=N        keyset pagination -> {"jobs", "next_cursor"}
+      group_by=status          -> {"groups": {status: [...]}, "counts": {...}, "total"}
+                                  (counts and total cover all pages)
+    Responses carry an ETag; a matching If-None-Match gets a 304.
+    """
+    columns = None
+    if fields:
+        columns = ["id"] + [f.strip() for f in fields.split(",") if f.strip() and f.strip() != "id"]
+        unknown = [f for f in columns if f not in TRACKED_JOB_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+        if group_by == "status" and "status" not in columns:
+            columns.append("status")
+    if group_by not in (None, "status"):
+        raise HTTPException(status_code=400, detail="group_by only supports 'status'")
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    statuses = [s.strip() for s in status.split(",") if s.strip()] if status else None
+
+    # The ETag covers both the board revision and the shape of this request
+    variant = hashlib.sha1(str(sorted(request.query_params.items())).encode()).hexdigest()[:12]
+    etag = f'W/"{storage.tracked_jobs_revision()}-{variant}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag in [tag.strip() for tag in request.headers.get("if-none-match", "").split(",")]:
+        return Response(status_code=304, headers=headers)
+
+    jobs, next_cursor = storage.query_tracked_jobs(columns, statuses, cursor, limit)
+    if group_by == "status":
+        groups = {}
+        for job in jobs:
+            groups.setdefault(job["status"], []).append(job)
+        # Counts cover the whole board (not just this page) so column headers stay right
+        counts = {k: v for k, v in storage.count_tracked_jobs_by_status().items() if not statuses or k in statuses}
+        body = {"groups": groups, "counts": counts, "total": sum(counts.values())}
+        if limit is not None:
+            body["next_cursor"] = next_cursor
+    elif limit is not None:
+        body = {"jobs": jobs, "next_cursor": next_cursor}
+    else:
+        body = jobs
+    return JSONResponse(body, headers=headers)
 
 @app.post("/track-job/")
 def track_job(job: TrackedJob):
-    jobs = load_tracked_jobs()
     # Check if exists
-    for j in jobs:
-        if j['id'] == job.id:
-            return {"message": "Job already tracked", "job": j}
-    
-    jobs.append(job.dict())
-    save_tracked_jobs(jobs)
+    if not storage.add_tracked_job(job.dict()):
+        return {"message": "Job already tracked", "job": storage.get_tracked_job(job.id)}
+    job_index.add_jobs([job.dict()], tracked=True)
     return {"message": "Job tracked successfully", "job": job}
 
 @app.patch("/update-job-status/{job_id}")
 def update_job_status(job_id: str, status: str):
-    jobs = load_tracked_jobs()
-    for job in jobs:
-        if job['id'] == job_id:
-            job['status'] = status
-            save_tracked_jobs(jobs)
-            return {"message": f"Status updated to {status}", "job": job}
-    raise HTTPException(status_code=404, detail="Job not found")
+    job = storage.update_tracked_job(job_id, {"status": status})
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"message": f"Status updated to {status}", "job": job}
 
 @app.delete("/tracked-jobs/{job_id}")
 def delete_tracked_job(job_id: str):
-    jobs = load_tracked_jobs()
-    new_jobs = [j for j in jobs if j['id'] != job_id]
-    save_tracked_jobs(new_jobs)
+    job = storage.get_tracked_job(job_id)
+    if job and storage.delete_tracked_job(job_id):
+        job_index.untrack(job)
     return {"message": "Job removed"}
 
+def event_stream_response(events, format: str = "ndjson") -> StreamingResponse:
+    """Streams event dicts as NDJSON lines or, with format=sse, as Server-Sent Events."""
+    def encode_ndjson(event):
+        return json.dumps(event, default=str) + "\n"
+
+    def encode_sse(event):
+        return f"event: {event['event']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    encode = encode_sse if format == "sse" else encode_ndjson
+    if hasattr(events, "__aiter__"):
+        # Async sources wait on the event loop instead of a threadpool thread
+        async def body():
+            async for event in events:
+                yield encode(event)
+    else:
+        def body():
+            for event in events:
+                yield encode(event)
+
+    if format == "sse":
+        return StreamingResponse(body(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+def submit_task(kind: str, fn, *args, priority: str = INTERACTIVE) -> JSONResponse:
+    """Queues slow work and answers 202 with the task id to poll at /tasks/{task_id}."""
+    task = task_queue.submit(kind, fn, *args, priority=priority)
+    return JSONResponse({"task_id": task.id, "status": task.status, "status_url": f"/tasks/{task.id}"}, status_code=202)
+
+def search_task(query: str, location: str, hours_old: int, timeout: Optional[float], refresh: bool, rank: bool) -> dict:
+    jobs, source_status, cache_state = search_jobs_with_status(query, location, hours_old, timeout, refresh=refresh)
+    if rank:
+        profile = resume_profiles.master()
+        if profile:
+            jobs = rank_against_profile(profile["text"], profile, jobs)
+    return {"jobs": jobs, "source_status": source_status, "cache": cache_state}
+
 @app.get("/search-jobs/", response_model=List[Job])
-def search_jobs(query: str, location: str = "Germany", hours_old: int = 72):
+def search_jobs(response: Response, query: str, location: str = "Germany", hours_old: int = 72, timeout: Optional[float] = None, refresh: bool = False, rank: bool = False, background: bool = False):
+    if background:
+        return submit_task("search", search_task, query, location, hours_old, timeout, refresh, rank)
     try:
-        jobs = search_jobs_in_germany(query, location, hours_old)
+        jobs, source_status, cache_state = search_jobs_with_status(query, location, hours_old, timeout, refresh=refresh)
+        if rank:
+            profile = resume_profiles.master()
+            if profile:
+                jobs = rank_against_profile(profile["text"], profile, jobs)
+        # e.g. "jobspy=ok,visasponsor=timeout,europeanjobdays=ok"
+        response.headers["X-Source-Status"] = ",".join(f"{name}={status}" for name, status in source_status.items())
+        response.headers["X-Cache"] = cache_state
         return jobs
     except Exception as e:
         logger.error(f"Error searching jobs: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/search-jobs/stream")
+def search_jobs_stream(query: str, location: str = "Germany", hours_old: int = 72, timeout: Optional[float] = None, format: str = "ndjson"):
+    """
+    Same search as /search-jobs/, but each board's jobs are sent as soon as that
+    board finishes. format=ndjson (one JSON object per line) or format=sse.
+    """
+    return event_stream_response(iter_search_events(query, location, hours_old, timeout), format)
+
+@app.get("/search-index/")
+def search_local_index(q: str, location: Optional[str] = None, source: Optional[str] = None,
+                       hours_old: Optional[int] = None, tracked_only: bool = False, limit: int = 50):
+    """BM25-ranked search over every posting seen so far and every tracked job. No scraping."""
+    started = time.perf_counter()
+    jobs = job_index.search(q, location, source, hours_old, tracked_only, min(limit, 500))
+    return {"jobs": jobs, "total": len(jobs), "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)}
+
+@app.get("/search-cache/stats")
+def get_search_cache_stats():
+    return search_cache.stats()
+
+@app.delete("/search-cache/")
+def clear_search_cache():
+    search_cache.clear()
+    return {"message": "Search cache cleared"}
+
+class RankRequest(BaseModel):
+    jobs: List[Job]
+    resume_text: Optional[str] = None # defaults to the saved master resume
+    resume_ref: Optional[str] = None
+    top: Optional[int] = None
+
+@app.post("/rank-jobs/", response_model=List[Job])
+def rank_jobs_endpoint(request: RankRequest):
+    """Ranks jobs against the resume without any LLM call; send only the top few to /tailor-resume/."""
+    resume_text, profile = resolve_resume(request.resume_text, request.resume_ref, default_master=True)
+    ranked = rank_against_profile(resume_text, profile, [job.dict() for job in request.jobs])
+    return ranked[:request.top] if request.top else ranked
+
 @app.post("/tailor-resume/")
-def tailor_resume_endpoint(request: TailorRequest):
+def tailor_resume_endpoint(request: TailorRequest, background: bool = False):
+    resume_text = resolve_resume_text(request.resume_text, request.resume_ref)
+    if background:
+        return submit_task("tailor", lambda: {"tailored_resume": tailor_resume(resume_text, request.job_description, request.regenerate)})
     try:
-        tailored_content = tailor_resume(request.resume_text, request.job_description)
+        tailored_content = tailor_resume(resume_text, request.job_description, request.regenerate)
         return {"tailored_resume": tailored_content}
     except Exception as e:
         logger.error(f"Error tailoring resume: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/llm-cache/stats")
+def get_llm_cache_stats():
+    return llm_cache.stats()
+
+@app.get("/llm-client/stats")
+def get_llm_client_stats():
+    return llm_client.stats()
+
+@app.get("/prompt-budget/stats")
+def get_prompt_budget_stats():
+    """Prompt tokens kept vs. saved by relevance-based compression since startup."""
+    return dict(budget_stats)
+
+@app.delete("/llm-cache/")
+def clear_llm_cache():
+    llm_cache.clear()
+    return {"message": "LLM cache cleared"}
+
+@app.post("/tailor-resume/stream")
+def tailor_resume_stream(request: TailorRequest, format: str = "sse"):
+    """Streaming /tailor-resume/: token, field (per finished JSON key) and done events."""
+    resume_text = resolve_resume_text(request.resume_text, request.resume_ref)
+    return event_stream_response(stream_tailor_resume(resume_text, request.job_description, request.regenerate), format)
+
+class TailorBatchRequest(BaseModel):
+    job_ids: List[str] # tracked job ids
+    resume_text: Optional[str] = None # defaults to the saved master resume
+    resume_ref: Optional[str] = None
+    regenerate: bool = False
+
+@app.post("/tailor-batch/")
+def start_tailor_batch(request: TailorBatchRequest):
+    """
+    Tailors the resume to every given tracked job in the background and writes
+    each Match_Score back to the job. Poll GET /tailor-batch/{batch_id} or
+    follow GET /tailor-batch/{batch_id}/stream for progress.
+    """
+    if not request.job_ids:
+        raise HTTPException(status_code=400, detail="No job ids given")
+    resume_text = resolve_resume_text(request.resume_text, request.resume_ref, default_master=True)
+    batch = tailor_batches.start(request.job_ids, resume_text, request.regenerate)
+    return JSONResponse(batch.snapshot(), status_code=202)
+
+def get_tailor_batch_or_404(batch_id: str):
+    batch = tailor_batches.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return batch
+
+@app.get("/tailor-batch/{batch_id}")
+def get_tailor_batch(batch_id: str, include_results: bool = False):
+    return get_tailor_batch_or_404(batch_id).snapshot(include_results)
+
+@app.get("/tailor-batch/{batch_id}/stream")
+async def stream_tailor_batch(batch_id: str, format: str = "sse"):
+    get_tailor_batch_or_404(batch_id)
+    return event_stream_response(tailor_batches.iter_events(batch_id), format)
+
+@app.post("/tailor-batch/{batch_id}/retry")
+def retry_tailor_batch(batch_id: str):
+    """Re-runs only the failed or cancelled items of a batch."""
+    get_tailor_batch_or_404(batch_id)
+    return tailor_batches.retry_failed(batch_id).snapshot()
+
+@app.delete("/tailor-batch/{batch_id}")
+def cancel_tailor_batch(batch_id: str):
+    """Cancels the items that have not started yet."""
+    get_tailor_batch_or_404(batch_id)
+    return tailor_batches.cancel(batch_id).snapshot()
+
 # Cold Email Generator
-from email_generator import generate_cold_email
+from email_generator import generate_cold_email, stream_cold_email
 
 class ColdEmailRequest(BaseModel):
-    resume_text: str
+    resume_text: Optional[str] = None
+    resume_ref: Optional[str] = None
     job_description: str
     hiring_manager_name: Optional[str] = None
     platform: str = "Email" # Email or LinkedIn
+    regenerate: bool = False
 
 @app.post("/generate-cold-email/")
-def generate_cold_email_endpoint(request: ColdEmailRequest):
+def generate_cold_email_endpoint(request: ColdEmailRequest, background: bool = False):
+    resume_text = resolve_resume_text(request.resume_text, request.resume_ref)
+    if background:
+        return submit_task("cold_email", lambda: {"email_content": generate_cold_email(
+            resume_text, request.job_description, request.hiring_manager_name, request.platform, request.regenerate)})
     try:
         email_content = generate_cold_email(
-            request.resume_text, 
+            resume_text, 
             request.job_description, 
             request.hiring_manager_name, 
-            request.platform
+            request.platform,
+            request.regenerate,
         )
         return {"email_content": email_content}
     except Exception as e:
         logger.error(f"Error generating cold email: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/generate-cold-email/stream")
+def generate_cold_email_stream(request: ColdEmailRequest, format: str = "sse"):
+    resume_text = resolve_resume_text(request.resume_text, request.resume_ref)
+    events = stream_cold_email(resume_text, request.job_description, request.hiring_manager_name,
+                               request.platform, request.regenerate)
+    return event_stream_response(events, format)
+
 # Interview Prep
-from interview_prep import generate_interview_prep
+from interview_prep import generate_interview_prep, stream_interview_prep
 
 class InterviewPrepRequest(BaseModel):
-    resume_text: str
+    resume_text: Optional[str] = None
+    resume_ref: Optional[str] = None
     job_description: str
+    regenerate: bool = False
 
 @app.post("/generate-interview-prep/")
-def generate_interview_prep_endpoint(request: InterviewPrepRequest):
+def generate_interview_prep_endpoint(request: InterviewPrepRequest, background: bool = False):
+    resume_text = resolve_resume_text(request.resume_text, request.resume_ref)
+    if background:
+        return submit_task("interview_prep", generate_interview_prep, resume_text, request.job_description, request.regenerate)
     try:
-        prep_content = generate_interview_prep(request.resume_text, request.job_description)
+        prep_content = generate_interview_prep(resume_text, request.job_description, request.regenerate)
         return prep_content
     except Exception as e:
         logger.error(f"Error generating interview prep: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/generate-interview-prep/stream")
+def generate_interview_prep_stream(request: InterviewPrepRequest, format: str = "sse"):
+    """Streaming /generate-interview-prep/: token, item (per finished question), field and done events."""
+    resume_text = resolve_resume_text(request.resume_text, request.resume_ref)
+    return event_stream_response(stream_interview_prep(resume_text, request.job_description, request.regenerate), format)
+
+# Application Pack
+from application_pack import generate_application_pack
+
+class ApplicationPackRequest(BaseModel):
+    resume_text: Optional[str] = None
+    resume_ref: Optional[str] = None
+    job_description: str
+    hiring_manager_name: Optional[str] = None
+    platform: str = "Email" # Email, LinkedIn or Cover Letter
+    regenerate: bool = False
+
+@app.post("/application-pack/")
+def application_pack_endpoint(request: ApplicationPackRequest, baseline: bool = False, background: bool = False):
+    """
+    Tailored resume, message and interview prep for one job in one go, paying
+    for the shared resume + JD prompt prefix once. `timing` reports the wall
+    time; baseline=true also runs the three separate calls to compare.
+    """
+    resume_text = resolve_resume_text(request.resume_text, request.resume_ref)
+    args = (resume_text, request.job_description, request.hiring_manager_name, request.platform, request.regenerate, baseline)
+    if background:
+        return submit_task("application_pack", generate_application_pack, *args)
+    try:
+        return generate_application_pack(*args)
+    except Exception as e:
+        logger.error(f"Error generating application pack: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 # Saved Searches & Automated Scraping
-TRACKED_SEARCHES_PATH = os.path.join(DATA_DIR, "tracked_searches.json")
 
 class TrackedSearch(BaseModel):
     id: str # unique id
     query: str
     location: str
+    interval_minutes: Optional[int] = None # background re-run interval, defaults to SAVED_SEARCH_INTERVAL_MINUTES
+    hours_old: Optional[int] = None # posting age window for background re-runs, defaults to SAVED_SEARCH_HOURS_OLD
 
 def load_tracked_searches():
-    if os.path.exists(TRACKED_SEARCHES_PATH):
-        try:
-            with open(TRACKED_SEARCHES_PATH, "r") as f:
-                return json.load(f)
-        except:
-            return []
-    return []
+    return storage.list_saved_searches()
 
 def save_tracked_searches(searches):
-    with open(TRACKED_SEARCHES_PATH, "w") as f:
-        json.dump(searches, f, indent=2)
+    storage.replace_saved_searches(searches)
 
 @app.get("/saved-searches/")
 def get_saved_searches():
@@ -255,91 +578,133 @@ def get_saved_searches():
 
 @app.post("/saved-searches/")
 def save_search(search: TrackedSearch):
-    searches = load_tracked_searches()
     # Avoid duplicates
-    for s in searches:
-        if s['query'].lower() == search.query.lower() and s['location'].lower() == search.location.lower():
-             return {"message": "Search already saved", "search": s}
-    
-    searches.append(search.dict())
-    save_tracked_searches(searches)
+    existing = storage.find_saved_search(search.query, search.location)
+    if existing:
+        return {"message": "Search already saved", "search": existing}
+
+    storage.add_saved_search(search.dict())
     return {"message": "Search saved", "search": search}
 
 @app.delete("/saved-searches/{search_id}")
 def delete_saved_search(search_id: str):
-    searches = load_tracked_searches()
-    new_searches = [s for s in searches if s['id'] != search_id]
-    save_tracked_searches(new_searches)
+    storage.delete_saved_search(search_id)
     return {"message": "Search removed"}
 
+# Background re-runs of saved searches; only postings not seen before are kept
+search_scheduler = SearchScheduler(load_tracked_searches, max_concurrency=SEARCH_BATCH_CONCURRENCY)
+
+@app.get("/saved-searches/new-jobs")
+def get_new_saved_search_jobs(cursor: int = 0, search_id: Optional[str] = None, limit: int = 500):
+    """Postings found by the background scheduler after `cursor`. Send back the returned cursor next time."""
+    return search_scheduler.new_since(cursor, search_id, limit)
+
+@app.get("/saved-searches/scheduler")
+def get_search_scheduler_status():
+    return search_scheduler.status()
+
 @app.post("/run-automated-search/")
-def run_automated_search():
+def run_automated_search(hours_old: int = 72, background: bool = False):
+    """Runs every saved search concurrently; returns merged jobs plus a per-search report."""
     searches = load_tracked_searches()
-    all_results = []
-    
-    logger.info(f"Running automated search for {len(searches)} queries...")
-    
-    for search in searches:
-        try:
-            logger.info(f"Automated scraping: {search['query']} in {search['location']}")
-            jobs = search_jobs_in_germany(search['query'], search['location'])
-            # Tag them so UI knows source
-            for job in jobs:
-                job['source_query'] = search['query']
-            all_results.extend(jobs)
-        except Exception as e:
-            logger.error(f"Failed to scrape for {search['query']}: {e}")
-            
-    # Deduplicate by URL or Title+Company
-    for job in all_results:
-        key = job['title'] + job['company']
-        if key not in seen:
-            seen.add(key)
-            unique_results.append(job)
-            
-    return unique_results
+    if background:
+        return submit_task("automated_search", run_search_batch, searches, hours_old, priority=BATCH)
+    return run_search_batch(searches, hours_old)
+
+# Background tasks (see task_queue.py); slow endpoints queue here with ?background=true
+
+@app.get("/tasks/")
+def list_tasks(status: Optional[str] = None, kind: Optional[str] = None):
+    return {"tasks": [task.to_dict(include_result=False) for task in task_queue.list(status, kind)],
+            "stats": task_queue.stats()}
+
+@app.get("/tasks/{task_id}")
+async def get_task(task_id: str, wait: float = 0):
+    """
+    Task status and, once done, its result. wait=N long-polls up to N seconds
+    (max 30) for it to finish, on the event loop rather than a worker thread.
+    """
+    task = task_queue.get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    if wait > 0 and not task.finished.is_set():
+        await wait_for_notify(task.add_listener, task.remove_listener, min(wait, 30))
+    return task.to_dict()
+
+@app.delete("/tasks/{task_id}")
+def cancel_task(task_id: str):
+    """Cancels a queued task; a running one finishes but its result is discarded."""
+    task = task_queue.cancel(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task.to_dict(include_result=False)
+
+# Columns of saved-search results (scraped postings, not tracked jobs)
+SEARCH_EXPORT_FIELDS = ["title", "company", "location", "description", "url", "date_posted", "posted_at",
+                        "source", "job_id", "source_query", "search_id", "found_at"]
+
+def export_response(rows, fields: List[str], format: str, gzip: bool, name: str) -> StreamingResponse:
+    media_type, extension = EXPORT_FORMATS[format]
+    try:
+        body = export_stream(rows, fields, format, gzip)
+    except ExportUnavailable as e:
+        raise HTTPException(status_code=501, detail=str(e))
+    filename = f"{name}.{extension}" + (".gz" if gzip else "")
+    response = StreamingResponse(body, media_type="application/gzip" if gzip else media_type)
+    response.headers["Content-Disposition"] = f"attachment; filename={filename}"
+    return response
+
+@app.get("/export-jobs/")
+def export_jobs(
+    format: str = "csv",
+    ids: Optional[str] = None,
+    status: Optional[str] = None,
+    search_id: Optional[str] = None,
+    fields: Optional[str] = None,
+    gzip: bool = False,
+):
+    """
+    Streams an export of jobs selected on the server, read and encoded in
+    batches so memory stays flat however many rows there are:
+      format=csv|ndjson|parquet  (parquet needs pyarrow)
+      ids=a,b,c                  these tracked jobs
+      status=Saved,Applied       tracked jobs with these statuses
+      search_id=...              postings found by that saved search instead
+      fields=title,company,...   columns, in this order
+      gzip=true                  gzip the file
+    Without a selection every tracked job is exported.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}")
+    available = SEARCH_EXPORT_FIELDS if search_id else TRACKED_JOB_FIELDS
+    columns = [f.strip() for f in fields.split(",") if f.strip()] if fields else available
+    unknown = [f for f in columns if f not in available]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+
+    if search_id:
+        if not any(search["id"] == search_id for search in load_tracked_searches()):
+            raise HTTPException(status_code=404, detail="Saved search not found")
+        return export_response(search_scheduler.iter_found(search_id), columns, format, gzip, f"search_{search_id}")
+    id_list = [i.strip() for i in ids.split(",") if i.strip()] if ids else None
+    statuses = [s.strip() for s in status.split(",") if s.strip()] if status else None
+    rows = storage.iter_tracked_jobs(columns, statuses, id_list)
+    return export_response(rows, columns, format, gzip, "tracked_jobs")
 
 @app.post("/export-jobs-csv/")
 def export_jobs_csv(jobs: List[Job]):
     """
     Generates a CSV file from the list of jobs and returns it as a download.
+    Prefer GET /export-jobs/, which selects the jobs on the server.
     """
-    try:
-        if not jobs:
-            raise HTTPException(status_code=400, detail="No jobs provided to export.")
-
-        # Create an in-memory string buffer
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Write Header
-        writer.writerow(["Title", "Company", "Location", "Description", "URL", "Date Posted"])
-
-        # Write Data
-        for job in jobs:
-            writer.writerow([
-                job.title,
-                job.company,
-                job.location,
-                job.description[:500], # Truncate description for CSV readability
-                job.url,
-                job.date_posted
-            ])
-
-        # Reset pointer to start
-        output.seek(0)
-        
-        # Return as a StreamingResponse
-        response = StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="text/csv"
-        )
-        response.headers["Content-Disposition"] = "attachment; filename=jobs_export.csv"
-        return response
-
-    except Exception as e:
-        logger.error(f"Error exporting CSV: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if not jobs:
+        raise HTTPException(status_code=400, detail="No jobs provided to export.")
+
+    # Truncate description for CSV readability
+    rows = ({"Title": job.title, "Company": job.company, "Location": job.location, "Description": job.description[:500],
+             "URL": job.url, "Date Posted": job.date_posted} for job in jobs)
+    return export_response(rows, ["Title", "Company", "Location", "Description", "URL", "Date Posted"],
+                           "csv", False, "jobs_export")
 
 class ApplyRequest(BaseModel):
     job_url: str
@@ -0,0 +1,162 @@
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from resume_match import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Per-document token budgets for the resume and the job description in a prompt
+RESUME_TOKEN_BUDGET = int(os.getenv("PROMPT_RESUME_TOKENS", "500"))
+JD_TOKEN_BUDGET = int(os.getenv("PROMPT_JD_TOKENS", "500"))
+
+# Sections longer than this are split further so one huge block cannot eat the budget
+MAX_SECTION_CHARS = 600
+CHARS_PER_TOKEN = 4
+
+# Headings on a line of their own: all caps ("EXPERIENCE", "TECH STACK:") ...
+_CAPS_HEADING_RE = re.compile(r"^[A-ZÄÖÜ][A-ZÄÖÜ &/\-]{2,40}:?$")
+# ... or a short line opening with a heading word ("Key Skills:", "Your profile", "Deine Aufgaben")
+_KEYWORD_HEADING_RE = re.compile(
+    r"^(?:about|your|our|what|who|deine|ihre|unser|das|wir|we|key|tech|requirements|responsibilities|benefits|profile?|aufgaben|qualifications)\b[^\n.]{0,40}:?$",
+    re.IGNORECASE,
+)
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+
+_stats_lock = threading.Lock()
+budget_stats = {"prompts": 0, "original_tokens": 0, "kept_tokens": 0, "saved_tokens": 0}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English/German prose)."""
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def is_heading(line: str) -> bool:
+    """True for a section heading line; markdown emphasis ("**TECH STACK**", "## Skills") is ignored."""
+    line = line.strip().strip("*#_ ")
+    return bool(_CAPS_HEADING_RE.match(line) or _KEYWORD_HEADING_RE.match(line))
+
+
+def split_sections(text: str) -> List[str]:
+    """Splits at blank lines and heading lines; long blocks are cut at sentence/line ends."""
+    blocks, current = [], []
+    for line in (text or "").splitlines():
+        stripped = line.strip().strip("\u200b")
+        if not stripped:
+            if current:
+                blocks.append(current)
+                current = []
+            continue
+        if current and is_heading(stripped):
+            blocks.append(current)
+            current = []
+        current.append(stripped)
+    if current:
+        blocks.append(current)
+    # A heading standing alone ("**TECH STACK**" and a blank line) belongs to the block below it
+    merged = []
+    for block in blocks:
+        if merged and len(merged[-1]) == 1 and is_heading(merged[-1][0]):
+            merged[-1] = merged[-1] + block
+        else:
+            merged.append(block)
+
+    sections = []
+    for block in merged:
+        section = ""
+        for piece in (p for line in block for p in _SENTENCE_END_RE.split(line)):
+            if section and len(section) + len(piece) + 1 > MAX_SECTION_CHARS:
+                sections.append(section)
+                section = ""
+            section = f"{section}\n{piece}" if section else piece
+        if section:
+            sections.append(section)
+    return sections
+
+
+def rank_sections(sections: List[str], reference: str) -> List[float]:
+    """Relevance of each section to `reference`: TF-IDF (over the sections) weighted term overlap."""
+    section_terms = [Counter(tokenize(section)) for section in sections]
+    reference_terms = set(tokenize(reference))
+    df = Counter(term for terms in section_terms for term in terms)
+    n = len(sections)
+    scores = []
+    for terms in section_terms:
+        total = sum(terms.values())
+        if not total:
+            scores.append(0.0)
+            continue
+        overlap = sum((1 + math.log(count)) * math.log((1 + n) / (1 + df[term]) + 1)
+                      for term, count in terms.items() if term in reference_terms)
+        # Normalized by length, so a long generic section does not win on size alone
+        scores.append(overlap / math.sqrt(total))
+    return scores
+
+
+def pack_sections(text: str, reference: str, budget_tokens: int, keep_first: bool = False,
+                  sections: Optional[List[str]] = None) -> Tuple[str, Dict[str, int]]:
+    """
+    Keeps the sections of `text` most relevant to `reference` that fit in
+    `budget_tokens`, in their original order. Returns (packed text, report).
+    `sections` may pass an already split `text` (see resume_profile.py).
+    """
+    original_tokens = estimate_tokens(text)
+    if original_tokens <= budget_tokens:
+        return text, {"original_tokens": original_tokens, "kept_tokens": original_tokens, "sections_total": 0, "sections_kept": 0}
+    sections = list(sections) if sections else split_sections(text)
+    scores = rank_sections(sections, reference)
+    if keep_first and sections:
+        # e.g. the resume header: name, title and contact details
+        scores[0] = float("inf")
+
+    chosen, used = set(), 0
+    for index in sorted(range(len(sections)), key=lambda i: -scores[i]):
+        cost = estimate_tokens(sections[index]) + 1
+        if used + cost <= budget_tokens:
+            chosen.add(index)
+            used += cost
+    if not chosen and sections:
+        best = max(range(len(sections)), key=lambda i: scores[i])
+        sections[best] = sections[best][:budget_tokens * CHARS_PER_TOKEN]
+        chosen.add(best)
+
+    packed = "\n".join(sections[i] for i in sorted(chosen))
+    return packed, {
+        "original_tokens": original_tokens,
+        "kept_tokens": estimate_tokens(packed),
+        "sections_total": len(sections),
+        "sections_kept": len(chosen),
+    }
+
+
+def compress_pair(
+    resume_text: str,
+    job_description: str,
+    resume_budget: int = RESUME_TOKEN_BUDGET,
+    jd_budget: int = JD_TOKEN_BUDGET,
+    resume_sections: Optional[List[str]] = None,
+) -> Tuple[str, str, Dict[str, object]]:
+    """
+    Replaces fixed [:N] truncation in prompts: each side keeps the sections most
+    relevant to the other side (the JD keeps its requirements rather than the
+    company intro, the resume keeps the matching experience). Returns
+    (resume context, JD context, report with the token counts saved).
+    """
+    resume_context, resume_report = pack_sections(resume_text, job_description, resume_budget, keep_first=True,
+                                                  sections=resume_sections)
+    jd_context, jd_report = pack_sections(job_description, resume_text, jd_budget)
+    original = resume_report["original_tokens"] + jd_report["original_tokens"]
+    kept = resume_report["kept_tokens"] + jd_report["kept_tokens"]
+    report = {"resume": resume_report, "job_description": jd_report, "saved_tokens": original - kept}
+    with _stats_lock:
+        budget_stats["prompts"] += 1
+        budget_stats["original_tokens"] += original
+        budget_stats["kept_tokens"] += kept
+        budget_stats["saved_tokens"] += original - kept
+    if original > kept:
+        logger.info(f"Prompt budget: kept {kept} of {original} tokens ({original - kept} saved)")
+    return resume_context, jd_context, report
@@ -0,0 +1,117 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+# Keeps tech tokens such as "c++", "c#", "node.js", ".net" in one piece
+_TOKEN_RE = re.compile(r"\.?[a-zäöüß0-9][a-zäöüß0-9+#.]*")
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does doing
+during each etc for from further had has have having he her here hers him his how i if in into is it its
+just me more most my no nor not now of off on once only or other our ours out over own per same she should
+so some such than that the their theirs them then there these they this those through to too under until
+up very via was we were what when where which while who whom why will with within would you your yours
+ab aber als am an auch auf aus bei bin bis bist da damit dann das dass dein deine dem den der des dich die
+dir du durch ein eine einem einen einer eines er es euch euer für hat hatte ich ihr ihre im in ist ja
+jede jeder jedes kann kein keine mit muss nach nicht noch nur ob oder ohne sehr sich sie sind so über um
+und uns unser unter vom von vor war waren was weil wenn wer werden wie wir wird wo zu zum zur zwischen
+m w d f x gn job jobs role position team company work working experience years year new using used use
+""".split())
+
+# Up to this many shared terms, highest contribution first, are reported per job
+MAX_MATCHED_TERMS = 8
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        token = token.rstrip(".")
+        if len(token) > 1 and token not in STOPWORDS and not token.isdigit():
+            tokens.append(token)
+    return tokens
+
+
+@lru_cache(maxsize=8)
+def _resume_tokens(resume_text: str) -> Tuple[str, ...]:
+    # The same master resume is scored against every search; tokenize it once
+    return tuple(tokenize(resume_text))
+
+
+def score_jobs(resume_text: str, jobs: List[Dict], resume_weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """
+    Scores every job against the resume in one pass: TF-IDF (sublinear tf,
+    smoothed idf over the batch plus the resume) and cosine similarity.
+    `resume_weights` is a resume profile's precomputed term -> sublinear tf
+    vector; when given, the resume text is not tokenized again.
+
+    Returns one entry per job, in input order:
+      {"index": i, "prescore": 0-100, "matched_skills": [...]}
+    Deterministic and LLM-free, so it can rank a whole search response and the
+    LLM only needs to see the top few.
+    """
+    if not jobs:
+        return []
+    docs = [list(resume_weights) if resume_weights is not None else list(_resume_tokens(resume_text or ""))]
+    docs += [tokenize(f"{job.get('title') or ''} {job.get('description') or ''}") for job in jobs]
+
+    vocabulary: Dict[str, int] = {}
+    doc_ids, term_ids = [], []
+    for d, tokens in enumerate(docs):
+        for token in tokens:
+            doc_ids.append(d)
+            term_ids.append(vocabulary.setdefault(token, len(vocabulary)))
+    if not vocabulary:
+        return [{"index": i, "prescore": 0, "matched_skills": []} for i in range(len(jobs))]
+    terms = np.array(list(vocabulary), dtype=object)
+
+    # Sparse (doc, term) -> count as parallel arrays; no dense doc x vocab matrix
+    n_docs, n_terms = len(docs), len(vocabulary)
+    pairs, counts = np.unique(np.array(doc_ids, dtype=np.int64) * n_terms + np.array(term_ids, dtype=np.int64),
+                              return_counts=True)
+    pair_doc, pair_term = pairs // n_terms, pairs % n_terms
+
+    df = np.bincount(pair_term, minlength=n_terms)
+    idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+    tf = 1.0 + np.log(counts)
+    if resume_weights is not None:
+        is_resume_pair = pair_doc == 0
+        tf[is_resume_pair] = [resume_weights[term] for term in terms[pair_term[is_resume_pair]]]
+    weights = tf * idf[pair_term]
+    norms = np.sqrt(np.bincount(pair_doc, weights=weights ** 2, minlength=n_docs))
+
+    # Resume vector, dense over the vocabulary (the resume is doc 0)
+    resume_vector = np.zeros(n_terms)
+    is_resume = pair_doc == 0
+    resume_vector[pair_term[is_resume]] = weights[is_resume]
+
+    contribution = weights * resume_vector[pair_term]
+    dots = np.bincount(pair_doc, weights=contribution, minlength=n_docs)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cosine = np.where(norms > 0, dots / (norms * norms[0]), 0.0) if norms[0] > 0 else np.zeros(n_docs)
+    prescores = np.rint(np.clip(cosine[1:], 0.0, 1.0) * 100).astype(int)
+
+    # Shared terms per job, strongest first
+    shared = (contribution > 0) & ~is_resume
+    shared_doc, shared_term, shared_value = pair_doc[shared], pair_term[shared], contribution[shared]
+    order = np.lexsort((-shared_value, shared_doc))
+    shared_doc, shared_term = shared_doc[order], shared_term[order]
+    starts = np.searchsorted(shared_doc, np.arange(1, n_docs))
+    ends = np.searchsorted(shared_doc, np.arange(1, n_docs), side="right")
+
+    return [
+        {
+            "index": i,
+            "prescore": int(prescores[i]),
+            "matched_skills": terms[shared_term[starts[i]:min(ends[i], starts[i] + MAX_MATCHED_TERMS)]].tolist(),
+        }
+        for i in range(len(jobs))
+    ]
+
+
+def rank_jobs(resume_text: str, jobs: List[Dict], resume_weights: Optional[Dict[str, float]] = None) -> List[Dict]:
+    """Copies of the jobs with `prescore` and `matched_skills` set, best match first."""
+    scored = score_jobs(resume_text, jobs, resume_weights)
+    ranked = [{**jobs[s["index"]], "prescore": s["prescore"], "matched_skills": s["matched_skills"]} for s in scored]
+    # sorted() is stable, so ties keep the search order
+    return sorted(ranked, key=lambda job: -job["prescore"])
@@ -1,17 +1,145 @@
 from pdfminer.high_level import extract_text
+from pdfminer.pdfpage import PDFPage
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
+import hashlib
+import io
 import logging
+import multiprocessing
+import os
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Upload limits
+MAX_RESUME_BYTES = int(os.getenv("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+MAX_RESUME_PAGES = int(os.getenv("RESUME_MAX_PAGES", "30"))
+# PDFs with more pages than this are extracted page-parallel in the process pool
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("RESUME_PARALLEL_PAGES", "4"))
+PARSE_WORKERS = int(os.getenv("RESUME_PARSE_WORKERS", "2"))
+CACHE_ENTRIES = 32
+
+
+class ResumeParseError(ValueError):
+    """The upload is not a readable PDF."""
+
+
+class ResumeTooLarge(ResumeParseError):
+    """The upload exceeds MAX_RESUME_BYTES or MAX_RESUME_PAGES."""
+
+
+def _clean(text: str) -> str:
+    # Basic cleanup: remove excessive whitespace
+    return "\n".join([line.strip() for line in text.split("\n") if line.strip()])
+
+
+def _extract_pages(data: bytes, page_numbers: List[int]) -> str:
+    """Runs in a pool process: text of the given (0-based) pages."""
+    return extract_text(io.BytesIO(data), page_numbers=page_numbers)
+
+
+class ResumeParser:
+    """
+    Extracts resume text from PDF bytes, never touching the disk.
+
+    Results are cached by content hash, so re-uploading the same file is
+    instant. Small PDFs are parsed in the calling thread (call it off the
+    event loop); larger ones are split into page ranges and extracted in a
+    process pool, since pdfminer is pure Python and holds the GIL.
+    """
+
+    def __init__(self, max_bytes: int = MAX_RESUME_BYTES, max_pages: int = MAX_RESUME_PAGES,
+                 parallel_threshold: int = PARALLEL_PAGE_THRESHOLD, workers: int = PARSE_WORKERS):
+        self.max_bytes = max_bytes
+        self.max_pages = max_pages
+        self.parallel_threshold = parallel_threshold
+        self.workers = max(1, workers)
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats = {"parsed": 0, "cache_hits": 0, "parallel": 0}
+
+    def parse(self, data: bytes) -> str:
+        if len(data) > self.max_bytes:
+            raise ResumeTooLarge(f"Resume exceeds the {self.max_bytes // 1024} KB upload limit")
+        # Readers accept junk before the header as long as it is within the first 1 KB
+        if b"%PDF" not in data[:1024]:
+            raise ResumeParseError("Resume is not a PDF file")
+        key = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return self._cache[key]
+
+        try:
+            pages = sum(1 for _ in PDFPage.get_pages(io.BytesIO(data)))
+        except Exception as e:
+            raise ResumeParseError(f"Could not read PDF: {e}")
+        if pages > self.max_pages:
+            raise ResumeTooLarge(f"Resume has {pages} pages, at most {self.max_pages} are accepted")
+
+        try:
+            if pages > self.parallel_threshold and self.workers > 1:
+                try:
+                    text = self._parse_parallel(data, pages)
+                except BrokenProcessPool as e:
+                    logger.warning(f"Resume parse pool failed, parsing in-process: {e}")
+                    self.close()
+                    text = extract_text(io.BytesIO(data))
+            else:
+                text = extract_text(io.BytesIO(data))
+        except Exception as e:
+            # A corrupt PDF is a bad upload, not a server error
+            raise ResumeParseError(f"Could not read PDF: {e}")
+        text = _clean(text)
+
+        with self._lock:
+            self.stats["parsed"] += 1
+            self._cache[key] = text
+            while len(self._cache) > CACHE_ENTRIES:
+                self._cache.popitem(last=False)
+        logger.info(f"Parsed resume: {pages} pages, {len(text)} chars")
+        return text
+
+    def _parse_parallel(self, data: bytes, pages: int) -> str:
+        chunk = -(-pages // self.workers)
+        ranges = [list(range(start, min(start + chunk, pages))) for start in range(0, pages, chunk)]
+        self.stats["parallel"] += 1
+        # Page ranges come back in order, so the text reads as in the file
+        return "".join(self._get_pool().map(_extract_pages, [data] * len(ranges), ranges))
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs server threads is unsafe
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+resume_parser = ResumeParser()
+
+
+def parse_resume_bytes(data: bytes) -> str:
+    """Extracts text from an uploaded PDF; raises ResumeParseError / ResumeTooLarge."""
+    return resume_parser.parse(data)
+
+
 def parse_resume(file_path: str) -> str:
     """
     Extracts text from a PDF resume file.
     """
     try:
-        text = extract_text(file_path)
-        # Basic cleanup: remove excessive whitespace
-        clean_text = "\n".join([line.strip() for line in text.split("\n") if line.strip()])
-        return clean_text
+        with open(file_path, "rb") as f:
+            return parse_resume_bytes(f.read())
     except Exception as e:
         logger.error(f"Failed to parse resume: {e}")
         return ""
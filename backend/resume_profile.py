@@ -0,0 +1,221 @@
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional
+from prompt_budget import is_heading, split_sections, estimate_tokens
+from resume_match import tokenize
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+PROFILES_DIR = os.path.join(DATA_DIR, "resume_profiles")
+MASTER_RESUME_PATH = os.path.join(DATA_DIR, "master_resume.json")
+
+# Reference that always points at the saved master resume
+MASTER_REF = "master"
+
+# Terms recognised as skills wherever they appear in the resume
+SKILL_TERMS = frozenset("""
+python java javascript typescript node.js nodejs react angular vue next.js django flask fastapi spring php laravel
+wordpress html css sass tailwind bootstrap jquery c c++ c# .net go golang rust ruby rails kotlin swift scala r
+sql mysql postgresql postgres mongodb redis sqlite elasticsearch kafka rabbitmq graphql rest api apis microservices
+docker kubernetes terraform ansible jenkins gitlab github ci/cd aws azure gcp linux bash git jira figma
+pandas numpy scikit-learn tensorflow pytorch keras spark hadoop airflow tableau powerbi excel llm nlp ml ai
+selenium playwright cypress jest pytest agile scrum seo lms ux/ui ux ui responsive testing
+""".split())
+_SKILLS_HEADING_RE = re.compile(r"skill|technolog|tech stack|kenntnisse|tools", re.IGNORECASE)
+_SUMMARY_HEADING_RE = re.compile(r"\W*(summary|profile|about|profil|zusammenfassung)\b", re.IGNORECASE)
+
+SUMMARY_CHARS = 600
+# Bump when build_profile changes; older stored profiles are rebuilt from their text
+PROFILE_VERSION = 3
+# Profiles kept on disk; the least recently used beyond this are deleted
+MAX_PROFILE_FILES = int(os.getenv("RESUME_PROFILES_MAX", "20"))
+
+
+def resume_hash(text: str) -> str:
+    return hashlib.sha256((text or "").encode()).hexdigest()[:16]
+
+
+def build_profile(text: str, filename: Optional[str] = None) -> Dict:
+    """
+    Everything downstream code needs from a resume, computed once: sections for
+    prompt packing, a skills list, a compact summary and keyword weights.
+    """
+    sections = split_sections(text)
+    tokens = tokenize(text)
+    counts = Counter(tokens)
+
+    skills = [term for term, _ in counts.most_common() if term in SKILL_TERMS]
+    # Long blocks are split into several sections; only the first starts with the heading
+    headed = []
+    heading = ""
+    for section in sections:
+        lines = section.split("\n")
+        if is_heading(lines[0]):
+            heading, lines = lines[0], lines[1:]
+        headed.append((heading, lines))
+
+    for heading, lines in headed:
+        if not _SKILLS_HEADING_RE.search(heading):
+            continue
+        # Short lines under a skills heading are skills even if we do not know them;
+        # sentence fragments, dates and sub-headings ("Soft Skills") are not
+        for line in lines:
+            item = line.strip(" •-*").strip()
+            if (not item or len(item) > 40 or item[-1] in ".,;:" or not re.search(r"[^\W\d_]", item)
+                    or (_SKILLS_HEADING_RE.search(item) and len(item.split()) <= 2)):
+                continue
+            if item.lower() not in skills:
+                skills.append(item.lower())
+
+    # Header (name, title) plus the summary section, if the resume has one
+    summary_parts = sections[:1]
+    for section in sections[1:]:
+        first_line = section.split("\n", 1)[0]
+        if is_heading(first_line) and _SUMMARY_HEADING_RE.match(first_line):
+            summary_parts.append(section)
+            break
+    summary = "\n".join(summary_parts)[:SUMMARY_CHARS]
+
+    return {
+        "version": PROFILE_VERSION,
+        "hash": resume_hash(text),
+        "filename": filename,
+        "created_at": time.time(),
+        "text": text,
+        "tokens": estimate_tokens(text),
+        "sections": sections,
+        "skills": skills,
+        "summary": summary,
+        # Sublinear term weights of every term, most frequent first; the resume
+        # side of the TF-IDF ranking in resume_match.score_jobs
+        "keywords": {term: round(1 + math.log(count), 3) for term, count in counts.most_common()},
+    }
+
+
+class ResumeProfileStore:
+    """
+    Resume profiles keyed by content hash, one JSON file each in `directory`,
+    with the most recently used kept in memory. The saved master resume's
+    profile is also reachable as "master". At most `max_files` profiles stay
+    on disk; the master's is never deleted.
+    """
+
+    def __init__(self, directory: str = PROFILES_DIR, master_path: str = MASTER_RESUME_PATH, max_memory: int = 16,
+                 max_files: int = MAX_PROFILE_FILES):
+        self.directory = directory
+        self.master_path = master_path
+        self.max_memory = max_memory
+        self.max_files = max_files
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _path(self, profile_hash: str) -> str:
+        return os.path.join(self.directory, f"{profile_hash}.json")
+
+    def _remember(self, profile: Dict):
+        with self._lock:
+            self._memory[profile["hash"]] = profile
+            self._memory.move_to_end(profile["hash"])
+            while len(self._memory) > self.max_memory:
+                self._memory.popitem(last=False)
+
+    def get(self, profile_hash: str) -> Optional[Dict]:
+        with self._lock:
+            profile = self._memory.get(profile_hash)
+            if profile is not None:
+                self._memory.move_to_end(profile_hash)
+                return profile
+        if not re.fullmatch(r"[0-9a-f]{16}", profile_hash or "") or not os.path.exists(self._path(profile_hash)):
+            return None
+        try:
+            with open(self._path(profile_hash), "r") as f:
+                profile = json.load(f)
+        except Exception as e:
+            logger.warning(f"Unreadable resume profile {profile_hash}: {e}")
+            return None
+        if profile.get("version") != PROFILE_VERSION:
+            return self._build(profile["text"], profile.get("filename"))
+        # Marks it recently used for _prune
+        os.utime(self._path(profile_hash))
+        self._remember(profile)
+        return profile
+
+    def get_or_build(self, text: str, filename: Optional[str] = None) -> Dict:
+        """The profile of an uploaded resume, built and stored on first use."""
+        profile = self.get(resume_hash(text))
+        if profile is not None:
+            return profile
+        return self._build(text, filename)
+
+    def _build(self, text: str, filename: Optional[str]) -> Dict:
+        profile = build_profile(text, filename)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            tmp_path = self._path(profile["hash"]) + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(profile, f)
+            os.replace(tmp_path, self._path(profile["hash"]))
+            self._prune(keep=profile["hash"])
+        except Exception as e:
+            logger.warning(f"Could not persist resume profile: {e}")
+        self._remember(profile)
+        logger.info(f"Built resume profile {profile['hash']}: {len(profile['sections'])} sections, {len(profile['skills'])} skills")
+        return profile
+
+    def _prune(self, keep: str):
+        names = [name for name in os.listdir(self.directory) if name.endswith(".json")]
+        if len(names) <= self.max_files:
+            return
+        protected = {f"{keep}.json", f"{self._master_hash()}.json"}
+        paths = sorted((os.path.join(self.directory, name) for name in names if name not in protected), key=os.path.getmtime)
+        for path in paths[:len(names) - self.max_files]:
+            os.remove(path)
+            with self._lock:
+                self._memory.pop(os.path.basename(path)[:-len(".json")], None)
+
+    def _master_hash(self) -> Optional[str]:
+        try:
+            with open(self.master_path, "r") as f:
+                data = json.load(f)
+        except Exception:
+            return None
+        return data.get("profile_hash") or (resume_hash(data["text"]) if data.get("text") else None)
+
+    def master(self) -> Optional[Dict]:
+        if not os.path.exists(self.master_path):
+            return None
+        try:
+            with open(self.master_path, "r") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading master resume: {e}")
+            return None
+        if data.get("profile_hash"):
+            profile = self.get(data["profile_hash"])
+            if profile is not None:
+                return profile
+        if not data.get("text"):
+            return None
+        # Resume saved before profiles existed: its profile is found (or built) by
+        # content hash, so the master file itself is never rewritten on a read
+        return self.get_or_build(data["text"], data.get("filename"))
+
+    def resolve(self, ref: str) -> Optional[Dict]:
+        """A profile by hash, or the master resume's profile for "master"."""
+        return self.master() if ref == MASTER_REF else self.get(ref)
+
+    def sections(self, text: str) -> Optional[List[str]]:
+        """Cached sections for this exact resume text, if it has a profile."""
+        profile = self.get(resume_hash(text))
+        return profile["sections"] if profile else None
+
+
+resume_profiles = ResumeProfileStore()
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+from playwright.async_api import async_playwright, Page
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+
+class BrowserPool:
+    """
+    One long-lived headless Chromium shared by every scraper.
+
+    Playwright objects are bound to the event loop that created them, so the
+    pool runs its own asyncio loop on a background thread and scrapers hand it
+    an `async def fn(page)` through `run()`. At most `max_pages` pages are open
+    at once; a page is recycled after `max_uses_per_page` scrapes or thrown away
+    as soon as a scrape using it fails. The browser is relaunched if it dies.
+    """
+
+    def __init__(self, max_pages: int = 3, max_uses_per_page: int = 20):
+        self.max_pages = max_pages
+        self.max_uses_per_page = max_uses_per_page
+        self._thread_lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._idle_pages: List[Tuple[Page, int]] = []
+        self._page_slots: Optional[asyncio.Semaphore] = None
+        self._launch_lock: Optional[asyncio.Lock] = None
+        self.launches = 0
+        self.pages_created = 0
+        self.pages_discarded = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._thread_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._page_slots = asyncio.Semaphore(self.max_pages)
+                self._launch_lock = asyncio.Lock()
+                self._thread = threading.Thread(target=loop.run_forever, name="browser-pool", daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, fn: Callable[[Page], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """Borrows a page, awaits fn(page) on the pool's loop and returns its result."""
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._run(fn), loop)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    async def _run(self, fn: Callable[[Page], Awaitable[Any]]) -> Any:
+        async with self._page_slots:
+            page, uses = await self._acquire_page()
+            healthy = False
+            try:
+                result = await fn(page)
+                healthy = True
+                return result
+            finally:
+                await self._release_page(page, uses + 1, healthy)
+
+    async def _ensure_browser(self):
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            if self._browser is not None:
+                logger.warning("Pooled browser disconnected, relaunching...")
+            await self._shutdown()
+            self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._context = await self._browser.new_context(user_agent=USER_AGENT)
+            self.launches += 1
+            logger.info("Browser pool: launched Chromium")
+
+    async def _acquire_page(self) -> Tuple[Page, int]:
+        await self._ensure_browser()
+        while self._idle_pages:
+            page, uses = self._idle_pages.pop()
+            if not page.is_closed():
+                return page, uses
+        self.pages_created += 1
+        return await self._context.new_page(), 0
+
+    async def _release_page(self, page: Page, uses: int, healthy: bool):
+        if healthy and uses < self.max_uses_per_page and not page.is_closed() and self._browser.is_connected():
+            try:
+                # Drop the previous site's DOM and timers before the page is reused
+                await page.goto("about:blank")
+                self._idle_pages.append((page, uses))
+                return
+            except Exception as e:
+                logger.warning(f"Browser pool: could not reset page ({e}), discarding")
+        self.pages_discarded += 1
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    async def _shutdown(self):
+        self._idle_pages = []
+        for closer in (self._context, self._browser):
+            if closer is not None:
+                try:
+                    await closer.close()
+                except Exception:
+                    pass
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+        self._playwright = self._browser = self._context = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._browser is not None and self._browser.is_connected(),
+            "max_pages": self.max_pages,
+            "idle_pages": len(self._idle_pages),
+            "launches": self.launches,
+            "pages_created": self.pages_created,
+            "pages_discarded": self.pages_discarded,
+        }
+
+    def close(self):
+        """Closes the browser and stops the pool's loop. The pool restarts lazily if used again."""
+        with self._thread_lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=15)
+        except Exception as e:
+            logger.warning(f"Browser pool shutdown error: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=5)
+        loop.close()
+        logger.info("Browser pool closed")
+
+
+browser_pool = BrowserPool(
+    max_pages=int(os.getenv("BROWSER_POOL_PAGES", "3")),
+    max_uses_per_page=int(os.getenv("BROWSER_POOL_PAGE_USES", "20")),
+)
@@ -1,100 +1,191 @@
 import logging
-from playwright.sync_api import sync_playwright
 import re
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
+from typing import Optional
+import httpx
+from bs4 import BeautifulSoup
+from scrapers.browser_pool import browser_pool, USER_AGENT
 
 logger = logging.getLogger(__name__)
 
-def scrape_visasponsor(query: str, location: str = "Germany") -> list:
+BASE_URL = "https://visasponsor.jobs"
+SEARCH_URL = f"{BASE_URL}/api/jobs"
+
+# The search page is server-rendered, so a pooled keep-alive HTTP client is
+# enough most of the time; the browser is only the fallback.
+_http_client = httpx.Client(
+    headers={"User-Agent": USER_AGENT},
+    timeout=httpx.Timeout(20.0, connect=5.0),
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+)
+
+
+def parse_visasponsor_html(html: str, location: str = "Germany", limit: int = 10) -> list:
     """
-    Scrapes jobs from VisaSponsor.jobs using Playwright.
+    Parses job cards out of a VisaSponsor search results page.
+    Same selectors as the Playwright path, no browser needed.
     """
     results = []
+    soup = BeautifulSoup(html, "html.parser")
+
+    # The A tag wraps the .job div
+    job_cards = soup.select("a:has(div[class*='job'])")
+    if not job_cards:
+        divs = soup.select("div[class*='job'][class*='shadow']")
+        job_cards = [div.find_parent("a") for div in divs]
+        job_cards = [el for el in job_cards if el]
+
+    for card in job_cards[:limit]:
+        title_el = card.select_one(".fs-5.fw-medium")
+        title = title_el.get_text(strip=True) if title_el else "Unknown Title"
+
+        company_el = card.select_one(".employer-name")
+        company = company_el.get_text(strip=True) if company_el else "Unknown Company"
+
+        href = card.get("href")
+        link = f"{BASE_URL}{href}" if href and href.startswith("/") else (href or "#")
+
+        # Spans with "Munich, ", "Bavaria, ", "Germany"
+        location_el = card.select_one(".col-11.sub-font")
+        location_text = location_el.get_text(" ", strip=True) if location_el else location
+
+        date_el = card.select_one("div.sub-font.mt-auto span:last-child")
+        date_posted = date_el.get_text(strip=True) if date_el else datetime.now().strftime("%Y-%m-%d")
+
+        results.append({
+            "title": title,
+            "company": company,
+            "location": location_text,
+            "description": f"Visa Sponsored Job: {title} at {company}",
+            "url": link,
+            "date_posted": date_posted,
+            "source": "VisaSponsor"
+        })
+
+    return results
+
+
+def fetch_visasponsor(query: str, location: str = "Germany", timeout: Optional[float] = None) -> list:
+    """Fast path: plain HTTP GET + HTML parsing."""
+    params = {"country": location if location else "Germany", "keyword": query, "showMoreOptions": "false"}
+    request_timeout = _http_client.timeout if timeout is None else httpx.Timeout(min(20.0, timeout), connect=min(5.0, timeout))
+    response = _http_client.get(SEARCH_URL, params=params, timeout=request_timeout)
+    response.raise_for_status()
+    return parse_visasponsor_html(response.text, location)
+
+
+def scrape_visasponsor(query: str, location: str = "Germany", timeout: Optional[float] = None) -> list:
+    """
+    Scrapes jobs from VisaSponsor.jobs. Tries the browserless HTTP path first
+    and only falls back to Playwright when it finds no cards. `timeout` bounds
+    both paths together; the browser scrape is cancelled when it runs out.
+    """
     logger.info(f"Scraping VisaSponsor for '{query}' in '{location}'...")
+    started = time.monotonic()
 
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page(
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
-
-            # Construct URL
-            # Example: https://visasponsor.jobs/api/jobs?country=Germany&classification=Engineering&keyword=python&showMoreOptions=false
-            # We map generic location to country parameter best effort
-            country_param = location if location else "Germany"
-            
-            url = f"https://visasponsor.jobs/api/jobs?country={country_param}&keyword={query}&showMoreOptions=false"
-            logger.info(f"Navigating to {url}")
-            
-            page.goto(url, timeout=60000)
-            page.wait_for_load_state("networkidle")
-            
-            # Selector identified from research: div with class containing 'job'
-            # Specific class observed: 'd-flex flex-column rounded-3 h-100 shadow job'
-            # The A tag wraps the div, so we should query for the A tag directly or find parent
-            
-            # Strategy: Find all A tags that contain a .job div
-            job_cards = page.query_selector_all("a:has(div[class*='job'])")
-            if not job_cards:
-                 # Fallback: maybe the A tag IS the card or is inside?
-                 # Let's try finding the div and getting parent
-                 divs = page.query_selector_all("div[class*='job'][class*='shadow']")
-                 job_cards = [div.evaluate("el => el.closest('a')") for div in divs]
-                 job_cards = [el for el in job_cards if el] # filter nones
-            
-            logger.info(f"Found {len(job_cards)} job cards via A tag strategy")
-            
-            for card in job_cards[:10]: # Limit to 10 for performance
+        results = fetch_visasponsor(query, location, timeout)
+        if results:
+            logger.info(f"VisaSponsor: {len(results)} jobs via HTTP fast path")
+            return results
+        logger.info("VisaSponsor: no cards via HTTP, falling back to browser")
+    except Exception as e:
+        logger.warning(f"VisaSponsor HTTP fast path failed ({e}), falling back to browser")
+
+    remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - started))
+    return scrape_visasponsor_browser(query, location, remaining)
+
+
+def scrape_visasponsor_browser(query: str, location: str = "Germany", timeout: Optional[float] = None) -> list:
+    """
+    Scrapes jobs from VisaSponsor.jobs using Playwright.
+    """
+    results = []
+
+    async def _scrape(page):
+        # Construct URL
+        # Example: https://visasponsor.jobs/api/jobs?country=Germany&classification=Engineering&keyword=python&showMoreOptions=false
+        # We map generic location to country parameter best effort
+        country_param = location if location else "Germany"
+        
+        url = f"https://visasponsor.jobs/api/jobs?country={country_param}&keyword={query}&showMoreOptions=false"
+        logger.info(f"Navigating to {url}")
+        
+        await page.goto(url, timeout=60000)
+        await page.wait_for_load_state("networkidle")
+        
+        # Selector identified from research: div with class containing 'job'
+        # Specific class observed: 'd-flex flex-column rounded-3 h-100 shadow job'
+        # The A tag wraps the div, so we should query for the A tag directly or find parent
+        
+        # Strategy: Find all A tags that contain a .job div
+        job_cards = await page.query_selector_all("a:has(div[class*='job'])")
+        if not job_cards:
+             # Fallback: maybe the A tag IS the card or is inside?
+             # Let's try finding the div and getting parent
+             divs = await page.query_selector_all("div[class*='job'][class*='shadow']")
+             handles = [await div.evaluate_handle("el => el.closest('a')") for div in divs]
+             job_cards = [h.as_element() for h in handles if h.as_element()] # filter nones
+        
+        logger.info(f"Found {len(job_cards)} job cards via A tag strategy")
+        
+        for card in job_cards[:10]: # Limit to 10 for performance
+            try:
+                # Title matches .fs-5.fw-medium
+                title_el = await card.query_selector(".fs-5.fw-medium")
+                title = (await title_el.inner_text()).strip() if title_el else "Unknown Title"
+                
+                # Company matches .employer-name
+                company_el = await card.query_selector(".employer-name")
+                company = (await company_el.inner_text()).strip() if company_el else "Unknown Company"
+                
+                # Link
+                href = await card.get_attribute("href")
+                link = f"https://visasponsor.jobs{href}" if href and href.startswith("/") else (href or "#")
+
+                # Location matches div.col-11.sub-font or similar
+                location_el = await card.query_selector(".col-11.sub-font")
+                if location_el:
+                     # It has spans with "Munich, ", "Bavaria, ", etc.
+                     location_text = (await location_el.inner_text()).replace("\n", "").strip()
+                else:
+                     location_text = location
+                
+                # Date
+                date_posted = datetime.now().strftime("%Y-%m-%d")
+                # Try to find specific date text like "31-01-2026"
+                # It's in the last div .sub-font .mt-auto
                 try:
-                    # Title matches .fs-5.fw-medium
-                    title_el = card.query_selector(".fs-5.fw-medium")
-                    title = title_el.inner_text().strip() if title_el else "Unknown Title"
-                    
-                    # Company matches .employer-name
-                    company_el = card.query_selector(".employer-name")
-                    company = company_el.inner_text().strip() if company_el else "Unknown Company"
-                    
-                    # Link
-                    href = card.get_attribute("href")
-                    link = f"https://visasponsor.jobs{href}" if href and href.startswith("/") else (href or "#")
-
-                    # Location matches div.col-11.sub-font or similar
-                    location_el = card.query_selector(".col-11.sub-font")
-                    if location_el:
-                         # It has spans with "Munich, ", "Bavaria, ", etc.
-                         location_text = location_el.inner_text().replace("\n", "").strip()
-                    else:
-                         location_text = location
-                    
-                    # Date
-                    date_posted = datetime.now().strftime("%Y-%m-%d")
-                    # Try to find specific date text like "31-01-2026"
-                    # It's in the last div .sub-font .mt-auto
-                    try:
-                        date_el = card.query_selector("div.sub-font.mt-auto span:last-child")
-                        if date_el:
-                            date_text = date_el.inner_text().strip()
-                            # Parse DD-MM-YYYY if possible
-                            date_posted = date_text
-                    except:
-                        pass
-
-                    results.append({
-                        "title": title,
-                        "company": company,
-                        "location": location_text,
-                        "description": f"Visa Sponsored Job: {title} at {company}",
-                        "url": link,
-                        "date_posted": date_posted,
-                        "source": "VisaSponsor"
-                    })
-                except Exception as e:
-                    logger.warning(f"Error parsing card: {e}")
-                    continue
-
-            browser.close()
-            
+                    date_el = await card.query_selector("div.sub-font.mt-auto span:last-child")
+                    if date_el:
+                        date_text = (await date_el.inner_text()).strip()
+                        # Parse DD-MM-YYYY if possible
+                        date_posted = date_text
+                except:
+                    pass
+
+                results.append({
+                    "title": title,
+                    "company": company,
+                    "location": location_text,
+                    "description": f"Visa Sponsored Job: {title} at {company}",
+                    "url": link,
+                    "date_posted": date_posted,
+                    "source": "VisaSponsor"
+                })
+            except Exception as e:
+                logger.warning(f"Error parsing card: {e}")
+                continue
+
+    try:
+        browser_pool.run(_scrape, timeout=timeout)
+    except FutureTimeoutError:
+        # Let the caller report a timeout rather than an empty success
+        logger.warning(f"VisaSponsor scrape cancelled after {timeout:g}s")
+        raise
     except Exception as e:
         logger.error(f"VisaSponsor scrape failed: {e}")
         
@@ -0,0 +1,113 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
+from job_search import search_jobs_with_status, SOURCES
+from dedupe import dedupe_jobs
+from search_cache import make_search_key
+
+logger = logging.getLogger(__name__)
+
+# How many saved searches run at once. Per-board limits live in job_search.SOURCE_CONCURRENCY.
+SEARCH_BATCH_CONCURRENCY = int(os.getenv("SEARCH_BATCH_CONCURRENCY", "4"))
+
+
+def _run_group(query: str, location: str, hours_old: int, timeout: Optional[float]) -> dict:
+    started = time.monotonic()
+    try:
+        # No mock fallback: an empty search must not merge a fake posting into the results
+        jobs, source_status, cache_state = search_jobs_with_status(query, location, hours_old, timeout, fallback=False)
+        ok = [name for name, status in source_status.items() if status == "ok"]
+        if not ok:
+            status = "failed"
+        elif len(ok) < len(source_status):
+            status = "partial"
+        else:
+            status = "ok"
+        return {
+            "status": status,
+            "jobs": jobs,
+            "source_status": source_status,
+            "cache": cache_state,
+            "elapsed": round(time.monotonic() - started, 2),
+            "error": None,
+        }
+    except Exception as e:
+        logger.error(f"Failed to scrape for {query}: {e}")
+        return {
+            "status": "failed",
+            "jobs": [],
+            "source_status": {},
+            "cache": None,
+            "elapsed": round(time.monotonic() - started, 2),
+            "error": str(e),
+        }
+
+
+def run_search_batch(
+    searches: List[Dict[str, str]],
+    hours_old: int = 72,
+    max_concurrency: int = SEARCH_BATCH_CONCURRENCY,
+    timeout: Optional[float] = None,
+) -> dict:
+    """
+    Runs saved searches concurrently and merges their results.
+
+    Searches that normalize to the same request (same query/location up to case
+    and whitespace) are scraped once. Near-duplicate postings across searches
+    and boards are merged (see dedupe.py). Returns the merged jobs plus a
+    per-search report.
+    """
+    started = time.monotonic()
+
+    groups: "OrderedDict[str, List[Dict[str, str]]]" = OrderedDict()
+    for search in searches:
+        key = make_search_key(search['query'], search['location'], hours_old, SOURCES)
+        groups.setdefault(key, []).append(search)
+
+    logger.info(f"Running automated search for {len(searches)} queries ({len(groups)} distinct)...")
+
+    outcomes = {}
+    if groups:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(groups))), thread_name_prefix="search-batch") as executor:
+            futures = {}
+            for key, members in groups.items():
+                logger.info(f"Automated scraping: {members[0]['query']} in {members[0]['location']}")
+                futures[executor.submit(_run_group, members[0]['query'], members[0]['location'], hours_old, timeout)] = key
+            for future in as_completed(futures):
+                outcomes[futures[future]] = future.result()
+
+    all_results = []
+    report = []
+    for key, members in groups.items():
+        outcome = outcomes[key]
+        for job in outcome["jobs"]:
+            # Tag them so UI knows source
+            job['source_query'] = members[0]['query']
+        all_results.extend(outcome["jobs"])
+        for search in members:
+            report.append({
+                "id": search.get('id'),
+                "query": search['query'],
+                "location": search['location'],
+                "status": outcome["status"],
+                "jobs_found": len(outcome["jobs"]),
+                "elapsed": outcome["elapsed"],
+                "source_status": outcome["source_status"],
+                "cache": outcome["cache"],
+                "error": outcome["error"],
+                "merged_with": [s.get('id') for s in members if s is not search],
+            })
+
+    unique_results = dedupe_jobs(all_results)
+    logger.info(f"Automated search done: {len(unique_results)} unique of {len(all_results)} jobs")
+
+    return {
+        "jobs": unique_results,
+        "searches": report,
+        "total_jobs": len(all_results),
+        "unique_jobs": len(unique_results),
+        "elapsed": round(time.monotonic() - started, 2),
+    }
@@ -0,0 +1,240 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+SEARCH_CACHE_PATH = os.path.join(DATA_DIR, "search_cache.json")
+
+
+def make_search_key(query: str, location: str, hours_old: int, sources: Iterable[str]) -> str:
+    """Normalized cache key: case and whitespace insensitive, source order ignored."""
+    norm = lambda s: " ".join(str(s or "").lower().split())
+    return "|".join([norm(query), norm(location), str(int(hours_old)), ",".join(sorted(sources))])
+
+
+class SearchCache:
+    """
+    TTL + LRU cache for search results with stale-while-revalidate.
+
+    An entry is fresh for `ttl` seconds. For a further `stale_ttl` seconds it
+    is still served immediately while a background refresh replaces it. The
+    cache holds at most `max_entries` entries and roughly `max_bytes` of
+    JSON-encoded results; the least recently used entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 900,
+        stale_ttl: float = 3600,
+        max_entries: int = 200,
+        max_bytes: int = 20 * 1024 * 1024,
+        path: Optional[str] = None,
+        save_delay: float = 5.0,
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.path = path
+        self.save_delay = save_delay
+        # key -> (stored_at, ttl, size, value)
+        self._entries: "OrderedDict[str, Tuple[float, float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._inflight: Dict[str, Future] = {}
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-cache")
+        self.stats_counters = {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0, "refresh_errors": 0, "evictions": 0}
+        if path:
+            self._load()
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        refresh: bool = False,
+        cacheable: Callable[[Any], bool] = lambda value: True,
+        ttl: Optional[float] = None,
+    ) -> Tuple[Any, str]:
+        """
+        Returns (value, state) where state is "hit", "stale" or "miss".
+        On "stale" the old value is returned and `loader` runs in the background.
+        `refresh=True` skips the cache lookup but still stores the new value.
+        """
+        if not refresh:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    stored_at, entry_ttl, _, value = entry
+                    age = time.time() - stored_at
+                    if age < entry_ttl:
+                        self._entries.move_to_end(key)
+                        self.stats_counters["hits"] += 1
+                        return value, "hit"
+                    if age < entry_ttl + self.stale_ttl:
+                        self._entries.move_to_end(key)
+                        self.stats_counters["stale_hits"] += 1
+                        if key not in self._inflight:
+                            self.stats_counters["refreshes"] += 1
+                            self._inflight[key] = self._refresher.submit(self._load_and_store, key, loader, cacheable, ttl)
+                        return value, "stale"
+                self.stats_counters["misses"] += 1
+
+        # Single flight: concurrent misses for the same key share one load
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+        if not owner:
+            return future.result(), "miss"
+
+        try:
+            value = loader()
+            if cacheable(value):
+                self.set(key, value, ttl)
+            future.set_result(value)
+            return value, "miss"
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def peek(self, key: str) -> Optional[Any]:
+        """Returns the value only if it is fresh, counting a hit or a miss. Never loads."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] < entry[1]:
+                self._entries.move_to_end(key)
+                self.stats_counters["hits"] += 1
+                return entry[3]
+            self.stats_counters["misses"] += 1
+            return None
+
+    def _load_and_store(self, key: str, loader: Callable[[], Any], cacheable: Callable[[Any], bool], ttl: Optional[float]):
+        try:
+            value = loader()
+            if cacheable(value):
+                self.set(key, value, ttl)
+            return value
+        except Exception as e:
+            self.stats_counters["refresh_errors"] += 1
+            logger.warning(f"Background refresh failed for '{key}': {e}")
+            # Waiters sharing this in-flight future must see the failure, not None
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        size = len(json.dumps(value, default=str))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._entries[key] = (time.time(), self.ttl if ttl is None else ttl, size, value)
+            self._bytes += size
+            self._evict()
+        self._schedule_save()
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, _, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.stats_counters["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        self._schedule_save()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.stats_counters["hits"] + self.stats_counters["stale_hits"] + self.stats_counters["misses"]
+            served = self.stats_counters["hits"] + self.stats_counters["stale_hits"]
+            return {
+                **self.stats_counters,
+                "hit_rate": round(served / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _schedule_save(self):
+        """Debounced persistence: many inserts within `save_delay` seconds cost one write."""
+        if not self.path:
+            return
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self.flush)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def flush(self):
+        """Writes the cache to disk now. The JSON encoding happens outside the cache lock."""
+        if not self.path:
+            return
+        # One writer at a time, so an older snapshot never replaces a newer one
+        with self._save_lock:
+            with self._lock:
+                if self._save_timer is not None:
+                    self._save_timer.cancel()
+                    self._save_timer = None
+                rows = [[k, *entry] for k, entry in self._entries.items()]
+            try:
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump(rows, f, default=str)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.warning(f"Could not persist search cache: {e}")
+
+    def close(self):
+        """Writes any pending changes; call on shutdown."""
+        with self._lock:
+            pending = self._save_timer is not None
+        if pending:
+            self.flush()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                rows = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable search cache: {e}")
+            return
+        now = time.time()
+        for key, stored_at, ttl, size, value in rows:
+            if now - stored_at < ttl + self.stale_ttl:
+                self._entries[key] = (stored_at, ttl, size, value)
+                self._bytes += size
+        self._evict()
+        logger.info(f"Loaded {len(self._entries)} cached searches from disk")
+
+
+search_cache = SearchCache(
+    ttl=float(os.getenv("SEARCH_CACHE_TTL", "900")),
+    stale_ttl=float(os.getenv("SEARCH_CACHE_STALE_TTL", "3600")),
+    max_entries=int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "200")),
+    max_bytes=int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(20 * 1024 * 1024))),
+    save_delay=float(os.getenv("SEARCH_CACHE_SAVE_DELAY", "5")),
+    path=SEARCH_CACHE_PATH if os.getenv("SEARCH_CACHE_PERSIST", "1") == "1" else None,
+)
@@ -0,0 +1,253 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional
+from job_search import search_jobs_with_status
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+SCHEDULER_STATE_PATH = os.path.join(DATA_DIR, "search_scheduler.json")
+
+DEFAULT_INTERVAL_MINUTES = int(os.getenv("SAVED_SEARCH_INTERVAL_MINUTES", "360"))
+DEFAULT_HOURS_OLD = int(os.getenv("SAVED_SEARCH_HOURS_OLD", "72"))
+# Spread the first run of each search over this window instead of scraping them all at startup
+FIRST_RUN_JITTER_SECONDS = float(os.getenv("SAVED_SEARCH_FIRST_RUN_JITTER", "600"))
+# Fingerprints not seen in a run for this long are forgotten
+SEEN_MAX_AGE_DAYS = float(os.getenv("SAVED_SEARCH_SEEN_DAYS", "30"))
+
+
+def job_fingerprint(job: Dict[str, str]) -> str:
+    """Stable identity of a posting for "already seen" checks."""
+    url = (job.get('url') or "").strip()
+    if url and url != "#":
+        return url
+    return (job.get('title') or "").strip().lower() + "|" + (job.get('company') or "").strip().lower()
+
+
+class SearchScheduler:
+    """
+    Re-runs every saved search on its own interval in a background thread.
+
+    Each run only keeps postings the search has not seen before. New postings
+    are appended to a delta log under a global, increasing cursor, so clients
+    can ask for "everything after cursor N" instead of re-scraping. A posting's
+    fingerprint is forgotten once no run has returned it for `seen_max_age`.
+    """
+
+    def __init__(
+        self,
+        load_searches: Callable[[], List[Dict[str, str]]],
+        state_path: Optional[str] = SCHEDULER_STATE_PATH,
+        tick_seconds: float = 60,
+        max_concurrency: int = 2,
+        max_deltas: int = 5000,
+        first_run_jitter: float = FIRST_RUN_JITTER_SECONDS,
+        seen_max_age: float = SEEN_MAX_AGE_DAYS * 86400,
+    ):
+        self.load_searches = load_searches
+        self.state_path = state_path
+        self.tick_seconds = tick_seconds
+        self.max_concurrency = max_concurrency
+        self.max_deltas = max_deltas
+        self.first_run_jitter = first_run_jitter
+        self.seen_max_age = seen_max_age
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._running_ids = set()
+        self.cursor = 0
+        # search_id -> {"last_run": ts, "seen": {fingerprint: last_seen_ts}, "last_status": str, "last_new": int}
+        self.searches: Dict[str, dict] = {}
+        # [{"cursor": n, "search_id": id, "found_at": ts, "job": {...}}]
+        self.deltas: List[dict] = []
+        self._load()
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="search-scheduler", daemon=True)
+        self._thread.start()
+        logger.info("Saved-search scheduler started")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        logger.info("Saved-search scheduler stopped")
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.run_due()
+            except Exception as e:
+                logger.error(f"Saved-search scheduler tick failed: {e}")
+            self._stop.wait(self.tick_seconds)
+
+    def run_due(self, now: Optional[float] = None) -> List[str]:
+        """Runs every saved search whose interval has elapsed. Returns the ids that ran."""
+        now = time.time() if now is None else now
+        saved = self.load_searches()
+
+        with self._lock:
+            # Forget searches the user deleted
+            live_ids = {s['id'] for s in saved}
+            for search_id in list(self.searches):
+                if search_id not in live_ids:
+                    del self.searches[search_id]
+
+            due = []
+            for search in saved:
+                interval = (search.get('interval_minutes') or DEFAULT_INTERVAL_MINUTES) * 60
+                state = self.searches.get(search['id'])
+                if state is None:
+                    # First sighting: schedule the first run somewhere in the jitter window
+                    delay = random.uniform(0, min(interval, self.first_run_jitter))
+                    state = self.searches[search['id']] = {"last_run": now - interval + delay, "seen": {}}
+                if search['id'] not in self._running_ids and now - state.get("last_run", 0) >= interval:
+                    due.append(search)
+                    self._running_ids.add(search['id'])
+
+        if due:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="saved-search") as executor:
+                list(executor.map(self.run_search, due))
+        return [s['id'] for s in due]
+
+    def run_search(self, search: Dict[str, str]) -> int:
+        """Scrapes one saved search and records the postings it has not seen yet."""
+        search_id = search['id']
+        try:
+            # Bypass the result cache: the point of a scheduled run is fresh data
+            # and no mock fallback, which would otherwise be recorded as a new posting
+            jobs, source_status, _ = search_jobs_with_status(search['query'], search['location'],
+                                                             search.get('hours_old') or DEFAULT_HOURS_OLD,
+                                                             refresh=True, fallback=False)
+            if "ok" not in source_status.values():
+                jobs, status = [], "failed"
+            else:
+                status = "ok"
+        except Exception as e:
+            logger.error(f"Scheduled search '{search['query']}' failed: {e}")
+            jobs, status = [], "failed"
+
+        found_at = time.time()
+        with self._lock:
+            self._running_ids.discard(search_id)
+            state = self.searches.setdefault(search_id, {"last_run": 0, "seen": {}})
+            state["last_run"] = found_at
+            state["last_status"] = status
+            seen = state["seen"]
+            new_count = 0
+            for job in jobs:
+                fingerprint = job_fingerprint(job)
+                is_new = fingerprint not in seen
+                seen[fingerprint] = found_at
+                if not is_new:
+                    continue
+                job['source_query'] = search['query']
+                self.cursor += 1
+                self.deltas.append({"cursor": self.cursor, "search_id": search_id, "found_at": found_at, "job": job})
+                new_count += 1
+            state["last_new"] = new_count
+            cutoff = found_at - self.seen_max_age
+            for fingerprint in [fp for fp, last_seen in seen.items() if last_seen < cutoff]:
+                del seen[fingerprint]
+            if len(self.deltas) > self.max_deltas:
+                del self.deltas[:len(self.deltas) - self.max_deltas]
+        self._save()
+
+        logger.info(f"Scheduled search '{search['query']}': {new_count} new of {len(jobs)} jobs")
+        return new_count
+
+    def new_since(self, cursor: int = 0, search_id: Optional[str] = None, limit: int = 500) -> dict:
+        """Postings recorded after `cursor`, oldest first. Pass the returned cursor next time."""
+        with self._lock:
+            items = [d for d in self.deltas if d["cursor"] > cursor and (search_id is None or d["search_id"] == search_id)]
+            items = items[:limit]
+            next_cursor = items[-1]["cursor"] if items else max(cursor, 0)
+            # If the client fell behind the retained log, tell it so it can do a full reload
+            oldest = self.deltas[0]["cursor"] if self.deltas else self.cursor + 1
+            return {
+                "cursor": next_cursor,
+                "latest_cursor": self.cursor,
+                "truncated": cursor + 1 < oldest and cursor < self.cursor,
+                "jobs": [{**d["job"], "search_id": d["search_id"], "found_at": d["found_at"], "cursor": d["cursor"]} for d in items],
+            }
+
+    def iter_found(self, search_id: str) -> Iterator[dict]:
+        """Every posting still in the log for one saved search, oldest first."""
+        with self._lock:
+            # Copies the references only; the postings themselves are never mutated
+            deltas = list(self.deltas)
+        for d in deltas:
+            if d["search_id"] == search_id:
+                yield {**d["job"], "search_id": search_id, "found_at": d["found_at"]}
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "cursor": self.cursor,
+                "searches": {
+                    search_id: {
+                        "last_run": state.get("last_run"),
+                        "last_status": state.get("last_status"),
+                        "last_new": state.get("last_new", 0),
+                        "seen": len(state["seen"]),
+                    }
+                    for search_id, state in self.searches.items()
+                },
+            }
+
+    def _save(self):
+        """Snapshots the state under the lock, then encodes and writes it without holding it."""
+        if not self.state_path:
+            return
+        # One writer at a time, so an older snapshot never replaces a newer one
+        with self._save_lock:
+            with self._lock:
+                cursor = self.cursor
+                searches = {k: {**v, "seen": dict(v["seen"])} for k, v in self.searches.items()}
+                # Delta entries are never mutated once appended, so copying the list is enough
+                deltas = list(self.deltas)
+            self._write({
+                "cursor": cursor,
+                "searches": searches,
+                "deltas": deltas,
+            })
+
+    def _write(self, data: dict):
+        try:
+            tmp_path = self.state_path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            logger.warning(f"Could not persist scheduler state: {e}")
+
+    def _load(self):
+        if not self.state_path or not os.path.exists(self.state_path):
+            return
+        try:
+            with open(self.state_path, "r") as f:
+                data = json.load(f)
+            self.cursor = data.get("cursor", 0)
+            self.searches = {k: {**v, "seen": _load_seen(v.get("seen"))} for k, v in data.get("searches", {}).items()}
+            self.deltas = data.get("deltas", [])
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable scheduler state: {e}")
+
+
+def _load_seen(seen) -> Dict[str, float]:
+    # Older state files stored a plain list; treat those fingerprints as seen just now
+    if isinstance(seen, list):
+        now = time.time()
+        return {fingerprint: now for fingerprint in seen}
+    return dict(seen or {})
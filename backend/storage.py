@@ -0,0 +1,324 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+DB_PATH = os.path.join(DATA_DIR, "job_finder.db")
+TRACKED_JOBS_PATH = os.path.join(DATA_DIR, "tracked_jobs.json")
+TRACKED_SEARCHES_PATH = os.path.join(DATA_DIR, "tracked_searches.json")
+
+TRACKED_JOB_FIELDS = [
+    "id", "title", "company", "location", "description", "url", "status",
+    "date_saved", "date_posted", "notes", "match_score",
+]
+SAVED_SEARCH_FIELDS = ["id", "query", "location", "interval_minutes", "hours_old"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracked_jobs (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    company TEXT NOT NULL,
+    location TEXT NOT NULL,
+    description TEXT NOT NULL,
+    url TEXT,
+    status TEXT NOT NULL DEFAULT 'Saved',
+    date_saved TEXT NOT NULL,
+    date_posted TEXT,
+    notes TEXT DEFAULT '',
+    match_score INTEGER DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tracked_jobs_status ON tracked_jobs (status, seq);
+
+CREATE TABLE IF NOT EXISTS saved_searches (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    query TEXT NOT NULL,
+    location TEXT NOT NULL,
+    interval_minutes INTEGER,
+    hours_old INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_saved_searches_norm ON saved_searches (lower(query), lower(location));
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+
+-- Bumped on every change to tracked_jobs; together with the epoch (new for
+-- every freshly created database) it is the board's ETag
+INSERT OR IGNORE INTO meta (key, value) VALUES ('db_epoch', lower(hex(randomblob(4))));
+INSERT OR IGNORE INTO meta (key, value) VALUES ('tracked_jobs_revision', 0);
+CREATE TRIGGER IF NOT EXISTS tracked_jobs_rev_insert AFTER INSERT ON tracked_jobs BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'tracked_jobs_revision';
+END;
+CREATE TRIGGER IF NOT EXISTS tracked_jobs_rev_update AFTER UPDATE ON tracked_jobs BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'tracked_jobs_revision';
+END;
+CREATE TRIGGER IF NOT EXISTS tracked_jobs_rev_delete AFTER DELETE ON tracked_jobs BEGIN
+    UPDATE meta SET value = value + 1 WHERE key = 'tracked_jobs_revision';
+END;
+"""
+
+
+class Storage:
+    """
+    SQLite store for tracked jobs and saved searches.
+
+    Lookups go through the primary key / status index and a status change is
+    a single-row UPDATE. The database runs in WAL mode so readers never block
+    the writer; each thread gets its own connection. On first use the legacy
+    tracked_jobs.json / tracked_searches.json files are imported once.
+    """
+
+    def __init__(self, path: str = DB_PATH, legacy_jobs_path: Optional[str] = TRACKED_JOBS_PATH,
+                 legacy_searches_path: Optional[str] = TRACKED_SEARCHES_PATH):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+            # Databases created before saved searches carried their own window
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(saved_searches)")}
+            if "hours_old" not in columns:
+                conn.execute("ALTER TABLE saved_searches ADD COLUMN hours_old INTEGER")
+        self._migrate_json(legacy_jobs_path, legacy_searches_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --- Migration -----------------------------------------------------------
+
+    def _migrate_json(self, jobs_path: Optional[str], searches_path: Optional[str]):
+        conn = self._connect()
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'json_migrated'").fetchone():
+            return
+        jobs = _read_json_list(jobs_path)
+        searches = _read_json_list(searches_path)
+        with conn:
+            migrated_jobs = _insert_rows(conn, "tracked_jobs", TRACKED_JOB_FIELDS, [_job_row(job) for job in jobs])
+            migrated_searches = _insert_rows(conn, "saved_searches", SAVED_SEARCH_FIELDS,
+                                             [_search_row(search) for search in searches])
+            conn.execute("INSERT INTO meta (key, value) VALUES ('json_migrated', '1')")
+        if jobs or searches:
+            logger.info(f"Migrated {migrated_jobs}/{len(jobs)} tracked jobs and {migrated_searches}/{len(searches)} "
+                        f"saved searches from JSON to SQLite")
+
+    # --- Tracked jobs --------------------------------------------------------
+
+    def list_tracked_jobs(self, status: Optional[str] = None) -> List[Dict]:
+        sql = f"SELECT {', '.join(TRACKED_JOB_FIELDS)} FROM tracked_jobs"
+        params = ()
+        if status is not None:
+            sql += " WHERE status = ?"
+            params = (status,)
+        rows = self._connect().execute(sql + " ORDER BY seq", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def query_tracked_jobs(
+        self,
+        fields: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = None,
+        ids: Optional[List[str]] = None,
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Projected, filtered, keyset-paginated read. Returns (jobs, next_cursor);
+        next_cursor is None on the last page. `fields` must be TRACKED_JOB_FIELDS.
+        """
+        columns = fields or TRACKED_JOB_FIELDS
+        sql = f"SELECT seq, {', '.join(columns)} FROM tracked_jobs"
+        where, params = [], []
+        if statuses:
+            where.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(statuses)
+        if ids:
+            where.append(f"id IN ({', '.join('?' for _ in ids)})")
+            params.extend(ids)
+        if after is not None:
+            where.append("seq > ?")
+            params.append(after)
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY seq"
+        if limit is not None:
+            # One extra row tells us whether there is a next page
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        rows = self._connect().execute(sql, params).fetchall()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1]["seq"]
+        return [{name: row[name] for name in columns} for row in rows], next_cursor
+
+    def iter_tracked_jobs(
+        self,
+        fields: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        ids: Optional[List[str]] = None,
+        batch_size: int = 500,
+    ) -> Iterator[Dict]:
+        """
+        All matching jobs, read `batch_size` rows at a time, so a large export
+        never holds more than one batch. Each batch is a complete query, so the
+        iterator may be advanced from different threads.
+        """
+        after = None
+        while True:
+            jobs, after = self.query_tracked_jobs(fields, statuses, after, batch_size, ids)
+            yield from jobs
+            if after is None:
+                return
+
+    def count_tracked_jobs_by_status(self) -> Dict[str, int]:
+        rows = self._connect().execute("SELECT status, COUNT(*) FROM tracked_jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def tracked_jobs_revision(self) -> str:
+        """Changes whenever any tracked job is inserted, updated or deleted."""
+        rows = dict(self._connect().execute(
+            "SELECT key, value FROM meta WHERE key IN ('db_epoch', 'tracked_jobs_revision')"
+        ).fetchall())
+        return f"{rows.get('db_epoch', '')}-{rows.get('tracked_jobs_revision', 0)}"
+
+    def get_tracked_job(self, job_id: str) -> Optional[Dict]:
+        row = self._connect().execute(
+            f"SELECT {', '.join(TRACKED_JOB_FIELDS)} FROM tracked_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def add_tracked_job(self, job: Dict) -> bool:
+        """Inserts the job unless its id is already tracked. Returns True if it was inserted."""
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(_insert_sql("tracked_jobs", TRACKED_JOB_FIELDS, skip_duplicates=True), _job_row(job))
+        return cursor.rowcount == 1
+
+    def update_tracked_job(self, job_id: str, fields: Dict) -> Optional[Dict]:
+        """Updates the given columns of one job. Returns the updated job, or None if not found."""
+        columns = [name for name in fields if name in TRACKED_JOB_FIELDS and name != "id"]
+        if not columns:
+            return self.get_tracked_job(job_id)
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                f"UPDATE tracked_jobs SET {', '.join(f'{name} = ?' for name in columns)} WHERE id = ?",
+                [fields[name] for name in columns] + [job_id],
+            )
+        if cursor.rowcount == 0:
+            return None
+        return self.get_tracked_job(job_id)
+
+    def delete_tracked_job(self, job_id: str) -> bool:
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute("DELETE FROM tracked_jobs WHERE id = ?", (job_id,))
+        return cursor.rowcount > 0
+
+    def replace_tracked_jobs(self, jobs: List[Dict]):
+        """Bulk replace, kept for callers that still hand over the whole list."""
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM tracked_jobs")
+            _insert_rows(conn, "tracked_jobs", TRACKED_JOB_FIELDS, [_job_row(job) for job in jobs])
+
+    # --- Saved searches ------------------------------------------------------
+
+    def list_saved_searches(self) -> List[Dict]:
+        rows = self._connect().execute(
+            f"SELECT {', '.join(SAVED_SEARCH_FIELDS)} FROM saved_searches ORDER BY seq"
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def find_saved_search(self, query: str, location: str) -> Optional[Dict]:
+        """Case-insensitive match on query + location."""
+        row = self._connect().execute(
+            f"SELECT {', '.join(SAVED_SEARCH_FIELDS)} FROM saved_searches WHERE lower(query) = lower(?) AND lower(location) = lower(?)",
+            (query, location),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def add_saved_search(self, search: Dict) -> bool:
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(_insert_sql("saved_searches", SAVED_SEARCH_FIELDS, skip_duplicates=True), _search_row(search))
+        return cursor.rowcount == 1
+
+    def delete_saved_search(self, search_id: str) -> bool:
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute("DELETE FROM saved_searches WHERE id = ?", (search_id,))
+        return cursor.rowcount > 0
+
+    def replace_saved_searches(self, searches: List[Dict]):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM saved_searches")
+            _insert_rows(conn, "saved_searches", SAVED_SEARCH_FIELDS, [_search_row(search) for search in searches])
+
+
+def _insert_sql(table: str, fields: List[str], skip_duplicates: bool = False) -> str:
+    # Only a uniqueness conflict is skipped; NOT NULL and other constraint failures still raise
+    suffix = " ON CONFLICT DO NOTHING" if skip_duplicates else ""
+    return f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join('?' for _ in fields)}){suffix}"
+
+
+def _insert_rows(conn: sqlite3.Connection, table: str, fields: List[str], rows: List[tuple]) -> int:
+    """Inserts rows, skipping duplicates and logging rows that break a constraint. Returns the count inserted."""
+    sql = _insert_sql(table, fields, skip_duplicates=True)
+    inserted = 0
+    for row in rows:
+        try:
+            inserted += conn.execute(sql, row).rowcount
+        except sqlite3.IntegrityError as e:
+            logger.warning(f"Skipping {table} row with id {row[0]!r}: {e}")
+    return inserted
+
+
+def _job_row(job: Dict) -> tuple:
+    # Legacy JSON rows may lack fields the table requires
+    row = {
+        "title": "",
+        "company": "",
+        "location": "",
+        "description": "",
+        "status": "Saved",
+        "date_saved": datetime.now().isoformat(),
+        "notes": "",
+        "match_score": 0,
+        **{k: v for k, v in job.items() if v is not None},
+    }
+    return tuple(row.get(name) for name in TRACKED_JOB_FIELDS)
+
+
+def _search_row(search: Dict) -> tuple:
+    return tuple(search.get(name) for name in SAVED_SEARCH_FIELDS)
+
+
+def _read_json_list(path: Optional[str]) -> list:
+    if not path or not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+        return data if isinstance(data, list) else []
+    except Exception as e:
+        logger.warning(f"Skipping unreadable legacy file {path}: {e}")
+        return []
+
+
+storage = Storage(os.getenv("JOB_FINDER_DB", DB_PATH))
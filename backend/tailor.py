@@ -1,33 +1,25 @@
-import os
-from openai import OpenAI
+import json
 import logging
+import re
+from typing import Dict, Iterator, Optional, Tuple
+from llm_cache import llm_cache, make_llm_key
+from llm_client import llm_client, CHAT, GENERATE
+from llm_stream import stream_generation
+from prompt_budget import compress_pair, RESUME_TOKEN_BUDGET, JD_TOKEN_BUDGET
+from resume_profile import resume_profiles
 
 logger = logging.getLogger(__name__)
 
-def tailor_resume(resume_text: str, job_description: str) -> str:
-    """
-    Tailors the resume using an LLM to match the job description.
-    Supports OpenAI and Ollama.
-    """
-    # Check for OpenAI Key first, if not present, try Ollama
-    api_key = os.getenv("OPENAI_API_KEY")
-    base_url = None
-    model = "gpt-3.5-turbo"
-    
-    if not api_key:
-        logger.info("No OpenAI API Key found. Attempting to use Ollama via localhost.")
-        api_key = "ollama" # Required for client init, but ignored by Ollama
-        base_url = "http://localhost:11434/v1"
-        model = "mistral:latest" # Explicitly use the tag found in Ollama
-        
-    import requests
-    import json
-    import re
-    
-    try:
-        model = "mistral:latest"
-        
-        prompt = f"""
+# Bump when the prompt below changes so cached generations are not reused
+PROMPT_VERSION = 2
+MODEL = "mistral:latest"
+OPTIONS = {"temperature": 0.7}
+
+def build_tailor_prompt(resume_text: str, job_description: str) -> str:
+    # The sections of each side most relevant to the other, within the token budget
+    resume_context, jd_context, _ = compress_pair(resume_text, job_description,
+                                                   resume_sections=resume_profiles.sections(resume_text))
+    return f"""
         You are a professional Resume Optimizer. I will provide a Job Description. Your task is to compare it to my Master Resume provided below.
 
         Output Requirement: Do not write "Here is your resume." 
@@ -47,73 +39,104 @@ def tailor_resume(resume_text: str, job_description: str) -> str:
         }}
         
         Original Resume:
-        {resume_text[:2000]}
+        {resume_context}
         
         Job Description:
-        {job_description[:2000]}
+        {jd_context}
         """
-        
-        print(f"DEBUG: Attempting to connect to Ollama at {base_url} with model {model}")
-        
-        # 1. Try Chat Endpoint (OpenAI Compatible) - raw request
-        try:
-             response = requests.post(
-                "http://localhost:11434/v1/chat/completions",
-                json={
-                    "model": model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.7
-                },
-                timeout=120
-             )
-             if response.status_code == 200:
-                 response_text = response.json()['choices'][0]['message']['content']
-             else:
-                 raise Exception(f"Chat endpoint failed: {response.text}")
 
-        except Exception as chat_err:
-             print(f"DEBUG: Chat endpoint failed ({chat_err}), trying Native Generate endpoint...")
-             # 2. Fallback to Native Generate Endpoint
-             response = requests.post(
-                "http://localhost:11434/api/generate",
-                json={
-                    "model": model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "format": "json"
-                },
-                timeout=120
-             )
-             if response.status_code != 200:
-                 raise Exception(f"Ollama Native API Error: {response.text}")
-             response_text = response.json().get('response', '')
+def _cache_key(resume_text: str, job_description: str) -> str:
+    # The token budgets decide what the prompt contains, so they are part of the key
+    return make_llm_key("tailor_resume", PROMPT_VERSION, MODEL, OPTIONS,
+                        resume_text=resume_text, job_description=job_description,
+                        budgets=[RESUME_TOKEN_BUDGET, JD_TOKEN_BUDGET])
 
-        # Robust JSON extraction
-        try:
-            # Try finding JSON block
-            json_match = re.search(r'\{[\s\S]*\}', response_text)
-            if json_match:
-                json_str = json_match.group(0)
-                # Validation check
-                json.loads(json_str) 
-                return json_str
-            else:
-                raise ValueError("No JSON found")
-                
-        except Exception as e:
-            logger.warning(f"Failed to parse LLM JSON: {e}. Returning raw text wrapper.")
-            # Fallback: Wrap raw output in our schema so frontend doesn't crash
-            return json.dumps({
-                "Match_Score": 0,
-                "Tailored_Summary": "AI output was not valid JSON. Here is the raw response below:",
-                "Tailored_Experience": response_text
-            })
+def _llm_kwargs() -> dict:
+    # OpenAI-compatible chat endpoint first, native generate as fallback;
+    # the client remembers which one this model answers on
+    return {"format": "json", "endpoints": (CHAT, GENERATE), "read_timeout": 120}
+
+def extract_tailored_json(response_text: str) -> str:
+    """Robust JSON extraction from the raw model output."""
+    try:
+        # Try finding JSON block
+        json_match = re.search(r'\{[\s\S]*\}', response_text)
+        if json_match:
+            json_str = json_match.group(0)
+            # Validation check
+            json.loads(json_str) 
+            return json_str
+        else:
+            raise ValueError("No JSON found")
             
+    except Exception as e:
+        logger.warning(f"Failed to parse LLM JSON: {e}. Returning raw text wrapper.")
+        # Fallback: Wrap raw output in our schema so frontend doesn't crash
+        return json.dumps({
+            "Match_Score": 0,
+            "Tailored_Summary": "AI output was not valid JSON. Here is the raw response below:",
+            "Tailored_Experience": response_text
+        })
+
+def generate_tailored_resume(resume_text: str, job_description: str, regenerate: bool = False,
+                             persist: bool = True) -> Tuple[str, str]:
+    """
+    Returns (raw model output, cache state). Raises when the model cannot be
+    reached; callers that need to tell failures apart (batches) use this
+    instead of tailor_resume, which falls back to a mock. persist=False
+    bypasses the cache without touching the stored entry.
+    """
+    def generate() -> str:
+        # Built on a miss only, so cache hits skip the compression
+        prompt = build_tailor_prompt(resume_text, job_description)
+        return llm_client.generate(prompt, MODEL, OPTIONS, **_llm_kwargs())
+
+    return llm_cache.get_or_generate(
+        _cache_key(resume_text, job_description), generate, regenerate, persist, template="tailor_resume", model=MODEL
+    )
+
+def parse_match_score(response_text: str) -> Optional[int]:
+    """Match_Score from the raw model output as 0-100, or None if it has no valid JSON score."""
+    json_match = re.search(r'\{[\s\S]*\}', response_text or "")
+    try:
+        score = json.loads(json_match.group(0)).get("Match_Score")
+        return max(0, min(100, int(float(str(score).rstrip("%")))))
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+def tailor_resume(resume_text: str, job_description: str, regenerate: bool = False) -> str:
+    """
+    Tailors the resume using an LLM to match the job description.
+    Supports OpenAI and Ollama. Generations are cached on disk (see llm_cache.py);
+    regenerate=True asks the model again.
+    """
+    try:
+        response_text, cache_state = generate_tailored_resume(resume_text, job_description, regenerate)
+        logger.info(f"Tailored resume ({cache_state})")
+        return extract_tailored_json(response_text)
+
     except Exception as e:
         logger.error(f"Error calling LLM provider: {e}")
         logger.info("Falling back to Mock response.")
         return mock_tailor_resume(resume_text, job_description)
 
+def stream_tailor_resume(resume_text: str, job_description: str, regenerate: bool = False) -> Iterator[Dict]:
+    """
+    Streaming tailor_resume: token events as Ollama produces them, a field event
+    per completed top-level JSON key (Match_Score first, so the score shows
+    before the experience section is written), then done with the same
+    result tailor_resume returns.
+    """
+    return stream_generation(
+        _cache_key(resume_text, job_description),
+        lambda: llm_client.stream(build_tailor_prompt(resume_text, job_description), MODEL, OPTIONS, **_llm_kwargs()),
+        to_result=extract_tailored_json,
+        json_output=True,
+        regenerate=regenerate,
+        template="tailor_resume",
+        model=MODEL,
+    )
+
 def mock_tailor_resume(resume_text: str, job_description: str) -> str:
     return f"""
     # TAILORED RESUME (MOCK - FALLBACK)
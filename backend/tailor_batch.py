@@ -0,0 +1,197 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, List, Optional
+from storage import storage
+from task_queue import task_queue, wait_for_notify, BATCH
+from tailor import generate_tailored_resume, extract_tailored_json, parse_match_score
+
+logger = logging.getLogger(__name__)
+
+# Attempts per job before it is reported as failed
+TAILOR_BATCH_ATTEMPTS = int(os.getenv("TAILOR_BATCH_ATTEMPTS", "3"))
+
+
+FINAL_STATES = ("done", "failed", "cancelled")
+
+
+class TailorBatch:
+    """Progress of one batch: one item per tracked job, updated by the worker threads."""
+
+    def __init__(self, job_ids: List[str], resume_text: str, regenerate: bool):
+        self.id = uuid.uuid4().hex[:12]
+        self.resume_text = resume_text
+        self.regenerate = regenerate
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        # job_id -> {"status": pending|running|done|failed|cancelled, "attempts", "match_score", "cache", "error", "elapsed", "result"}
+        self.items: "OrderedDict[str, dict]" = OrderedDict(
+            (job_id, {"status": "pending", "attempts": 0, "match_score": None, "cache": None,
+                      "error": None, "elapsed": None, "result": None})
+            for job_id in dict.fromkeys(job_ids)
+        )
+        self.tasks: Dict[str, object] = {}
+        self.version = 0
+        self.changed = threading.Condition()
+        # Called on every change; lets async streams wait without a thread
+        self._listeners: List[Callable[[], None]] = []
+
+    def add_listener(self, fn: Callable[[], None], since_version: Optional[int] = None):
+        """Calls fn() on the next change, or right away if the batch already moved past since_version."""
+        with self.changed:
+            if since_version is None or self.version == since_version:
+                self._listeners.append(fn)
+                return
+        fn()
+
+    def remove_listener(self, fn: Callable[[], None]):
+        with self.changed:
+            if fn in self._listeners:
+                self._listeners.remove(fn)
+
+    def update(self, job_id: str, **fields):
+        with self.changed:
+            self.items[job_id].update(fields)
+            if self.finished_at is None and all(i["status"] in FINAL_STATES for i in self.items.values()):
+                self.finished_at = time.time()
+            elif self.finished_at is not None and fields.get("status") in ("pending", "running"):
+                self.finished_at = None
+            self.version += 1
+            self.changed.notify_all()
+            for fn in self._listeners:
+                fn()
+
+    def snapshot(self, include_results: bool = False) -> dict:
+        with self.changed:
+            counts: Dict[str, int] = {}
+            items = []
+            for job_id, item in self.items.items():
+                counts[item["status"]] = counts.get(item["status"], 0) + 1
+                entry = {"job_id": job_id, **item}
+                if not include_results:
+                    entry.pop("result")
+                items.append(entry)
+            done = sum(counts.get(state, 0) for state in FINAL_STATES)
+            return {
+                "batch_id": self.id,
+                "finished": self.finished_at is not None,
+                "progress": round(done / len(self.items), 3) if self.items else 1.0,
+                "counts": counts,
+                "created_at": self.created_at,
+                "elapsed": round((self.finished_at or time.time()) - self.created_at, 2),
+                "version": self.version,
+                "items": items,
+            }
+
+
+class TailorBatchRunner:
+    """
+    Tailors the resume to many tracked jobs as batch-priority tasks on the
+    shared task queue, so interactive requests are served first.
+
+    Each job is retried up to `attempts` times (with regenerate on retries, so
+    an unparseable cached answer is not served again); its Match_Score is
+    written back to the tracked job as soon as it is known. Failed items can
+    be retried later without touching the ones that succeeded. The most recent
+    `max_batches` batches are kept for polling.
+    """
+
+    def __init__(self, attempts: int = TAILOR_BATCH_ATTEMPTS, max_batches: int = 20):
+        self.attempts = attempts
+        self.max_batches = max_batches
+        self._batches: "OrderedDict[str, TailorBatch]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def start(self, job_ids: List[str], resume_text: str, regenerate: bool = False) -> TailorBatch:
+        batch = TailorBatch(job_ids, resume_text, regenerate)
+        with self._lock:
+            self._batches[batch.id] = batch
+            while len(self._batches) > self.max_batches:
+                self._batches.popitem(last=False)
+        logger.info(f"Tailor batch {batch.id}: {len(batch.items)} jobs")
+        for job_id in batch.items:
+            self._submit(batch, job_id)
+        return batch
+
+    def _submit(self, batch: TailorBatch, job_id: str):
+        batch.tasks[job_id] = task_queue.submit("tailor_batch_item", self._run_item, batch, job_id, priority=BATCH)
+
+    def cancel(self, batch_id: str) -> Optional[TailorBatch]:
+        """Cancels every item that has not started; running items finish normally."""
+        batch = self.get(batch_id)
+        if batch is None:
+            return None
+        for job_id, item in list(batch.items.items()):
+            if item["status"] == "pending":
+                task_queue.cancel(batch.tasks[job_id].id)
+                batch.update(job_id, status="cancelled")
+        return batch
+
+    def retry_failed(self, batch_id: str) -> Optional[TailorBatch]:
+        batch = self.get(batch_id)
+        if batch is None:
+            return None
+        failed = [job_id for job_id, item in batch.items.items() if item["status"] in ("failed", "cancelled")]
+        for job_id in failed:
+            batch.update(job_id, status="pending", error=None)
+            self._submit(batch, job_id)
+        logger.info(f"Tailor batch {batch.id}: retrying {len(failed)} failed or cancelled jobs")
+        return batch
+
+    def get(self, batch_id: str) -> Optional[TailorBatch]:
+        with self._lock:
+            return self._batches.get(batch_id)
+
+    def _run_item(self, batch: TailorBatch, job_id: str):
+        if batch.items[job_id]["status"] != "pending":
+            return
+        started = time.monotonic()
+        job = storage.get_tracked_job(job_id)
+        if job is None:
+            batch.update(job_id, status="failed", error="Tracked job not found", elapsed=0.0)
+            return
+        error = None
+        for attempt in range(self.attempts):
+            batch.update(job_id, status="running", attempts=batch.items[job_id]["attempts"] + 1)
+            try:
+                raw, cache_state = generate_tailored_resume(
+                    batch.resume_text, job["description"], regenerate=batch.regenerate or attempt > 0
+                )
+                score = parse_match_score(raw)
+                if score is None:
+                    raise ValueError("Model output has no valid JSON Match_Score")
+                storage.update_tracked_job(job_id, {"match_score": score})
+                batch.update(job_id, status="done", match_score=score, cache=cache_state, error=None,
+                             elapsed=round(time.monotonic() - started, 2), result=extract_tailored_json(raw))
+                return
+            except Exception as e:
+                error = str(e)
+                logger.warning(f"Tailoring {job_id} failed (attempt {attempt + 1}/{self.attempts}): {e}")
+                if attempt + 1 < self.attempts:
+                    time.sleep(min(2 ** attempt, 10))
+        batch.update(job_id, status="failed", error=error, elapsed=round(time.monotonic() - started, 2))
+
+    async def iter_events(self, batch_id: str, timeout: float = 15) -> AsyncIterator[dict]:
+        """
+        Progress snapshots whenever the batch changes, ending with the finished one.
+        Waits on the event loop, so a long-running stream does not hold a thread.
+        """
+        batch = self.get(batch_id)
+        if batch is None:
+            return
+        seen = -1
+        while True:
+            if batch.version == seen:
+                await wait_for_notify(lambda fn: batch.add_listener(fn, since_version=seen), batch.remove_listener, timeout)
+            snapshot = batch.snapshot()
+            seen = snapshot["version"]
+            snapshot["event"] = "done" if snapshot["finished"] else "progress"
+            yield snapshot
+            if snapshot["finished"]:
+                return
+
+
+tailor_batches = TailorBatchRunner()
@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"  # a user is waiting on the result
+BATCH = "batch"              # automated searches, tailor batches
+
+
+class Task:
+    def __init__(self, kind: str, fn: Callable, args: tuple, kwargs: dict, priority: str):
+        self.id = uuid.uuid4().hex[:12]
+        self.kind = kind
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.status = "queued"  # queued, running, done, failed, cancelled
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[str] = None
+        # Set by cancel(); long-running work may check it between steps
+        self.cancel_requested = threading.Event()
+        self.finished = threading.Event()
+        self._listeners: List[Callable[[], None]] = []
+        self._listeners_lock = threading.Lock()
+
+    def add_listener(self, fn: Callable[[], None]):
+        """Calls fn() once the task finishes, right away if it already has."""
+        with self._listeners_lock:
+            if not self.finished.is_set():
+                self._listeners.append(fn)
+                return
+        fn()
+
+    def remove_listener(self, fn: Callable[[], None]):
+        with self._listeners_lock:
+            if fn in self._listeners:
+                self._listeners.remove(fn)
+
+    def _notify(self):
+        with self._listeners_lock:
+            listeners, self._listeners = self._listeners, []
+        for fn in listeners:
+            fn()
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        data = {
+            "task_id": self.id,
+            "kind": self.kind,
+            "priority": self.priority,
+            "status": self.status,
+            "cancel_requested": self.cancel_requested.is_set(),
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "queue_wait": round((self.started_at or time.time()) - self.submitted_at, 3),
+            "elapsed": round((self.finished_at or time.time()) - self.started_at, 3) if self.started_at else None,
+            "error": self.error,
+        }
+        if include_result:
+            data["result"] = self.result
+        return data
+
+
+class TaskQueue:
+    """
+    Submit-and-poll worker pool for slow work (LLM generations, scraping).
+
+    `max_workers` threads take interactive tasks first, batch tasks only when no
+    interactive task is queued, and at most `max_workers - 1` batch tasks at
+    once, so one worker is always free for a user-facing request. Queued tasks
+    can be cancelled outright; a running task only gets `cancel_requested` set
+    and its result is discarded. Finished tasks are kept for `retention`
+    seconds (at most `max_retained`) so clients can collect results.
+    """
+
+    def __init__(self, max_workers: int = 4, retention: float = 3600, max_retained: int = 500):
+        self.max_workers = max(1, max_workers)
+        self.batch_limit = max(1, self.max_workers - 1)
+        self.retention = retention
+        self.max_retained = max_retained
+        self._queues: Dict[str, deque] = {INTERACTIVE: deque(), BATCH: deque()}
+        self._tasks: "OrderedDict[str, Task]" = OrderedDict()
+        self._running = {INTERACTIVE: 0, BATCH: 0}
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+
+    def start(self):
+        with self._cond:
+            self._stopping = False
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._worker, name=f"task-worker-{len(self._threads)}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout: float = 5):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, kind: str, fn: Callable, *args, priority: str = INTERACTIVE, **kwargs) -> Task:
+        if priority not in self._queues:
+            raise ValueError(f"Unknown priority '{priority}'")
+        task = Task(kind, fn, args, kwargs, priority)
+        with self._cond:
+            self._tasks[task.id] = task
+            self._queues[priority].append(task)
+            self._prune()
+            self._cond.notify()
+        if not self._threads:
+            self.start()
+        return task
+
+    def get(self, task_id: str) -> Optional[Task]:
+        with self._cond:
+            return self._tasks.get(task_id)
+
+    def list(self, status: Optional[str] = None, kind: Optional[str] = None) -> List[Task]:
+        with self._cond:
+            return [t for t in self._tasks.values()
+                    if (status is None or t.status == status) and (kind is None or t.kind == kind)]
+
+    def cancel(self, task_id: str) -> Optional[Task]:
+        with self._cond:
+            task = self._tasks.get(task_id)
+            if task is None or task.finished.is_set():
+                return task
+            task.cancel_requested.set()
+            if task.status == "queued":
+                self._queues[task.priority].remove(task)
+                self._finish(task, "cancelled")
+        return task
+
+    def stats(self) -> dict:
+        with self._cond:
+            counts: Dict[str, int] = {}
+            for task in self._tasks.values():
+                counts[task.status] = counts.get(task.status, 0) + 1
+            return {
+                "workers": self.max_workers,
+                "batch_limit": self.batch_limit,
+                "queued": {name: len(queue) for name, queue in self._queues.items()},
+                "running": dict(self._running),
+                "tasks": counts,
+            }
+
+    def _next_task(self) -> Optional[Task]:
+        if self._queues[INTERACTIVE]:
+            return self._queues[INTERACTIVE].popleft()
+        if self._queues[BATCH] and self._running[BATCH] < self.batch_limit:
+            return self._queues[BATCH].popleft()
+        return None
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                task = self._next_task()
+                while task is None:
+                    if self._stopping:
+                        return
+                    self._cond.wait()
+                    task = self._next_task()
+                task.status = "running"
+                task.started_at = time.time()
+                self._running[task.priority] += 1
+            try:
+                result, error = task.fn(*task.args, **task.kwargs), None
+            except Exception as e:
+                logger.error(f"Task {task.id} ({task.kind}) failed: {e}")
+                result, error = None, str(e)
+            with self._cond:
+                self._running[task.priority] -= 1
+                if task.cancel_requested.is_set():
+                    self._finish(task, "cancelled")
+                elif error is not None:
+                    task.error = error
+                    self._finish(task, "failed")
+                else:
+                    task.result = result
+                    self._finish(task, "done")
+                # A batch slot may have opened up
+                self._cond.notify_all()
+
+    def _finish(self, task: Task, status: str):
+        task.status = status
+        task.finished_at = time.time()
+        # Drop the arguments (resume text, closures) as soon as they are not needed
+        task.fn, task.args, task.kwargs = None, (), {}
+        task.finished.set()
+        task._notify()
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        finished = [t for t in self._tasks.values() if t.finished.is_set()]
+        excess = len(self._tasks) - self.max_retained
+        for task in finished:
+            if task.finished_at < cutoff or excess > 0:
+                del self._tasks[task.id]
+                excess -= 1
+
+
+async def wait_for_notify(add_listener: Callable, remove_listener: Callable, timeout: float) -> bool:
+    """
+    Awaits one notification from a worker thread through an asyncio.Event, so an
+    async endpoint can long-poll without holding a threadpool thread.
+    Returns False on timeout.
+    """
+    loop = asyncio.get_running_loop()
+    event = asyncio.Event()
+
+    def notify():
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # the loop has shut down
+
+    add_listener(notify)
+    try:
+        await asyncio.wait_for(event.wait(), timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        remove_listener(notify)
+
+
+task_queue = TaskQueue(
+    max_workers=int(os.getenv("TASK_WORKERS", "4")),
+    retention=float(os.getenv("TASK_RESULT_RETENTION", "3600")),
+    max_retained=int(os.getenv("TASK_MAX_RETAINED", "500")),
+)
@@ -0,0 +1,13 @@
+import os
+import sys
+import tempfile
+
+# Backend modules build their singletons (storage, llm_cache, search_cache) at
+# import time; point them at a scratch directory before any test imports one.
+_SCRATCH_DIR = tempfile.mkdtemp(prefix="job-finder-tests-")
+os.environ["JOB_FINDER_DB"] = os.path.join(_SCRATCH_DIR, "job_finder.db")
+os.environ["LLM_CACHE_PERSIST"] = "0"
+os.environ["SEARCH_CACHE_PERSIST"] = "0"
+os.environ["SEARCH_SCHEDULER_ENABLED"] = "0"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,24 @@
+import application_pack
+
+
+def _pack(monkeypatch, email_result):
+    monkeypatch.setattr(application_pack, "_generate_pack", lambda *args: {"timing": {"wall_time": 2.0}})
+    monkeypatch.setattr(application_pack, "generate_tailored_resume", lambda *args, **kwargs: ("{}", "uncached"))
+    monkeypatch.setattr(application_pack, "call_cold_email_model", email_result)
+    monkeypatch.setattr(application_pack, "call_interview_prep_model", lambda *args: {})
+    return application_pack.generate_application_pack("resume", "jd", regenerate=True, baseline=True)
+
+
+def test_baseline_reports_a_speedup(monkeypatch):
+    timing = _pack(monkeypatch, lambda *args: "Hello")["timing"]
+    assert timing["baseline_time"] is not None and "speedup" in timing
+
+
+def test_failed_baseline_reports_the_error_instead_of_a_time(monkeypatch):
+    def fail(*args):
+        raise ConnectionError("Ollama is not running")
+
+    timing = _pack(monkeypatch, fail)["timing"]
+    assert timing["baseline_time"] is None
+    assert timing["baseline_error"] == "Ollama is not running"
+    assert "speedup" not in timing
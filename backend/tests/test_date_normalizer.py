@@ -0,0 +1,46 @@
+from datetime import datetime, timezone
+import pytest
+from date_normalizer import APPROXIMATE, EXACT, RELATIVE, UNKNOWN, filter_recent, normalize_job_dates, parse_date
+
+NOW = datetime(2024, 6, 15, 12, 0, tzinfo=timezone.utc).timestamp()
+HOUR, DAY = 3600, 86400
+
+
+@pytest.mark.parametrize("text, seconds_ago, confidence", [
+    ("vor 3 Tagen", 3 * DAY, RELATIVE),
+    ("vor 2 Stunden", 2 * HOUR, RELATIVE),
+    ("vor einer Woche", 7 * DAY, RELATIVE),
+    ("vor einem Monat", 30 * DAY, RELATIVE),
+    ("vor 15 Minuten", 15 * 60, RELATIVE),
+    ("Heute", 0, RELATIVE),
+    ("gerade eben", 0, RELATIVE),
+    ("gestern", DAY, RELATIVE),
+    ("Vorgestern", 2 * DAY, RELATIVE),
+    ("3 days ago", 3 * DAY, RELATIVE),
+    ("an hour ago", HOUR, RELATIVE),
+    ("30+ days ago", 30 * DAY, APPROXIMATE),
+    ("Posted yesterday", DAY, RELATIVE),
+])
+def test_relative_dates(text, seconds_ago, confidence):
+    assert parse_date(text, NOW) == (NOW - seconds_ago, confidence)
+
+
+@pytest.mark.parametrize("text", ["2024-06-01", "01.06.2024", "01-06-2024", "01/06/2024", "2024-06-01 00:00:00",
+                                  "2024-06-01T00:00:00Z", "2024-06-01T02:00:00+02:00"])
+def test_absolute_dates_are_utc_midnight(text):
+    assert parse_date(text, NOW) == (datetime(2024, 6, 1, tzinfo=timezone.utc).timestamp(), EXACT)
+
+
+@pytest.mark.parametrize("value", [None, "", "  ", "nan", "NaT", "None", "31.02.2024", "bald verfügbar"])
+def test_missing_or_unparseable_dates_are_unknown(value):
+    assert parse_date(value, NOW) == (None, UNKNOWN)
+
+
+def test_normalize_and_filter_keep_unknown_dates():
+    jobs = [{"date_posted": "vor 2 Tagen"}, {"date_posted": "vor 5 Tagen"}, {"date_posted": None}]
+    normalize_job_dates(jobs, NOW)
+    assert jobs[0]["posted_at"] == "2024-06-13T12:00:00+00:00"
+    assert [job["date_confidence"] for job in jobs] == [RELATIVE, RELATIVE, UNKNOWN]
+    assert filter_recent(jobs, 72, NOW) == [jobs[0], jobs[2]]
+    # Jobs that were never normalized are normalized on the way through
+    assert len(filter_recent([{"date_posted": "heute"}], 24, NOW)) == 1
@@ -0,0 +1,71 @@
+import numpy as np
+from dedupe import DedupeIndex, dedupe_jobs, job_key, minhash_signature, normalize_company, normalize_title, normalize_url
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to build data pipelines in Python and Go, "
+    "own our Postgres schema, review pull requests and mentor two junior developers in Berlin."
+)
+
+
+def test_normalizers():
+    assert normalize_title("Fullstack Engineer – Python / React (all genders)") == "fullstack engineer python react"
+    assert normalize_title("Backend Entwickler (m/w/d)") == "backend entwickler"
+    assert normalize_company("Kertos GmbH & Co. KG") == "kertos"
+    assert normalize_url("https://www.Example.com/jobs/1/?utm_source=x&id=5#apply") == "example.com/jobs/1?id=5"
+    assert normalize_url("#") == ""
+
+
+def test_minhash_skips_short_and_placeholder_text():
+    assert minhash_signature("too short") is None
+    assert minhash_signature("View full details at " + DESCRIPTION) is None
+    same = minhash_signature(DESCRIPTION)
+    assert np.array_equal(same, minhash_signature(DESCRIPTION.upper()))
+    edited = minhash_signature(DESCRIPTION.replace("two junior", "three junior"))
+    other = minhash_signature("Completely different text about nursing shifts, patient care and hospital rotas in Munich today")
+    assert np.mean(same == edited) > np.mean(same == other)
+
+
+def test_same_title_and_company_across_boards_merge():
+    jobs = dedupe_jobs([
+        {"title": "Backend Engineer (m/w/d)", "company": "Acme GmbH", "url": "https://a.example/1",
+         "description": "View full details at a.example", "source": "visasponsor"},
+        {"title": "Backend Engineer", "company": "Acme", "url": "https://b.example/2",
+         "description": DESCRIPTION, "source": "jobspy"},
+    ])
+    assert len(jobs) == 1
+    # The record with a real description wins; both URLs and boards are kept
+    assert jobs[0]["description"] == DESCRIPTION
+    assert jobs[0]["urls"] == ["https://b.example/2", "https://a.example/1"]
+    assert jobs[0]["sources"] == ["jobspy", "visasponsor"]
+    assert jobs[0]["duplicates"] == 1
+    assert jobs[0]["job_id"] == job_key({"title": "Backend Engineer", "company": "Acme"})
+
+
+def test_near_identical_description_merges_only_with_a_shared_name():
+    index = DedupeIndex()
+    assert index.add({"title": "Backend Engineer", "company": "Acme", "description": DESCRIPTION})
+    assert not index.add({"title": "Software Engineer Backend", "company": "Acme", "description": DESCRIPTION + " Apply now."})
+    # Same text under an unrelated title and company stays separate
+    assert index.add({"title": "Data Scientist", "company": "Globex", "description": DESCRIPTION})
+    assert index.groups() == [[0, 1], [2]]
+
+
+def test_union_find_joins_groups_through_a_bridge():
+    index = DedupeIndex()
+    index.add({"title": "Python Developer", "company": "Acme", "url": "https://x.example/1"})
+    index.add({"title": "Go Developer", "company": "Acme", "url": "https://x.example/2"})
+    # Shares the URL of the second posting and the title/company of the first
+    assert not index.add({"title": "Python Developer", "company": "Acme", "url": "https://x.example/2"})
+    assert index.groups() == [[0, 1, 2]]
+    merged = index.merged_jobs()
+    assert len(merged) == 1 and merged[0]["duplicates"] == 2
+
+
+def test_merging_already_merged_batches_keeps_counts():
+    first = dedupe_jobs([{"title": "QA Engineer", "company": "Acme", "url": "https://a.example/1", "source": "a"},
+                         {"title": "QA Engineer", "company": "Acme", "url": "https://b.example/1", "source": "b"}])
+    second = dedupe_jobs([{"title": "QA Engineer", "company": "Acme", "url": "https://c.example/1", "source": "c"}])
+    merged = dedupe_jobs(first + second)
+    assert len(merged) == 1
+    assert merged[0]["duplicates"] == 2
+    assert sorted(merged[0]["sources"]) == ["a", "b", "c"]
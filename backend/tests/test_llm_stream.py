@@ -0,0 +1,54 @@
+import json
+import pytest
+from llm_stream import PartialJSONObject
+
+PREP = {
+    "technical_questions": [{"question": "Explain the GIL, {briefly}", "answer": "A lock, \"one\" thread"}, {"question": "Q2"}],
+    "behavioral_questions": ["Tell me about a conflict, then [resolve] it"],
+    "key_talking_points": [],
+    "company_notes": "Berlin, Germany",
+}
+
+
+def _feed(text, size):
+    parser = PartialJSONObject()
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return parser, events
+
+
+@pytest.mark.parametrize("size", [1, 3, 1000])
+def test_events_are_independent_of_chunking(size):
+    parser, events = _feed("```json\n" + json.dumps(PREP, indent=2) + "\n```", size)
+    assert parser.done
+    items = [(e["field"], e["index"], e["value"]) for e in events if e["event"] == "item"]
+    assert items == [
+        ("technical_questions", 0, PREP["technical_questions"][0]),
+        ("technical_questions", 1, PREP["technical_questions"][1]),
+        ("behavioral_questions", 0, PREP["behavioral_questions"][0]),
+    ]
+    fields = {e["field"]: e["value"] for e in events if e["event"] == "field"}
+    assert fields == PREP
+
+
+def test_items_arrive_before_the_array_closes():
+    parser = PartialJSONObject()
+    assert parser.feed('{"questions": ["first", "sec') == [
+        {"event": "item", "field": "questions", "index": 0, "value": "first"}]
+    assert parser.feed('ond"') == []
+    assert parser.feed(']') == [{"event": "item", "field": "questions", "index": 1, "value": "second"}]
+
+
+def test_trailing_text_after_the_object_is_ignored():
+    parser = PartialJSONObject()
+    events = parser.feed('Sure! {"subject": "Hi"} Let me know if you need more.')
+    assert events == [{"event": "field", "field": "subject", "value": "Hi"}]
+    assert parser.done
+    assert parser.feed('{"other": 1}') == []
+
+
+def test_malformed_item_is_skipped_but_counted():
+    parser = PartialJSONObject()
+    events = parser.feed('{"points": [1, oops, 3]}')
+    assert [(e["index"], e["value"]) for e in events if e["event"] == "item"] == [(0, 1), (2, 3)]
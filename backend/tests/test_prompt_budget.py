@@ -0,0 +1,44 @@
+import json
+import os
+from prompt_budget import compress_pair, estimate_tokens, is_heading, split_sections
+
+MASTER_RESUME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "master_resume.json")
+
+
+def _master_text():
+    with open(MASTER_RESUME) as f:
+        return json.load(f)["text"]
+
+
+def test_headings():
+    for line in ["EXPERIENCE", "TECH STACK:", "**TECH STACK**", "## Key Skills", "Your profile", "Deine Aufgaben:", "Profile"]:
+        assert is_heading(line), line
+    # Short capitalized lines are names, places or list entries, not headings
+    for line in ["John Smith", "Berlin Germany", "Hindi", "Soft Skills", "Website Traffic Boost", "We are hiring a backend engineer."]:
+        assert not is_heading(line), line
+
+
+def test_master_resume_splits_at_its_real_headings():
+    sections = split_sections(_master_text())
+    starts = [section.split("\n", 1)[0] for section in sections]
+    for heading in ["SUMMARY", "EXPERIENCE", "LANGUAGES", "SKILLS", "PROJECTS", "EDUCATION"]:
+        assert heading in starts, heading
+    summary = sections[starts.index("SUMMARY")]
+    assert summary.startswith("SUMMARY\nDriven software developer")
+    # Headings start their section instead of trailing the line before them
+    for section in sections:
+        for line in section.split("\n")[1:]:
+            assert line not in ("SUMMARY", "EXPERIENCE", "SKILLS", "EDUCATION"), section
+
+
+def test_lone_heading_joins_the_block_below():
+    text = "**TECH STACK**\n\nPython, Go, Postgres\n\nBerlin\n\nHybrid, 2 days in office"
+    assert split_sections(text) == ["**TECH STACK**\nPython, Go, Postgres", "Berlin", "Hybrid, 2 days in office"]
+
+
+def test_compress_pair_stays_within_budget():
+    jd = "Your profile\nPython and Django experience, REST APIs, Docker.\n\nBenefits\nFree lunch. " * 20
+    resume, compressed_jd, report = compress_pair(_master_text(), jd, resume_budget=200, jd_budget=60)
+    assert estimate_tokens(resume) <= 200
+    assert estimate_tokens(compressed_jd) <= 60
+    assert resume.startswith("ABHAY SRIWASTAV")
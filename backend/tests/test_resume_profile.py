@@ -0,0 +1,56 @@
+import json
+import os
+import shutil
+import pytest
+from resume_profile import ResumeProfileStore, build_profile, resume_hash
+
+MASTER_RESUME = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "master_resume.json")
+
+
+@pytest.fixture
+def master_text():
+    with open(MASTER_RESUME) as f:
+        return json.load(f)["text"]
+
+
+def test_master_resume_profile(master_text):
+    profile = build_profile(master_text, "resume.pdf")
+    assert profile["summary"].startswith("ABHAY SRIWASTAV\nSoftware Developer")
+    assert "SUMMARY\nDriven software developer" in profile["summary"]
+    skills = profile["skills"]
+    for skill in ["python", "django", "docker", "problem-solving project management", "large language models agenetic ai"]:
+        assert skill in skills, skill
+    # Sub-headings, dates and wrapped sentence fragments under SKILLS are not skills
+    for noise in ["soft skills", "technical skills", "08/2024", "exchange and financial reporting."]:
+        assert noise not in skills, noise
+
+
+def test_profile_without_headings():
+    profile = build_profile("Jane Doe\nBackend developer with Python and Go")
+    assert profile["summary"] == "Jane Doe\nBackend developer with Python and Go"
+    assert profile["skills"][:2] == ["python", "go"]
+
+
+def test_reading_the_master_never_rewrites_it(tmp_path):
+    master_path = tmp_path / "master_resume.json"
+    shutil.copy(MASTER_RESUME, master_path)
+    before = master_path.read_bytes()
+    store = ResumeProfileStore(str(tmp_path / "profiles"), str(master_path))
+
+    profile = store.master()
+    assert profile["hash"] == resume_hash(json.loads(before)["text"])
+    assert store.resolve("master") is profile
+    # A fresh store finds the built profile on disk by content hash
+    assert ResumeProfileStore(str(tmp_path / "profiles"), str(master_path)).master()["hash"] == profile["hash"]
+    assert master_path.read_bytes() == before
+
+
+def test_prune_keeps_the_master_profile(tmp_path, master_text):
+    master_path = tmp_path / "master_resume.json"
+    master_path.write_text(json.dumps({"filename": "cv.pdf", "text": master_text}))
+    store = ResumeProfileStore(str(tmp_path / "profiles"), str(master_path), max_files=2)
+    master_hash = store.master()["hash"]
+    for n in range(4):
+        store.get_or_build(f"Resume number {n} with Python")
+    names = os.listdir(tmp_path / "profiles")
+    assert len(names) == 2 and f"{master_hash}.json" in names
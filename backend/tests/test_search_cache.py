@@ -0,0 +1,129 @@
+import threading
+import time
+import pytest
+from search_cache import SearchCache, make_search_key
+
+
+def test_key_ignores_case_whitespace_and_source_order():
+    assert make_search_key(" Python  Dev", "BERLIN", 72, ["b", "a"]) == make_search_key("python dev", "berlin ", 72, ["a", "b"])
+    assert make_search_key("python", "berlin", 72, ["a"]) != make_search_key("python", "berlin", 24, ["a"])
+
+
+def test_hit_after_miss():
+    cache = SearchCache(ttl=60)
+    calls = []
+    loader = lambda: calls.append(1) or {"jobs": [1]}
+    assert cache.get_or_load("k", loader) == ({"jobs": [1]}, "miss")
+    assert cache.get_or_load("k", loader) == ({"jobs": [1]}, "hit")
+    assert len(calls) == 1
+
+
+def test_uncacheable_value_is_not_stored():
+    cache = SearchCache(ttl=60)
+    cache.get_or_load("k", lambda: {"jobs": []}, cacheable=lambda value: False)
+    assert cache.peek("k") is None
+
+
+def test_concurrent_misses_share_one_load():
+    cache = SearchCache(ttl=60)
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"jobs": ["x"]}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(5)]
+    threads[0].start()
+    started.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(calls) == 1
+    assert [value for value, _ in results] == [{"jobs": ["x"]}] * 5
+
+
+def test_stale_value_is_served_while_refreshing():
+    cache = SearchCache(ttl=0.01, stale_ttl=60)
+    cache.set("k", {"jobs": ["old"]})
+    time.sleep(0.02)
+    refreshed = threading.Event()
+
+    def loader():
+        refreshed.set()
+        return {"jobs": ["new"]}
+
+    assert cache.get_or_load("k", loader) == ({"jobs": ["old"]}, "stale")
+    assert refreshed.wait(5)
+    for _ in range(100):
+        if cache._entries["k"][3] == {"jobs": ["new"]}:
+            break
+        time.sleep(0.01)
+    assert cache._entries["k"][3] == {"jobs": ["new"]}
+    assert cache.stats()["refreshes"] == 1
+
+
+def test_failed_refresh_reaches_waiters():
+    cache = SearchCache(ttl=0.01, stale_ttl=60)
+    cache.set("k", {"jobs": ["old"]})
+    time.sleep(0.02)
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise RuntimeError("board down")
+
+    assert cache.get_or_load("k", failing)[1] == "stale"
+    waiter = {}
+
+    def wait_for_refresh():
+        try:
+            waiter["value"] = cache.get_or_load("k", failing, refresh=True)
+        except RuntimeError as e:
+            waiter["error"] = e
+
+    thread = threading.Thread(target=wait_for_refresh)
+    thread.start()
+    time.sleep(0.05)
+    release.set()
+    thread.join(5)
+    assert isinstance(waiter.get("error"), RuntimeError)
+    assert cache.stats()["refresh_errors"] == 1
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = SearchCache(ttl=60, max_entries=2)
+    for key in "abc":
+        cache.set(key, {"jobs": [key]})
+    assert list(cache._entries) == ["b", "c"]
+
+    cache = SearchCache(ttl=60, max_bytes=60)
+    cache.set("a", {"jobs": ["x" * 20]})
+    cache.set("b", {"jobs": ["y" * 20]})
+    assert list(cache._entries) == ["b"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_saves_are_debounced_and_reloaded(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = SearchCache(ttl=60, path=path, save_delay=60)
+    for i in range(20):
+        cache.set(f"k{i}", {"jobs": [i]})
+    assert not (tmp_path / "cache.json").exists()
+    cache.close()
+    reloaded = SearchCache(ttl=60, path=path)
+    assert reloaded.peek("k19") == {"jobs": [19]}
+
+
+@pytest.mark.parametrize("refresh", [False, True])
+def test_loader_errors_propagate_to_the_caller(refresh):
+    cache = SearchCache(ttl=60)
+    with pytest.raises(ValueError):
+        cache.get_or_load("k", lambda: (_ for _ in ()).throw(ValueError("boom")), refresh=refresh)
+    assert cache.peek("k") is None
@@ -0,0 +1,57 @@
+import json
+import search_scheduler
+from search_scheduler import SearchScheduler
+
+
+def _job(n):
+    return {"title": f"Job {n}", "company": "Acme", "url": f"https://example.com/{n}"}
+
+
+def test_first_runs_are_staggered():
+    searches = [{"id": str(i), "query": "python", "location": "Berlin"} for i in range(20)]
+    scheduler = SearchScheduler(lambda: searches, state_path=None, first_run_jitter=600)
+    scheduler.run_search = lambda search: scheduler._running_ids.discard(search["id"])
+    assert len(scheduler.run_due(now=1_000_000)) < 20
+    assert len(scheduler.run_due(now=1_000_600)) == 20
+
+
+def test_saved_hours_old_is_passed_through(monkeypatch):
+    calls = []
+
+    def fake_search(query, location, hours_old, **kwargs):
+        calls.append(hours_old)
+        return [], {"jobspy": "ok"}, "miss"
+
+    monkeypatch.setattr(search_scheduler, "search_jobs_with_status", fake_search)
+    scheduler = SearchScheduler(lambda: [], state_path=None)
+    scheduler.run_search({"id": "a", "query": "python", "location": "Berlin", "hours_old": 24})
+    scheduler.run_search({"id": "b", "query": "python", "location": "Berlin"})
+    assert calls == [24, search_scheduler.DEFAULT_HOURS_OLD]
+
+
+def test_seen_fingerprints_age_out(monkeypatch):
+    results = {"jobs": [_job(1), _job(2)]}
+    monkeypatch.setattr(search_scheduler, "search_jobs_with_status",
+                        lambda *args, **kwargs: (list(results["jobs"]), {"jobspy": "ok"}, "miss"))
+    clock = {"now": 1_000_000.0}
+    monkeypatch.setattr(search_scheduler.time, "time", lambda: clock["now"])
+    scheduler = SearchScheduler(lambda: [], state_path=None, seen_max_age=100)
+    search = {"id": "a", "query": "python", "location": "Berlin"}
+
+    assert scheduler.run_search(search) == 2
+    results["jobs"] = [_job(2)]
+    clock["now"] += 60
+    assert scheduler.run_search(search) == 0
+    clock["now"] += 60
+    scheduler.run_search(search)
+    # Job 1 was last returned 120s ago and is forgotten; job 2 is still listed
+    assert set(scheduler.searches["a"]["seen"]) == {"https://example.com/2"}
+
+
+def test_legacy_seen_list_is_migrated(tmp_path):
+    path = tmp_path / "state.json"
+    path.write_text(json.dumps({"cursor": 3, "searches": {"a": {"last_run": 1, "seen": ["u1", "u2"]}}, "deltas": []}))
+    scheduler = SearchScheduler(lambda: [], state_path=str(path))
+    assert set(scheduler.searches["a"]["seen"]) == {"u1", "u2"}
+    scheduler._save()
+    assert isinstance(json.loads(path.read_text())["searches"]["a"]["seen"], dict)
@@ -0,0 +1,81 @@
+import json
+import logging
+import pytest
+from storage import Storage
+
+
+def _job(n, status="Saved"):
+    return {"id": f"job-{n}", "title": f"Job {n}", "company": "Acme", "location": "Berlin",
+            "description": "Python", "url": f"https://example.com/{n}", "status": status,
+            "date_saved": "2024-01-01T00:00:00"}
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return Storage(str(tmp_path / "jobs.db"), None, None)
+
+
+def test_keyset_pagination_walks_every_row_once(storage):
+    for n in range(7):
+        storage.add_tracked_job(_job(n, "Applied" if n % 2 else "Saved"))
+    pages, after = [], None
+    while True:
+        jobs, after = storage.query_tracked_jobs(["id"], after=after, limit=3)
+        pages.append([job["id"] for job in jobs])
+        if after is None:
+            break
+    assert pages == [["job-0", "job-1", "job-2"], ["job-3", "job-4", "job-5"], ["job-6"]]
+
+    applied, after = storage.query_tracked_jobs(["id", "status"], statuses=["Applied"], limit=10)
+    assert [job["id"] for job in applied] == ["job-1", "job-3", "job-5"] and after is None
+    assert [job["id"] for job in storage.iter_tracked_jobs(["id"], batch_size=2)] == [f"job-{n}" for n in range(7)]
+
+
+def test_revision_changes_on_every_write(storage):
+    revisions = [storage.tracked_jobs_revision()]
+    storage.add_tracked_job(_job(1))
+    revisions.append(storage.tracked_jobs_revision())
+    storage.update_tracked_job("job-1", {"status": "Applied"})
+    revisions.append(storage.tracked_jobs_revision())
+    storage.delete_tracked_job("job-1")
+    revisions.append(storage.tracked_jobs_revision())
+    assert len(set(revisions)) == 4
+    # Reads and duplicate inserts leave it alone
+    storage.add_tracked_job(_job(2))
+    revision = storage.tracked_jobs_revision()
+    storage.list_tracked_jobs()
+    assert storage.add_tracked_job(_job(2)) is False
+    assert storage.tracked_jobs_revision() == revision
+
+
+def test_json_migration_fills_defaults_and_logs_bad_rows(tmp_path, caplog):
+    jobs_path = tmp_path / "tracked_jobs.json"
+    searches_path = tmp_path / "tracked_searches.json"
+    jobs_path.write_text(json.dumps([
+        _job(1),
+        {"id": "legacy", "title": "Old job", "company": "Acme", "url": "https://example.com/old"},
+        {"title": "No id"},
+        _job(1),
+    ]))
+    searches_path.write_text(json.dumps([{"id": "s1", "query": "python", "location": "Berlin"}]))
+
+    with caplog.at_level(logging.WARNING, logger="storage"):
+        storage = Storage(str(tmp_path / "jobs.db"), str(jobs_path), str(searches_path))
+    assert [job["id"] for job in storage.list_tracked_jobs()] == ["job-1", "legacy"]
+    legacy = storage.get_tracked_job("legacy")
+    assert legacy["status"] == "Saved" and legacy["description"] == "" and legacy["date_saved"]
+    assert "Skipping tracked_jobs row" in caplog.text
+    assert storage.list_saved_searches()[0]["query"] == "python"
+
+    # The import runs once; later edits to the legacy file are ignored
+    jobs_path.write_text(json.dumps([_job(9)]))
+    storage = Storage(str(tmp_path / "jobs.db"), str(jobs_path), str(searches_path))
+    assert len(storage.list_tracked_jobs()) == 2
+
+
+def test_saved_search_lookup_is_case_insensitive(storage):
+    assert storage.add_saved_search({"id": "s1", "query": "Python", "location": "Berlin", "hours_old": 24})
+    assert storage.find_saved_search("python", "BERLIN")["hours_old"] == 24
+    assert not storage.add_saved_search({"id": "s1", "query": "Other", "location": "Munich"})
+    storage.replace_saved_searches([{"id": "s2", "query": "Go", "location": "Hamburg"}])
+    assert [s["id"] for s in storage.list_saved_searches()] == ["s2"]
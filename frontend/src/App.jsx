@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
 import { Upload, Search, FileText, CheckCircle, AlertCircle, Copy, ExternalLink, Zap, Clock, MapPin, Briefcase, ChevronDown, MoreHorizontal, Trash2, Mail, Mic, PieChart, BarChart, Bookmark, Bot, Download } from 'lucide-react';
 import { useDropzone } from 'react-dropzone';
@@ -40,9 +40,13 @@ const PREDEFINED_ROLES = [
   "Python Backend Engineer"
 ];
 
+// Longest we keep polling a background task before giving up
+const TASK_MAX_WAIT_MS = 10 * 60 * 1000;
+
 function App() {
   const [resumeText, setResumeText] = useState(null);
   const [resumeName, setResumeName] = useState(null);
+  const [resumeRef, setResumeRef] = useState(null); // profile hash, so the backend need not re-parse the text
   const [jobs, setJobs] = useState([]);
   const [searchQuery, setSearchQuery] = useState('');
   const [location, setLocation] = useState('Germany');
@@ -87,6 +91,76 @@ function App() {
 
   const API_URL = 'http://localhost:8000';
 
+  // Send the saved profile's hash instead of the full resume text when we have one
+  const resumeBody = () => (resumeRef ? { resume_ref: resumeRef } : { resume_text: resumeText });
+
+  // Aborted on unmount, so pending polls and streams do not outlive the page
+  const abortRef = useRef(null);
+  useEffect(() => {
+    const controller = new AbortController();
+    abortRef.current = controller;
+    return () => controller.abort();
+  }, []);
+
+  const isAbort = (err) => axios.isCancel(err) || err?.name === 'AbortError';
+
+  // Searches and batch runs are queued tasks (?background=true); long-poll the
+  // task until it finishes, for at most TASK_MAX_WAIT_MS
+  const runTask = async (method, path, { data, params } = {}) => {
+    const signal = abortRef.current?.signal;
+    const { data: task } = await axios.request({
+      method, url: `${API_URL}${path}`, data, params: { ...params, background: true }, signal
+    });
+    const deadline = Date.now() + TASK_MAX_WAIT_MS;
+    while (Date.now() < deadline) {
+      let res;
+      try {
+        res = await axios.get(`${API_URL}${task.status_url}`, { params: { wait: 25 }, signal });
+      } catch (err) {
+        // Finished tasks are dropped after a while, and all of them on a backend restart
+        if (err.response?.status === 404) throw new Error('Task no longer exists on the server');
+        throw err;
+      }
+      if (res.data.status === 'done') return res.data.result;
+      if (res.data.status === 'failed' || res.data.status === 'cancelled') {
+        throw new Error(res.data.error || `Task ${res.data.status}`);
+      }
+    }
+    throw new Error('Timed out waiting for the task');
+  };
+
+  // Interactive generations use the /stream endpoints (NDJSON): `onEvent` sees
+  // token/field/item events as they arrive, the done event's result is returned
+  const streamGeneration = async (path, data, onEvent) => {
+    const res = await fetch(`${API_URL}${path}?format=ndjson`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(data),
+      signal: abortRef.current?.signal
+    });
+    if (!res.ok) {
+      const body = await res.json().catch(() => null);
+      throw new Error(body?.detail || `Request failed (${res.status})`);
+    }
+    const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        const event = JSON.parse(line);
+        if (event.event === 'done') return event.result;
+        if (event.event === 'error') throw new Error(event.detail);
+        onEvent?.(event);
+      }
+    }
+    throw new Error('Stream ended without a result');
+  };
+
   useEffect(() => {
     const fetchMasterResume = async () => {
       try {
@@ -94,6 +168,7 @@ function App() {
         if (res.data.text) {
           setResumeText(res.data.text);
           setResumeName(res.data.filename || "Master Resume");
+          setResumeRef(res.data.profile_hash || null);
         }
       } catch (err) {
         console.error("Could not fetch master resume", err);
@@ -155,11 +230,12 @@ function App() {
     setIsAutomatedSearchRunning(true);
     setError(null);
     try {
-      const res = await axios.post(`${API_URL}/run-automated-search/`);
-      setJobs(res.data); // Show results in list view
+      const result = await runTask('post', '/run-automated-search/');
+      setJobs(result.jobs); // Show results in list view
       setViewMode('list');
-      alert(`Automated run complete! Found ${res.data.length} jobs.`);
+      alert(`Automated run complete! Found ${result.jobs.length} jobs.`);
     } catch (err) {
+      if (isAbort(err)) return;
       setError("Automated search failed. Check backend logs.");
     } finally {
       setIsAutomatedSearchRunning(false);
@@ -196,7 +272,7 @@ function App() {
       // Sanitize ID: Remove special chars to avoid URL issues
       const cleanId = (job.title + "_" + job.company).replace(/[^a-zA-Z0-9_-]/g, '');
       const payload = {
-        id: cleanId,
+        id: job.job_id || cleanId,
         title: job.title,
         company: job.company,
         location: job.location,
@@ -259,16 +335,22 @@ function App() {
       return;
     }
     setGeneratingEmail(true);
+    setGeneratedEmail("");
     try {
-      const res = await axios.post(`${API_URL}/generate-cold-email/`, {
-        resume_text: resumeText,
+      const email = await streamGeneration('/generate-cold-email/stream', {
+        ...resumeBody(),
         job_description: emailJobData.description,
         hiring_manager_name: hiringManager,
         platform: emailPlatform
+      }, (event) => {
+        // Show the message as it is written
+        if (event.event === 'token') setGeneratedEmail(prev => prev + event.text);
       });
-      setGeneratedEmail(res.data.email_content);
+      setGeneratedEmail(email);
     } catch (err) {
+      if (isAbort(err)) return;
       console.error(err);
+      setGeneratedEmail("");
       setError("Failed to generate email.");
     } finally {
       setGeneratingEmail(false);
@@ -288,13 +370,20 @@ function App() {
     }
     setGeneratingPrep(true);
     try {
-      const res = await axios.post(`${API_URL}/generate-interview-prep/`, {
-        resume_text: resumeText,
-        job_description: prepJobData.description
+      const result = await streamGeneration('/generate-interview-prep/stream', {
+        ...resumeBody(), job_description: prepJobData.description
+      }, (event) => {
+        // Render each question as soon as it is complete
+        if (event.event === 'item') {
+          setPrepData(prev => ({ ...prev, [event.field]: [...(prev?.[event.field] || []), event.value] }));
+        }
       });
-      setPrepData(res.data);
+      setPrepData(result);
     } catch (err) {
+      if (isAbort(err)) return;
       console.error(err);
+      // Drop any questions that arrived, so the guide can be generated again
+      setPrepData(null);
       setError("Failed to generate interview prep.");
     } finally {
       setGeneratingPrep(false);
@@ -337,6 +426,7 @@ function App() {
       });
       setResumeText(res.data.extracted_text);
       setResumeName(res.data.filename);
+      setResumeRef(res.data.resume_ref || null);
     } catch (err) {
       setError("Failed to upload output. Ensure backend is running.");
     } finally {
@@ -371,11 +461,12 @@ function App() {
     }
 
     try {
-      const res = await axios.get(`${API_URL}/search-jobs/`, {
+      const result = await runTask('get', '/search-jobs/', {
         params: { query: queryToUse, location, hours_old: hoursParam }
       });
-      setJobs(res.data);
+      setJobs(result.jobs);
     } catch (err) {
+      if (isAbort(err)) return;
       setError("Failed to fetch jobs.");
     } finally {
       setLoading(false);
@@ -392,18 +483,17 @@ function App() {
     setTailoringJobId(jobId);
 
     try {
-      const res = await axios.post(`${API_URL}/tailor-resume/`, {
-        resume_text: resumeText,
-        job_description: job.description
+      const tailoredResume = await streamGeneration('/tailor-resume/stream', {
+        ...resumeBody(), job_description: job.description
       });
 
       // Parse here to store structured data
       let parsedData = null;
       try {
         // Safe parsing logic
-        const contentStr = typeof res.data.tailored_resume === 'string'
-          ? res.data.tailored_resume
-          : JSON.stringify(res.data.tailored_resume);
+        const contentStr = typeof tailoredResume === 'string'
+          ? tailoredResume
+          : JSON.stringify(tailoredResume);
 
         const normalizedText = contentStr.replace(/\r\n/g, '\n');
         const codeBlockMatch = normalizedText.match(/```json\s*(\{[\s\S]*?\})\s*```/);
@@ -415,7 +505,7 @@ function App() {
 
       // Store result
       const resultObj = {
-        raw: res.data.tailored_resume,
+        raw: tailoredResume,
         parsed: parsedData
       };
 
@@ -428,6 +518,7 @@ function App() {
       setActiveModalData(resultObj);
 
     } catch (err) {
+      if (isAbort(err)) return;
       setError("Failed to tailor resume: " + err.message);
     } finally {
       setTailoringJobId(null);